@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Export benchmark for Shadow IT Detector
+Compares size and write time of the JSON, NDJSON and Parquet/Arrow report paths
+on synthetic findings.
+
+    python benchmarks/export_benchmark.py --rows 200000
+
+Sample run, 1,000,000 findings (Python 3.11, pyarrow 26):
+
+    format               seconds        MB  vs json time  vs json size
+    json (indent=2)         8.02     246.6         1.00x         1.00x
+    ndjson                  3.92     172.9         0.49x         0.70x
+    ndjson.gz               6.46      11.0         0.81x         0.04x
+    parquet                 3.05       6.4         0.38x         0.03x
+    arrow                   2.73      75.2         0.34x         0.30x
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from detector.config import ConfigManager
+from detector.columnar_export import PYARROW_AVAILABLE
+from detector.report_generator import ReportGenerator
+
+SERVICES = ['slack.com', 'notion.so', 'dropbox.com', 'trello.com', 'zoom.us', 'figma.com', 'airtable.com']
+BROWSERS = ['chrome', 'firefox', 'edge']
+RISKS = ['high', 'medium', 'low']
+
+
+def synthetic_findings(rows):
+    """Findings shaped like a real scan, split across finding types"""
+    tenth = rows // 10
+    return {
+        'network_findings': [
+            {'saas_domain': SERVICES[i % 7], 'fqdn': f"api.{SERVICES[i % 7]}", 'raddr': f"10.0.{i % 256}.{i % 97}:443",
+             'laddr': f"192.168.1.2:{40000 + i % 20000}", 'pid': 1000 + i % 500, 'risk_level': RISKS[i % 3]}
+            for i in range(tenth)
+        ],
+        'endpoint_findings': [
+            {'name': f"{SERVICES[i % 7].split('.')[0]}-helper", 'type': 'process', 'pid': i,
+             'saas_domain': SERVICES[i % 7]}
+            for i in range(tenth)
+        ],
+        'browser_findings': {
+            'extensions': [],
+            'bookmarks': [
+                {'browser': BROWSERS[i % 3], 'title': f"Board {i}", 'url': f"https://{SERVICES[i % 7]}/b/{i}",
+                 'date_added': 13300000000000000 + i, 'saas_domain': SERVICES[i % 7],
+                 'category': 'Collaboration', 'risk_level': RISKS[i % 3]}
+                for i in range(rows - 4 * tenth)
+            ],
+            'history': [
+                {'browser': BROWSERS[i % 3], 'title': f"Page {i}", 'url': f"https://{SERVICES[i % 7]}/p/{i}",
+                 'last_visit': 13300000000000000 + i, 'visit_count': i % 40}
+                for i in range(2 * tenth)
+            ]
+        },
+        'usage_trends': {}
+    }
+
+
+def measure(label, write, paths_of):
+    start = time.perf_counter()
+    result = write()
+    elapsed = time.perf_counter() - start
+    size = sum(Path(p).stat().st_size for p in paths_of(result))
+    return label, elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark report export formats')
+    parser.add_argument('--rows', type=int, default=100000, help='Number of synthetic findings')
+    args = parser.parse_args()
+
+    findings = synthetic_findings(args.rows)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        config = ConfigManager()
+        config.report_config.report_directory = temp_dir
+        generator = ReportGenerator(config)
+
+        results = [
+            measure('json (indent=2)', lambda: generator.generate_json_report(findings, 'bench.json'), lambda p: [p]),
+            measure('ndjson', lambda: generator.generate_ndjson_report(findings, 'bench.ndjson'), lambda p: [p]),
+            measure('ndjson.gz', lambda: generator.generate_ndjson_report(findings, 'bench.ndjson.gz'), lambda p: [p]),
+        ]
+        if PYARROW_AVAILABLE:
+            results += [
+                measure('parquet', lambda: generator.generate_columnar_report(findings, 'bench.parquet', 'parquet'),
+                        lambda paths: paths.values()),
+                measure('arrow', lambda: generator.generate_columnar_report(findings, 'bench.arrow', 'arrow'),
+                        lambda paths: paths.values()),
+            ]
+        else:
+            print("pyarrow not installed; skipping Parquet/Arrow (pip install shadowit-detector[columnar])")
+
+    baseline_time, baseline_size = results[0][1], results[0][2]
+    print(f"{args.rows} findings")
+    print(f"{'format':<18}{'seconds':>10}{'MB':>10}{'vs json time':>14}{'vs json size':>14}")
+    for label, elapsed, size in results:
+        print(f"{label:<18}{elapsed:>10.2f}{size / 1e6:>10.1f}"
+              f"{elapsed / baseline_time:>13.2f}x{size / baseline_size:>13.2f}x")
+
+
+if __name__ == "__main__":
+    main()
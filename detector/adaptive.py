@@ -0,0 +1,78 @@
+import os
+from typing import Callable, Dict, Optional
+
+import psutil
+
+
+class HostLoadProbe:
+    """Reports whether the host is busy enough that monitoring should back off"""
+
+    def __init__(self, cpu_threshold: float = 75.0, load_threshold: float = 1.0):
+        self.cpu_threshold = cpu_threshold
+        # Load average per CPU; 1.0 means every core has a runnable task
+        self.load_threshold = load_threshold
+        self.cpu_count = psutil.cpu_count() or 1
+        self.last_cpu: Optional[float] = None
+        self.last_load: Optional[float] = None
+        # The first non-blocking sample is always 0.0, so prime it now
+        psutil.cpu_percent(interval=None)
+
+    def __call__(self) -> bool:
+        self.last_cpu = psutil.cpu_percent(interval=None)
+        self.last_load = self._load_per_cpu()
+        if self.last_cpu >= self.cpu_threshold:
+            return True
+        return self.last_load is not None and self.last_load >= self.load_threshold
+
+    def _load_per_cpu(self) -> Optional[float]:
+        try:
+            if hasattr(os, 'getloadavg'):
+                return os.getloadavg()[0] / self.cpu_count
+            return psutil.getloadavg()[0] / self.cpu_count
+        except (OSError, AttributeError):
+            return None
+
+
+class AdaptiveInterval:
+    """Scan interval that follows how often a scanner finds something new"""
+
+    def __init__(self, interval: float, min_interval: float, max_interval: float,
+                 speedup: float = 0.5, slowdown: float = 1.5, backoff: float = 2.0,
+                 load_probe: Optional[Callable[[], bool]] = None):
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max(min_interval, max_interval))
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.backoff = backoff
+        self.load_probe = load_probe
+        self.interval = self._clamp(interval)
+        self.effective_interval = self.interval
+        self.busy = False
+
+    def update(self, new_findings: Optional[int]) -> float:
+        """Adjust after a scan and return the interval until the next one
+
+        `None` means the scan result is unknown (e.g. it failed) and keeps
+        the change-driven interval as it is.
+        """
+        if new_findings:
+            self.interval = self._clamp(self.interval * self.speedup)
+        elif new_findings is not None:
+            self.interval = self._clamp(self.interval * self.slowdown)
+
+        # Host pressure stretches the next wait without touching the learned interval
+        self.busy = bool(self.load_probe and self.load_probe())
+        self.effective_interval = self._clamp(self.interval * self.backoff) if self.busy else self.interval
+        return self.effective_interval
+
+    def get_status(self) -> Dict:
+        return {
+            'interval': self.effective_interval,
+            'change_interval': self.interval,
+            'min_interval': self.min_interval,
+            'max_interval': self.max_interval,
+            'load_backoff': self.busy
+        }
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, float(interval)))
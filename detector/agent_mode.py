@@ -7,6 +7,12 @@ from typing import Dict, List, Optional
 import os
 import sys
 
+from .delta import diff_findings
+from .exports import iter_finding_records
+
+STATUS_REPORT_INTERVAL = 60  # seconds
+COMMAND_POLL_INTERVAL = 30  # seconds
+
 class AgentMode:
     """Agent mode for running Shadow IT Detector as a background service"""
     
@@ -19,6 +25,8 @@ class AgentMode:
         self.api_key = os.environ.get('SHADOWIT_API_KEY', '')
         self.is_running = False
         self.reporting_thread = None
+        # Findings the server last acknowledged, as typed records; delta uploads diff against them
+        self.uploaded_records = None
         
     def _generate_agent_id(self) -> str:
         """Generate unique agent ID"""
@@ -47,9 +55,15 @@ class AgentMode:
         if self.real_time_monitor:
             self.real_time_monitor.start_monitoring()
         
-        # Start reporting thread
-        self.reporting_thread = threading.Thread(target=self._reporting_loop, daemon=True)
-        self.reporting_thread.start()
+        # Share the monitor's event loop when it runs on the asyncio runtime
+        runtime = getattr(self.real_time_monitor, 'runtime', None) if self.real_time_monitor else None
+        if runtime:
+            runtime.add_periodic('agent-status', self._report_status, STATUS_REPORT_INTERVAL)
+            runtime.add_periodic('agent-commands', self._process_commands, COMMAND_POLL_INTERVAL)
+        else:
+            # Start reporting thread
+            self.reporting_thread = threading.Thread(target=self._reporting_loop, daemon=True)
+            self.reporting_thread.start()
         
         print(f"Agent started with ID: {self.agent_id}")
         print(f"Reporting to: {self.server_url}")
@@ -119,19 +133,22 @@ class AgentMode:
         """Main reporting loop"""
         while self.is_running:
             try:
-                # Collect current status
-                status_data = self._collect_status_data()
-                
-                # Send to server
-                self._send_status_to_server(status_data)
+                self._report_status()
                 
                 # Wait for next report interval
-                time.sleep(60)  # Report every minute
+                time.sleep(STATUS_REPORT_INTERVAL)
                 
             except Exception as e:
                 print(f"Error in reporting loop: {e}")
                 time.sleep(30)  # Wait before retrying
     
+    def _report_status(self):
+        """Send current status, then whatever changed in the monitor's findings"""
+        status_data = self._collect_status_data()
+        self._send_status_to_server(status_data)
+        if self.real_time_monitor:
+            self.send_findings_delta(self.real_time_monitor.findings_snapshot())
+    
     def _collect_status_data(self) -> Dict:
         """Collect current status data"""
         status = {
@@ -150,6 +167,9 @@ class AgentMode:
         if self.alert_manager:
             alerts_summary = self.alert_manager.get_alerts_summary()
             status['alerts'] = alerts_summary
+            status['alert_suppression'] = self.alert_manager.get_suppression_stats()
+            status['alert_sinks'] = self.alert_manager.get_sink_status()
+            status['alert_dispatch'] = self.alert_manager.get_dispatch_stats()
         
         # Get findings summary (if available)
         # This would be populated from recent scans
@@ -200,6 +220,38 @@ class AgentMode:
         except Exception as e:
             print(f"Failed to send findings to server: {e}")
     
+    def send_findings_delta(self, findings: Dict) -> bool:
+        """Send only what changed since the last acknowledged upload; the first upload is sent in full"""
+        records = list(iter_finding_records(findings))
+        if self.uploaded_records is None:
+            data = {'agent_id': self.agent_id, 'timestamp': datetime.now().isoformat(), 'findings': findings}
+            endpoint = 'findings'
+        else:
+            delta = diff_findings(records, self.uploaded_records)
+            counts = delta.counts()
+            if not (counts['new'] or counts['resolved'] or counts['changed']):
+                return True
+            data = {'agent_id': self.agent_id, 'timestamp': datetime.now().isoformat(), 'delta': delta.to_dict()}
+            endpoint = 'findings/delta'
+        
+        try:
+            headers = {'Authorization': f'Bearer {self.api_key}'} if self.api_key else {}
+            response = requests.post(
+                f"{self.server_url}/api/agents/{endpoint}",
+                json=data,
+                headers=headers,
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                self.uploaded_records = records
+                return True
+            print(f"Server returned status {response.status_code}")
+                
+        except Exception as e:
+            print(f"Failed to send findings to server: {e}")
+        return False
+    
     def get_server_commands(self) -> List[Dict]:
         """Get commands from central server"""
         try:
@@ -279,13 +331,15 @@ class AgentMode:
         """Run command processing loop"""
         while self.is_running:
             try:
-                commands = self.get_server_commands()
+                self._process_commands()
                 
-                for command in commands:
-                    self.execute_command(command)
-                
-                time.sleep(30)  # Check for commands every 30 seconds
+                time.sleep(COMMAND_POLL_INTERVAL)
                 
             except Exception as e:
                 print(f"Error in command loop: {e}")
-                time.sleep(60)  # Wait before retrying 
\ No newline at end of file
+                time.sleep(60)  # Wait before retrying
+    
+    def _process_commands(self):
+        """Fetch pending commands from the server and execute them"""
+        for command in self.get_server_commands():
+            self.execute_command(command) 
\ No newline at end of file
@@ -0,0 +1,174 @@
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Tuple
+
+SEVERITY_RANK = {'low': 1, 'medium': 2, 'high': 3}
+
+
+class TokenBucket:
+    """Token-bucket rate limiter"""
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate  # tokens per second
+        self.burst = max(1, burst)
+        self.clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, tokens: float = 1.0) -> bool:
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+
+class _Window:
+    """Compact per-key coalescing state"""
+    __slots__ = ('opened', 'last_seen', 'suppressed', 'severity', 'sample', 'first_time')
+
+    def __init__(self, now: float, alert):
+        self.opened = now
+        self.last_seen = now
+        self.suppressed = 0
+        self.severity = alert.severity
+        self.sample = alert
+        self.first_time = alert.timestamp
+
+
+class AlertAggregator:
+    """Coalesces alerts per (service, source, host) ahead of the sinks
+
+    The first alert for a key is forwarded straight away. Alerts for the
+    same key that follow within `window` seconds of the previous one are
+    suppressed, and a single summary alert with their count is emitted once
+    the key has been quiet for `window` seconds, or `max_window` seconds
+    after it opened.
+    """
+
+    def __init__(self, emit: Callable, window: float = 60.0, max_window: float = 600.0,
+                 max_keys: int = 10000, clock: Callable[[], float] = time.monotonic):
+        self.emit = emit
+        self.window = window
+        self.max_window = max(window, max_window)
+        self.max_keys = max_keys
+        self.clock = clock
+        self.hostname = socket.gethostname()
+        self._windows: 'OrderedDict[Tuple[str, str, str], _Window]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = threading.Event()
+        self.stats = {'forwarded': 0, 'coalesced': 0, 'summaries': 0, 'evicted': 0}
+
+    def key_for(self, alert) -> Tuple[str, str, str]:
+        details = alert.details or {}
+        # Extension alerts carry no service; each extension is its own burst
+        service = details.get('saas_domain') or details.get('extension_id') or alert.title
+        return (service, alert.source, details.get('host') or self.hostname)
+
+    def submit(self, alert):
+        """Forward or suppress an alert"""
+        self._ensure_flusher()
+        now = self.clock()
+        key = self.key_for(alert)
+        closed = []
+        forward = False
+        with self._lock:
+            state = self._windows.get(key)
+            if state is not None and self._expired(state, now):
+                closed.append((key, self._windows.pop(key)))
+                state = None
+
+            if state is None:
+                self._windows[key] = _Window(now, alert)
+                forward = True
+                self.stats['forwarded'] += 1
+                while len(self._windows) > self.max_keys:
+                    closed.append(self._windows.popitem(last=False))
+                    self.stats['evicted'] += 1
+            else:
+                state.last_seen = now
+                state.suppressed += 1
+                if SEVERITY_RANK.get(alert.severity, 0) > SEVERITY_RANK.get(state.severity, 0):
+                    state.severity = alert.severity
+                self._windows.move_to_end(key)
+                self.stats['coalesced'] += 1
+
+        self._emit_summaries(closed)
+        if forward:
+            self.emit(alert)
+
+    def flush(self, force: bool = False):
+        """Close expired windows (every window when `force`) and emit their summaries"""
+        now = self.clock()
+        with self._lock:
+            closed = [(key, state) for key, state in self._windows.items()
+                      if force or self._expired(state, now)]
+            for key, _ in closed:
+                del self._windows[key]
+        self._emit_summaries(closed)
+
+    def stop(self):
+        """Stop the flush thread and emit every pending summary"""
+        self._stopping.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._stopping.clear()
+        self.flush(force=True)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'open_windows': len(self._windows)}
+
+    def _expired(self, state: _Window, now: float) -> bool:
+        return now - state.last_seen >= self.window or now - state.opened >= self.max_window
+
+    def _emit_summaries(self, closed):
+        for key, state in closed:
+            if state.suppressed:
+                self.stats['summaries'] += 1
+                self.emit(self._summary_alert(key, state))
+
+    def _summary_alert(self, key: Tuple[str, str, str], state: _Window):
+        from .alert_manager import Alert
+        service, source, host = key
+        sample = state.sample
+        return Alert(
+            timestamp=datetime.now(),
+            severity=state.severity,
+            category=sample.category,
+            title=f"{sample.title} (+{state.suppressed} similar)",
+            description=f"{state.suppressed} more {source} alerts for {service} on {host} "
+                        f"since {state.first_time.strftime('%H:%M:%S')}",
+            details={
+                'saas_domain': service,
+                'host': host,
+                'coalesced_count': state.suppressed,
+                'first_seen': state.first_time.isoformat()
+            },
+            source=source
+        )
+
+    def _ensure_flusher(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='alert-coalescer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        interval = min(1.0, self.window / 2) if self.window > 0 else 1.0
+        while not self._stopping.wait(interval):
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing coalesced alerts: {e}")
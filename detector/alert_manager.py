@@ -1,12 +1,16 @@
-import smtplib
 import logging
 import os
+import threading
 from datetime import datetime
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from typing import List, Dict, Optional
 from dataclasses import dataclass
 
+from .alert_store import AlertStore, alert_retention_seconds, alert_store_path
+from .alert_aggregator import AlertAggregator, TokenBucket, SEVERITY_RANK
+from .alert_sinks import BatchingSink, EmailSink, SyslogSink, WebhookSink, SinkOutbox, sink_outbox_path, alert_payload
+from .log_pipeline import setup_logging
+from .dispatch_queue import PriorityDispatcher
+
 # Optional rich imports for enhanced console output
 try:
     from rich.console import Console
@@ -28,6 +32,8 @@ class Alert:
     details: Dict
     source: str  # network, endpoint, browser
 
+SINK_CLASSES = {'email': EmailSink, 'webhook': WebhookSink, 'syslog': SyslogSink}
+
 class AlertManager:
     """Manages alerts and notifications for Shadow IT detection"""
     
@@ -35,27 +41,54 @@ class AlertManager:
         self.config = config
         self.console = Console() if RICH_AVAILABLE else None
         self.logger = self._setup_logger()
-        self.alerts = []
-    
-    def _setup_logger(self) -> logging.Logger:
-        """Setup logging configuration"""
-        logger = logging.getLogger('shadowit_detector')
-        logger.setLevel(logging.INFO)
-        
-        # Create logs directory if it doesn't exist
-        os.makedirs('logs', exist_ok=True)
+        self.alerts = AlertStore(
+            capacity=config.alert_config.alert_memory_capacity,
+            db_path=alert_store_path(config),
+            retention_seconds=alert_retention_seconds(config)
+        )
         
-        # File handler
-        if self.config.alert_config.enable_log_file:
-            file_handler = logging.FileHandler('logs/shadowit_alerts.log')
-            file_handler.setLevel(logging.INFO)
-            formatter = logging.Formatter(
-                '%(asctime)s - %(levelname)s - %(message)s'
+        alert_config = config.alert_config
+        # Sinks are served by a worker pool, most severe alerts first
+        self.dispatcher = None
+        if alert_config.alert_dispatch_workers > 0:
+            self.dispatcher = PriorityDispatcher(
+                self._dispatch,
+                workers=alert_config.alert_dispatch_workers,
+                maxsize=alert_config.alert_queue_size,
+                shed_depth=alert_config.alert_shed_depth,
+                shed_severity=alert_config.alert_shed_severity
             )
-            file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+        emit = self.dispatcher.submit if self.dispatcher else self._dispatch
         
-        return logger
+        self.aggregator = None
+        if alert_config.enable_alert_coalescing:
+            self.aggregator = AlertAggregator(
+                emit,
+                window=alert_config.alert_coalesce_window,
+                max_window=alert_config.alert_coalesce_max_window,
+                max_keys=alert_config.alert_coalesce_max_keys
+            )
+        # Only the console is rate limited: the log is the audit trail and
+        # email is already sent as digests by its batching sink
+        self.rate_limiters = {}
+        if alert_config.sink_rate_limit_per_minute > 0:
+            self.rate_limiters = {
+                'console': TokenBucket(alert_config.sink_rate_limit_per_minute / 60.0, alert_config.sink_rate_burst)
+            }
+        self.rate_limited = {'console': 0}
+        self._rate_lock = threading.Lock()
+        self._emit = emit
+        # Set while a live console view is showing; alerts then update it instead of printing panels
+        self.console_view = None
+        self.sink_outbox = None
+        self.sinks = {}
+        self._sink_lock = threading.Lock()
+        self._resume_pending_sinks()
+    
+    def _setup_logger(self) -> logging.Logger:
+        """Setup logging configuration"""
+        # Records go through a queue to a rotating JSON Lines file; safe to repeat
+        return setup_logging(self.config.alert_config)
     
     def create_alert(self, severity: str, category: str, title: str, 
                     description: str, details: Dict, source: str) -> Alert:
@@ -88,19 +121,84 @@ class AlertManager:
         if not self.should_alert(alert.severity):
             return
         
+        # Bursts for the same service are coalesced before they reach the sinks
+        if self.aggregator:
+            self.aggregator.submit(alert)
+        else:
+            self._emit(alert)
+    
+    def _dispatch(self, alert: Alert):
+        """Deliver an alert to each sink within its rate limit"""
         # Log the alert
-        self.logger.warning(f"ALERT: {alert.severity.upper()} - {alert.title}: {alert.description}")
+        self.logger.warning(f"ALERT: {alert.severity.upper()} - {alert.title}: {alert.description}",
+                            extra={'alert': alert_payload(alert)})
         
         # Console alert
-        if self.config.alert_config.enable_console_alerts:
+        if self.config.alert_config.enable_console_alerts and self._allow('console', alert):
             self._send_console_alert(alert)
         
-        # Email alert
+        # Email, webhook and syslog sinks batch on their own queues, so they are not rate limited
         if self.config.alert_config.enable_email_alerts:
             self._send_email_alert(alert)
+        
+        if self.config.alert_config.enable_webhook_alerts and self.config.alert_config.webhook_url:
+            self._send_sink_alert('webhook', alert)
+        
+        if self.config.alert_config.enable_syslog_alerts and self.config.alert_config.syslog_host:
+            self._send_sink_alert('syslog', alert)
+    
+    def _allow(self, sink: str, alert: Alert) -> bool:
+        limiter = self.rate_limiters.get(sink)
+        if limiter is None or self._is_urgent(alert):
+            return True
+        if limiter.consume():
+            return True
+        with self._rate_lock:
+            self.rate_limited[sink] += 1
+        return False
+    
+    def flush_alerts(self):
+        """Emit pending coalesced summaries and queued alerts, e.g. before shutting down"""
+        if self.aggregator:
+            self.aggregator.stop()
+        if self.dispatcher:
+            self.dispatcher.drain()
+        for sink in list(self.sinks.values()):
+            sink.flush()
+    
+    def close(self):
+        """Flush pending alerts and persist the alert store, e.g. when monitoring stops"""
+        self.flush_alerts()
+        self.alerts.persist()
+    
+    def get_suppression_stats(self) -> Dict:
+        """Get how many alerts were coalesced or rate limited"""
+        stats = self.aggregator.get_stats() if self.aggregator else {}
+        return {
+            'coalesced': stats.get('coalesced', 0),
+            'summaries': stats.get('summaries', 0),
+            'open_windows': stats.get('open_windows', 0),
+            'rate_limited': self._rate_limited_counts()
+        }
+    
+    def _rate_limited_counts(self) -> Dict:
+        with self._rate_lock:
+            return dict(self.rate_limited)
+    
+    def get_dispatch_stats(self) -> Dict:
+        """Get dispatch queue depth and latency percentiles per severity"""
+        return self.dispatcher.get_stats() if self.dispatcher else {}
+    
+    def get_sink_status(self) -> Dict:
+        """Get delivery stats for each batching sink in use"""
+        return {name: sink.get_status() for name, sink in self.sinks.items()}
     
     def _send_console_alert(self, alert: Alert):
         """Send alert to console with rich formatting"""
+        if self.console_view is not None:
+            self.console_view.add(alert)
+            return
+        
         # Create severity color mapping
         severity_colors = {
             'low': 'green',
@@ -127,79 +225,85 @@ class AlertManager:
         self.console.print(panel)
     
     def _send_email_alert(self, alert: Alert):
-        """Send alert via email"""
+        """Queue alert for the background email sink"""
         if not self.config.alert_config.email_recipients:
             return
         
+        self._send_sink_alert('email', alert)
+    
+    def _is_urgent(self, alert: Alert) -> bool:
+        urgent_rank = SEVERITY_RANK.get(self.config.alert_config.urgent_alert_severity, 0)
+        return SEVERITY_RANK.get(alert.severity, 0) >= urgent_rank
+    
+    def _send_sink_alert(self, name: str, alert: Alert):
+        """Queue alert for a background batching sink"""
         try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.config.alert_config.smtp_username
-            msg['To'] = ', '.join(self.config.alert_config.email_recipients)
-            msg['Subject'] = f"Shadow IT Alert: {alert.severity.upper()} - {alert.title}"
-            
-            # Create email body
-            body = f"""
-Shadow IT Detection Alert
-
-Severity: {alert.severity.upper()}
-Category: {alert.category}
-Source: {alert.source}
-Time: {alert.timestamp.strftime('%Y-%m-%d %H:%M:%S')}
-
-Title: {alert.title}
-Description: {alert.description}
-
-Details:
-"""
-            
-            # Add details
-            for key, value in alert.details.items():
-                body += f"{key}: {value}\n"
-            
-            msg.attach(MIMEText(body, 'plain'))
-            
-            # Send email
-            server = smtplib.SMTP(
-                self.config.alert_config.smtp_server,
-                self.config.alert_config.smtp_port
-            )
-            server.starttls()
-            server.login(
-                self.config.alert_config.smtp_username,
-                self.config.alert_config.smtp_password
-            )
-            server.send_message(msg)
-            server.quit()
-            
-            self.logger.info(f"Email alert sent to {self.config.alert_config.email_recipients}")
-            
+            # Urgent alerts go out now rather than waiting for their digest
+            self._get_sink(name).submit(alert, urgent=self._is_urgent(alert))
         except Exception as e:
-            self.logger.error(f"Failed to send email alert: {e}")
+            print(f"Error queueing {name} alert: {e}")
+    
+    def _sink_enabled(self, name: str) -> bool:
+        alert_config = self.config.alert_config
+        if name == 'email':
+            return alert_config.enable_email_alerts and bool(alert_config.email_recipients)
+        if name == 'webhook':
+            return alert_config.enable_webhook_alerts and bool(alert_config.webhook_url)
+        if name == 'syslog':
+            return alert_config.enable_syslog_alerts and bool(alert_config.syslog_host)
+        return False
+    
+    def _resume_pending_sinks(self):
+        """Start the sinks that have alerts left in the outbox by an earlier run"""
+        if not os.path.exists(sink_outbox_path(self.config)):
+            return
+        try:
+            self.sink_outbox = SinkOutbox(sink_outbox_path(self.config))
+            for name in self.sink_outbox.pending_sinks():
+                if name in SINK_CLASSES and self._sink_enabled(name):
+                    self._get_sink(name).start()
+        except Exception as e:
+            print(f"Error resuming queued alerts: {e}")
+    
+    def _get_sink(self, name: str) -> BatchingSink:
+        """Create a batching sink on first use"""
+        with self._sink_lock:
+            if name not in self.sinks:
+                alert_config = self.config.alert_config
+                if self.sink_outbox is None:
+                    self.sink_outbox = SinkOutbox(sink_outbox_path(self.config))
+                if name == 'email':
+                    batch_size, batch_interval = alert_config.email_batch_size, alert_config.email_batch_interval
+                else:
+                    batch_size, batch_interval = alert_config.sink_batch_size, alert_config.sink_batch_interval
+                self.sinks[name] = SINK_CLASSES[name](
+                    alert_config, self.sink_outbox,
+                    batch_size=batch_size,
+                    batch_interval=batch_interval,
+                    max_attempts=alert_config.sink_retry_max_attempts,
+                    backoff=alert_config.sink_retry_backoff_seconds,
+                    max_pending=alert_config.sink_max_pending
+                )
+            return self.sinks[name]
     
     def get_alerts_summary(self) -> Dict:
         """Get summary of all alerts"""
-        if not self.alerts:
-            return {'total': 0, 'by_severity': {}, 'by_category': {}}
-        
-        summary = {
-            'total': len(self.alerts),
-            'by_severity': {},
-            'by_category': {},
-            'by_source': {}
+        # Counts and rates are kept by the store as alerts arrive
+        return self.alerts.summary()
+    
+    def get_alerts(self, page: int = 1, page_size: int = 50, **filters) -> Dict:
+        """Get one page of alerts, newest first
+
+        Filters: severity, source, service, since, until.
+        """
+        page = max(1, page)
+        alerts = self.alerts.query(limit=page_size, offset=(page - 1) * page_size, **filters)
+        return {
+            'page': page,
+            'page_size': page_size,
+            'total': self.alerts.count(**filters),
+            'alerts': alerts
         }
-        
-        for alert in self.alerts:
-            # Count by severity
-            summary['by_severity'][alert.severity] = summary['by_severity'].get(alert.severity, 0) + 1
-            
-            # Count by category
-            summary['by_category'][alert.category] = summary['by_category'].get(alert.category, 0) + 1
-            
-            # Count by source
-            summary['by_source'][alert.source] = summary['by_source'].get(alert.source, 0) + 1
-        
-        return summary
     
     def display_alerts_summary(self):
         """Display alerts summary in console"""
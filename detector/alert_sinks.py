@@ -0,0 +1,493 @@
+import abc
+import gzip
+import http.client
+import json
+import logging.handlers
+import os
+import random
+import smtplib
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+from datetime import datetime
+from email.mime.text import MIMEText
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+def alert_payload(alert) -> Dict:
+    """JSON-serialisable form of an alert"""
+    return {
+        'timestamp': alert.timestamp.isoformat(),
+        'severity': alert.severity,
+        'category': alert.category,
+        'title': alert.title,
+        'description': alert.description,
+        'details': alert.details,
+        'source': alert.source
+    }
+
+
+class SinkOutbox:
+    """Durable SQLite queue of alerts waiting for delivery, shared by all sinks"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path or ':memory:'
+        if db_path and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+        if self.db_path != ':memory:':
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS outbox (
+                id INTEGER PRIMARY KEY,
+                sink TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created REAL NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                next_attempt REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (sink, next_attempt);
+        """)
+        self._conn.commit()
+
+    def put(self, sink: str, payload: Dict, now: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO outbox (sink, payload, created, next_attempt) VALUES (?, ?, ?, ?)",
+                (sink, json.dumps(payload, default=str), now, now))
+
+    def due(self, sink: str, now: float, limit: int) -> List[Tuple[int, Dict, int]]:
+        """Oldest deliverable entries as (id, payload, attempts)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, attempts FROM outbox WHERE sink = ? AND next_attempt <= ? "
+                "ORDER BY id LIMIT ?", (sink, now, limit)).fetchall()
+        return [(row_id, json.loads(payload), attempts) for row_id, payload, attempts in rows]
+
+    def stats(self, sink: str, now: float) -> Tuple[int, int, Optional[float]]:
+        """(pending, due now, creation time of the oldest due entry)"""
+        with self._lock:
+            pending, due, oldest = self._conn.execute(
+                "SELECT COUNT(*), SUM(next_attempt <= ?), MIN(CASE WHEN next_attempt <= ? THEN created END) "
+                "FROM outbox WHERE sink = ?", (now, now, sink)).fetchone()
+        return pending, due or 0, oldest
+
+    def pending_sinks(self) -> List[str]:
+        """Sinks with entries waiting in the outbox"""
+        with self._lock:
+            return [sink for (sink,) in self._conn.execute("SELECT DISTINCT sink FROM outbox")]
+
+    def trim(self, sink: str, max_pending: int) -> int:
+        """Drop the oldest entries beyond `max_pending`; returns how many were dropped"""
+        with self._lock, self._conn:
+            pending = self._conn.execute("SELECT COUNT(*) FROM outbox WHERE sink = ?", (sink,)).fetchone()[0]
+            excess = pending - max_pending
+            if excess <= 0:
+                return 0
+            self._conn.execute(
+                "DELETE FROM outbox WHERE id IN (SELECT id FROM outbox WHERE sink = ? ORDER BY id LIMIT ?)",
+                (sink, excess))
+        return excess
+
+    def ack(self, ids: List[int]):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in ids])
+
+    def retry(self, ids: List[int], next_attempt: float):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE outbox SET attempts = attempts + 1, next_attempt = ? WHERE id = ?",
+                [(next_attempt, row_id) for row_id in ids])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class BatchingSink(abc.ABC):
+    """Delivers alerts from a background worker in batches, with retries
+
+    Alerts are written to the durable outbox as soon as they are submitted,
+    so nothing is lost if delivery fails or the process restarts. A batch is
+    sent once `batch_size` alerts are waiting or the oldest has waited
+    `batch_interval` seconds. Failed batches are retried with exponential
+    backoff and dropped after `max_attempts`. With `max_pending` set, the
+    oldest queued alerts are dropped once the sink falls that far behind.
+    """
+
+    name = 'sink'
+
+    def __init__(self, outbox: SinkOutbox, batch_size: int = 20, batch_interval: float = 60.0,
+                 max_attempts: int = 8, backoff: float = 5.0, max_backoff: float = 900.0,
+                 max_pending: int = 0, clock: Callable[[], float] = time.time):
+        self.outbox = outbox
+        self.batch_size = max(1, batch_size)
+        self.batch_interval = batch_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_pending = max_pending
+        self.clock = clock
+        self.stats = {'delivered': 0, 'batches': 0, 'failures': 0, 'dropped': 0, 'last_error': None}
+        self._cond = threading.Condition()
+        self._flush_requested = False
+        self._running = False
+        self._thread = None
+
+    @abc.abstractmethod
+    def deliver(self, alerts: List[Dict]):
+        """Send one batch; raise to have it retried"""
+
+    def close(self):
+        """Release connections held between batches"""
+
+    def submit(self, alert, urgent: bool = False):
+        """Queue an alert; an urgent one sends what is due now instead of waiting for a full batch"""
+        self.outbox.put(self.name, alert_payload(alert), self.clock())
+        if self.max_pending > 0:
+            self.stats['dropped'] += self.outbox.trim(self.name, self.max_pending)
+        self.start()
+        with self._cond:
+            if urgent:
+                self._flush_requested = True
+            self._cond.notify_all()
+
+    def flush(self, timeout: float = 10.0):
+        """Deliver everything that is due now, waiting at most `timeout` seconds"""
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            end = time.monotonic() + timeout
+            while self._flush_requested and self._running:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"sink-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Flush what is due, then stop the worker"""
+        self.flush(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self.close()
+
+    def get_status(self) -> Dict:
+        pending, _, _ = self.outbox.stats(self.name, self.clock())
+        return {**self.stats, 'pending': pending}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                flush = self._flush_requested
+            now = self.clock()
+            _, due, oldest = self.outbox.stats(self.name, now)
+            ready = due and (flush or due >= self.batch_size or now - oldest >= self.batch_interval)
+
+            if ready:
+                self._send_batch(now)
+                continue
+
+            with self._cond:
+                if flush:
+                    self._flush_requested = False
+                    self._cond.notify_all()
+                self._cond.wait(min(1.0, self.batch_interval) if due else 1.0)
+
+    def _send_batch(self, now: float):
+        entries = self.outbox.due(self.name, now, self.batch_size)
+        if not entries:
+            return
+        ids = [row_id for row_id, _, _ in entries]
+        try:
+            self.deliver([payload for _, payload, _ in entries])
+        except Exception as e:
+            self.stats['failures'] += 1
+            self.stats['last_error'] = str(e)
+            print(f"Failed to deliver {len(ids)} alerts via {self.name}: {e}")
+
+            attempts = max(attempts for _, _, attempts in entries) + 1
+            if attempts >= self.max_attempts:
+                self.outbox.ack(ids)
+                self.stats['dropped'] += len(ids)
+                return
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+            self.outbox.retry(ids, now + delay * random.uniform(0.8, 1.2))
+            return
+
+        self.outbox.ack(ids)
+        self.stats['delivered'] += len(ids)
+        self.stats['batches'] += 1
+        self.stats['last_error'] = None
+
+
+class EmailSink(BatchingSink):
+    """Sends alert digests over a persistent, authenticated SMTP connection"""
+
+    name = 'email'
+
+    def __init__(self, alert_config, outbox: SinkOutbox, **kwargs):
+        super().__init__(outbox, **kwargs)
+        self.alert_config = alert_config
+        self._smtp: Optional[smtplib.SMTP] = None
+
+    def deliver(self, alerts: List[Dict]):
+        if not self.alert_config.email_recipients:
+            return
+        message = self._build_digest(alerts)
+        try:
+            self._connection().send_message(message)
+        except (smtplib.SMTPServerDisconnected, ConnectionError):
+            # The relay dropped an idle connection; reconnect once
+            self.close()
+            self._connection().send_message(message)
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _connection(self) -> smtplib.SMTP:
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return self._smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+        config = self.alert_config
+        smtp = smtplib.SMTP(config.smtp_server, config.smtp_port, timeout=30)
+        try:
+            if config.smtp_use_starttls:
+                smtp.starttls()
+            if config.smtp_username:
+                smtp.login(config.smtp_username, config.smtp_password)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+        return smtp
+
+    def _build_digest(self, alerts: List[Dict]) -> MIMEText:
+        config = self.alert_config
+        severities = [alert['severity'] for alert in alerts]
+        highest = max(severities, key=lambda s: {'low': 1, 'medium': 2, 'high': 3}.get(s, 0))
+        if len(alerts) == 1:
+            subject = f"Shadow IT Alert: {highest.upper()} - {alerts[0]['title']}"
+        else:
+            subject = f"Shadow IT Alerts: {len(alerts)} alerts (highest {highest.upper()})"
+
+        sections = []
+        for alert in alerts:
+            body = f"""Severity: {alert['severity'].upper()}
+Category: {alert['category']}
+Source: {alert['source']}
+Time: {alert['timestamp']}
+
+Title: {alert['title']}
+Description: {alert['description']}
+
+Details:
+"""
+            for key, value in alert['details'].items():
+                body += f"{key}: {value}\n"
+            sections.append(body)
+
+        message = MIMEText("Shadow IT Detection Alert\n\n" + "\n----------------------------------------\n\n".join(sections),
+                           'plain')
+        message['From'] = config.smtp_username or f"shadowit-detector@{config.smtp_server or 'localhost'}"
+        message['To'] = ', '.join(config.email_recipients)
+        message['Subject'] = subject
+        return message
+
+
+class WebhookSink(BatchingSink):
+    """Posts alert batches to an HTTP(S) webhook over a kept-alive connection
+
+    The 'slack' format sends one Slack-compatible message per batch; the
+    'json' format sends {"host": ..., "alerts": [...]} for SIEM collectors.
+    """
+
+    name = 'webhook'
+
+    def __init__(self, alert_config, outbox: SinkOutbox, **kwargs):
+        super().__init__(outbox, **kwargs)
+        self.alert_config = alert_config
+        self.url = urlsplit(alert_config.webhook_url)
+        if self.url.scheme not in ('http', 'https') or not self.url.hostname:
+            raise ValueError(f"Unsupported webhook URL: {alert_config.webhook_url}")
+        if alert_config.webhook_format not in ('json', 'slack'):
+            raise ValueError(f"Unknown webhook format: {alert_config.webhook_format}")
+        self.path = (self.url.path or '/') + (f"?{self.url.query}" if self.url.query else '')
+        self.hostname = socket.gethostname()
+        self._http: Optional[http.client.HTTPConnection] = None
+
+    def deliver(self, alerts: List[Dict]):
+        body, headers = self._encode(alerts)
+        try:
+            self._post(body, headers)
+        except (http.client.CannotSendRequest, ConnectionError):
+            # The server closed an idle keep-alive connection; reconnect once
+            self.close()
+            self._post(body, headers)
+
+    def close(self):
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    def _post(self, body: bytes, headers: Dict[str, str]):
+        connection = self._connection()
+        connection.request('POST', self.path, body=body, headers=headers)
+        response = connection.getresponse()
+        response.read()  # drain the body so the connection can be reused
+        if response.will_close:
+            self.close()
+        if not 200 <= response.status < 300:
+            raise RuntimeError(f"webhook returned HTTP {response.status} {response.reason}")
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self._http is None:
+            if self.url.scheme == 'https':
+                self._http = http.client.HTTPSConnection(self.url.hostname, self.url.port, timeout=30,
+                                                         context=ssl.create_default_context())
+            else:
+                self._http = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=30)
+        return self._http
+
+    def _encode(self, alerts: List[Dict]) -> Tuple[bytes, Dict[str, str]]:
+        config = self.alert_config
+        if config.webhook_format == 'slack':
+            lines = [f"*Shadow IT Detector on {self.hostname}: {len(alerts)} alert(s)*"]
+            for alert in alerts:
+                lines.append(f"• [{alert['severity'].upper()}] {alert['title']} - {alert['description']}")
+            payload = {'text': '\n'.join(lines)}
+        else:
+            payload = {'host': self.hostname, 'alerts': alerts}
+
+        body = json.dumps(payload, default=str).encode('utf-8')
+        headers = {'Content-Type': 'application/json', **(config.webhook_headers or {})}
+        # Slack incoming webhooks reject gzip-encoded requests
+        if config.webhook_compress and config.webhook_format != 'slack':
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        return body, headers
+
+
+SYSLOG_SEVERITY = {'high': 3, 'medium': 4, 'low': 5}  # error, warning, notice
+SYSLOG_PROTOCOLS = ('udp', 'tcp', 'tls')
+SYSLOG_SD_ID = 'shadowit@32473'
+
+
+def _sd_escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace(']', '\\]')
+
+
+def format_syslog(alert: Dict, facility: int, hostname: str, app_name: str = 'shadowit-detector') -> bytes:
+    """Render an alert payload as an RFC 5424 syslog message"""
+    priority = facility * 8 + SYSLOG_SEVERITY.get(alert['severity'], 5)
+    timestamp = datetime.fromisoformat(alert['timestamp']).astimezone().isoformat()
+    details = alert.get('details') or {}
+    params = {
+        'severity': alert['severity'],
+        'category': alert['category'],
+        'source': alert['source'],
+        'service': details.get('saas_domain'),
+        'count': details.get('coalesced_count')
+    }
+    data = ' '.join(f'{key}="{_sd_escape(value)}"' for key, value in params.items() if value is not None)
+    header = f"<{priority}>1 {timestamp} {hostname or '-'} {app_name} {os.getpid()} ALERT [{SYSLOG_SD_ID} {data}] "
+    return header.encode('utf-8') + b'\xef\xbb\xbf' + f"{alert['title']}: {alert['description']}".encode('utf-8')
+
+
+class SyslogSink(BatchingSink):
+    """Ships alerts as RFC 5424 syslog messages over UDP, TCP or TLS
+
+    TCP and TLS use octet-counting framing (RFC 6587), so a whole batch goes
+    out in a single write on one long-lived connection.
+    """
+
+    name = 'syslog'
+
+    def __init__(self, alert_config, outbox: SinkOutbox, **kwargs):
+        super().__init__(outbox, **kwargs)
+        self.alert_config = alert_config
+        self.protocol = alert_config.syslog_protocol.lower()
+        if self.protocol not in SYSLOG_PROTOCOLS:
+            raise ValueError(f"Unknown syslog protocol: {alert_config.syslog_protocol}")
+        facilities = logging.handlers.SysLogHandler.facility_names
+        if alert_config.syslog_facility not in facilities:
+            raise ValueError(f"Unknown syslog facility: {alert_config.syslog_facility}")
+        self.facility = facilities[alert_config.syslog_facility]
+        self.hostname = socket.gethostname().replace(' ', '-')[:255]
+        self._socket: Optional[socket.socket] = None
+
+    def deliver(self, alerts: List[Dict]):
+        messages = [format_syslog(alert, self.facility, self.hostname) for alert in alerts]
+        if self.protocol == 'udp':
+            sock = self._connection()
+            for message in messages:
+                sock.send(message)
+            return
+
+        frames = b''.join(str(len(message)).encode('ascii') + b' ' + message for message in messages)
+        try:
+            self._connection().sendall(frames)
+        except OSError:
+            # The collector dropped the connection; reconnect once
+            self.close()
+            self._connection().sendall(frames)
+
+    def close(self):
+        if self._socket is not None:
+            try:
+                self._socket.close()
+            except OSError:
+                pass
+            self._socket = None
+
+    def _connection(self) -> socket.socket:
+        if self._socket is not None:
+            return self._socket
+
+        address = (self.alert_config.syslog_host, self.alert_config.syslog_port)
+        if self.protocol == 'udp':
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock.connect(address)
+        else:
+            sock = socket.create_connection(address, timeout=30)
+            if self.protocol == 'tls':
+                context = ssl.create_default_context(cafile=self.alert_config.syslog_tls_ca_file or None)
+                try:
+                    sock = context.wrap_socket(sock, server_hostname=self.alert_config.syslog_host)
+                except Exception:
+                    sock.close()
+                    raise
+        self._socket = sock
+        return sock
+
+
+def sink_outbox_path(config) -> str:
+    """Path of the durable alert outbox for a configuration"""
+    return config.alert_config.sink_queue_path or os.path.join(config.scan_config.state_directory, 'alert_outbox.db')
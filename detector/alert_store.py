@@ -0,0 +1,348 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+SPILL_BATCH_SIZE = 100
+RATE_WINDOWS = {'5m': 300, '1h': 3600, '24h': 86400}
+
+
+class WindowCounter:
+    """Number of events in a sliding time window
+
+    Events are counted in `slots` fixed-width slots; a slot is dropped once
+    it lies wholly outside the window, so adding and reading are amortised
+    O(1) and the count is exact to within one slot (window / slots seconds).
+    """
+
+    def __init__(self, window: float, slots: int = 60, clock: Callable[[], float] = time.time):
+        self.window = window
+        self.width = window / slots
+        self.clock = clock
+        self._slots: Deque[List[float]] = deque()  # [slot start, count], oldest first
+        self._count = 0
+
+    def add(self, timestamp: float, n: int = 1):
+        now = self.clock()
+        self._expire(now)
+        start = timestamp - timestamp % self.width
+        if start + self.width <= now - self.window:
+            return
+        if not self._slots or self._slots[-1][0] < start:
+            self._slots.append([start, n])
+        elif self._slots[-1][0] == start:
+            self._slots[-1][1] += n
+        else:
+            # Late arrival: find or insert its slot
+            for i, slot in enumerate(self._slots):
+                if slot[0] == start:
+                    slot[1] += n
+                    break
+                if slot[0] > start:
+                    self._slots.insert(i, [start, n])
+                    break
+        self._count += n
+
+    def count(self) -> int:
+        self._expire(self.clock())
+        return self._count
+
+    def clear(self):
+        self._slots.clear()
+        self._count = 0
+
+    def _expire(self, now: float):
+        cutoff = now - self.window
+        while self._slots and self._slots[0][0] + self.width <= cutoff:
+            self._count -= self._slots.popleft()[1]
+
+
+class AlertStore:
+    """Bounded, thread-safe alert store
+
+    The newest `capacity` alerts live in an in-memory ring. Older alerts
+    spill to a SQLite file, which is indexed on time, severity, source and
+    service, so queries cost O(page) rather than a copy of every alert.
+    Without a `db_path` older alerts are evicted instead. Supports
+    len(), iteration (oldest first) and clear() like the list it replaces.
+    Summary counters and recent-alert rates are updated on insert, so
+    summary() costs the same however long the history is.
+
+    len(), iteration and summary() cover this session's alerts; alerts
+    from earlier runs are only reached through query() and count(), and
+    are pruned once older than `retention_seconds`.
+    """
+
+    def __init__(self, capacity: int = 1000, db_path: str = '', clock: Callable[[], float] = time.time,
+                 retention_seconds: Optional[float] = None):
+        self.capacity = max(1, capacity)
+        self.retention_seconds = retention_seconds
+        # Without a path alerts leaving the ring are dropped; the empty database only serves queries
+        self.db_path = db_path
+        if db_path and os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._ring: Deque[Tuple[int, object]] = deque()
+        self._spill: List[Tuple[int, object]] = []
+        self._next_id = 1
+        self._total = 0
+        self._counts = {'by_severity': {}, 'by_category': {}, 'by_source': {}, 'by_service': {}}
+        self._windows = {name: WindowCounter(seconds, clock=clock) for name, seconds in RATE_WINDOWS.items()}
+
+        self._conn = sqlite3.connect(db_path or ':memory:', timeout=10, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS alerts (
+                id INTEGER PRIMARY KEY,
+                timestamp REAL NOT NULL,
+                severity TEXT NOT NULL,
+                category TEXT NOT NULL,
+                source TEXT NOT NULL,
+                service TEXT,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                details TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_alerts_time ON alerts (timestamp);
+            CREATE INDEX IF NOT EXISTS idx_alerts_severity ON alerts (severity, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_alerts_source ON alerts (source, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_alerts_service ON alerts (service, timestamp);
+        """)
+        if retention_seconds:
+            self.prune(retention_seconds)
+        row = self._conn.execute("SELECT MAX(id) FROM alerts").fetchone()
+        # Alerts from earlier runs stay queryable but are not part of this session
+        self._first_id = self._next_id = (row[0] or 0) + 1
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator:
+        """Iterate every alert, oldest first, without materialising the store"""
+        with self._lock:
+            self._flush_spill()
+            ring = [alert for _, alert in self._ring]
+            last_id = self._ring[0][0] if self._ring else self._next_id
+        # Rows are read a page at a time, so alerts spilled meanwhile are picked up once
+        after = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, timestamp, severity, category, source, title, description, details "
+                    "FROM alerts WHERE id > ? AND id < ? ORDER BY id LIMIT ?",
+                    (max(after, self._first_id - 1), last_id, SPILL_BATCH_SIZE)).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                yield self._row_to_alert(row[1:])
+            after = rows[-1][0]
+        yield from ring
+
+    def append(self, alert) -> int:
+        """Store an alert and return its id"""
+        with self._lock:
+            alert_id = self._next_id
+            self._next_id += 1
+            if len(self._ring) >= self.capacity:
+                if self.db_path:
+                    self._spill.append(self._ring.popleft())
+                    if len(self._spill) >= SPILL_BATCH_SIZE:
+                        self._flush_spill()
+                else:
+                    self._evict(self._ring.popleft()[1])
+            self._ring.append((alert_id, alert))
+
+            self._total += 1
+            for key, value in (('by_severity', alert.severity), ('by_category', alert.category),
+                               ('by_source', alert.source), ('by_service', _service(alert))):
+                if value is not None:
+                    self._counts[key][value] = self._counts[key].get(value, 0) + 1
+            timestamp = alert.timestamp.timestamp()
+            for window in self._windows.values():
+                window.add(timestamp)
+        return alert_id
+
+    def clear(self):
+        with self._lock:
+            self._ring.clear()
+            self._spill.clear()
+            self._total = 0
+            self._counts = {'by_severity': {}, 'by_category': {}, 'by_source': {}, 'by_service': {}}
+            for window in self._windows.values():
+                window.clear()
+            with self._conn:
+                self._conn.execute("DELETE FROM alerts")
+
+    def summary(self) -> Dict:
+        """Totals by severity, category, source and service, and recent alert rates"""
+        with self._lock:
+            recent = {name: window.count() for name, window in self._windows.items()}
+            return {
+                'total': self._total,
+                'by_severity': dict(self._counts['by_severity']),
+                'by_category': dict(self._counts['by_category']),
+                'by_source': dict(self._counts['by_source']),
+                'by_service': dict(self._counts['by_service']),
+                'recent': recent,
+                'rate_per_minute': {name: round(recent[name] * 60 / seconds, 3)
+                                    for name, seconds in RATE_WINDOWS.items()}
+            }
+
+    def query(self, severity: Optional[str] = None, source: Optional[str] = None,
+              service: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None, limit: int = 50, offset: int = 0) -> List:
+        """Get a page of matching alerts, newest first"""
+        filters = {'severity': severity, 'source': source, 'service': service, 'since': since, 'until': until}
+        with self._lock:
+            page = []
+            skipped = 0
+            # The ring holds the newest alerts, so it is read before the disk
+            for _, alert in reversed(self._ring):
+                if len(page) >= limit:
+                    return page
+                if not self._matches(alert, filters):
+                    continue
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                page.append(alert)
+
+            self._flush_spill()
+            where, params = self._where(filters)
+            rows = self._conn.execute(
+                "SELECT timestamp, severity, category, source, title, description, details "
+                f"FROM alerts {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                params + [limit - len(page), offset - skipped]).fetchall()
+        return page + [self._row_to_alert(row) for row in rows]
+
+    def count(self, severity: Optional[str] = None, source: Optional[str] = None,
+              service: Optional[str] = None, since: Optional[datetime] = None,
+              until: Optional[datetime] = None) -> int:
+        """Count matching alerts"""
+        filters = {'severity': severity, 'source': source, 'service': service, 'since': since, 'until': until}
+        with self._lock:
+            in_ring = sum(1 for _, alert in self._ring if self._matches(alert, filters))
+            self._flush_spill()
+            where, params = self._where(filters)
+            on_disk = self._conn.execute(f"SELECT COUNT(*) FROM alerts {where}", params).fetchone()[0]
+        return in_ring + on_disk
+
+    def flush(self):
+        with self._lock:
+            self._flush_spill()
+
+    def persist(self):
+        """Move every alert, including the ring, to the database so a restart keeps it"""
+        with self._lock:
+            if not self.db_path:
+                return
+            self._spill.extend(self._ring)
+            self._ring.clear()
+            self._flush_spill()
+            if self.retention_seconds:
+                self.prune(self.retention_seconds)
+
+    def prune(self, max_age: float, now: Optional[float] = None) -> int:
+        """Delete stored alerts older than max_age seconds; returns how many"""
+        cutoff = (time.time() if now is None else now) - max_age
+        with self._lock:
+            self._flush_spill()
+            try:
+                with self._conn:
+                    return self._conn.execute("DELETE FROM alerts WHERE timestamp < ?", (cutoff,)).rowcount
+            except sqlite3.Error as e:
+                print(f"Failed to prune alerts: {e}")
+                return 0
+
+    def close(self):
+        """Persist every alert and close the database"""
+        with self._lock:
+            self.persist()
+            self._conn.close()
+
+    def _evict(self, alert):
+        self._total -= 1
+        for key, value in (('by_severity', alert.severity), ('by_category', alert.category),
+                           ('by_source', alert.source), ('by_service', _service(alert))):
+            if value is None:
+                continue
+            self._counts[key][value] -= 1
+            if not self._counts[key][value]:
+                del self._counts[key][value]
+
+    def _flush_spill(self):
+        if not self._spill:
+            return
+        rows = [(alert_id, alert.timestamp.timestamp(), alert.severity, alert.category, alert.source,
+                 _service(alert), alert.title, alert.description, json.dumps(alert.details, default=str))
+                for alert_id, alert in self._spill]
+        self._spill.clear()
+        try:
+            with self._conn:
+                self._conn.executemany("INSERT OR REPLACE INTO alerts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            print(f"Failed to spill alerts: {e}")
+
+    @staticmethod
+    def _matches(alert, filters: Dict) -> bool:
+        if filters['severity'] and alert.severity != filters['severity']:
+            return False
+        if filters['source'] and alert.source != filters['source']:
+            return False
+        if filters['service'] and _service(alert) != filters['service']:
+            return False
+        if filters['since'] and alert.timestamp < filters['since']:
+            return False
+        if filters['until'] and alert.timestamp >= filters['until']:
+            return False
+        return True
+
+    @staticmethod
+    def _where(filters: Dict) -> Tuple[str, list]:
+        clauses, params = [], []
+        for column in ('severity', 'source', 'service'):
+            if filters[column]:
+                clauses.append(f"{column} = ?")
+                params.append(filters[column])
+        if filters['since']:
+            clauses.append("timestamp >= ?")
+            params.append(filters['since'].timestamp())
+        if filters['until']:
+            clauses.append("timestamp < ?")
+            params.append(filters['until'].timestamp())
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    @staticmethod
+    def _row_to_alert(row):
+        from .alert_manager import Alert
+        timestamp, severity, category, source, title, description, details = row
+        return Alert(
+            timestamp=datetime.fromtimestamp(timestamp),
+            severity=severity,
+            category=category,
+            title=title,
+            description=description,
+            details=json.loads(details),
+            source=source
+        )
+
+
+def alert_store_path(config) -> str:
+    """Path of the alert store database for a configuration; empty when alerts are not spilled"""
+    if not config.alert_config.enable_alert_spill:
+        return ''
+    return config.alert_config.alert_store_path or os.path.join(config.scan_config.state_directory, 'alerts.db')
+
+
+def alert_retention_seconds(config) -> Optional[float]:
+    days = config.alert_config.alert_retention_days
+    return days * 86400 if days > 0 else None
+
+
+def _service(alert) -> Optional[str]:
+    """The SaaS service an alert is about, if any"""
+    return (alert.details or {}).get('saas_domain')
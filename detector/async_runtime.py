@@ -0,0 +1,224 @@
+import asyncio
+import contextvars
+import functools
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from .deadline import Deadline, ScanTimeout, deadline_scope
+
+
+class AsyncRuntime:
+    """Single asyncio loop hosting periodic scans, queue consumers and agent I/O"""
+
+    def __init__(self, max_concurrency: int = 4):
+        self.max_concurrency = max_concurrency
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Blocking psutil, SQLite and HTTP work runs here, bounded by the semaphore
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='runtime')
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._factories: Dict[str, Callable[[], Awaitable]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._queue_sizes: Dict[str, int] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._stopping: Optional[asyncio.Event] = None
+        self.executor_restarts = 0
+        self._started = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def add_periodic(self, name: str, func: Callable, interval: float, jitter: float = 0.0,
+                     run_immediately: bool = True, interval_policy: Optional[Callable[[Any], float]] = None,
+                     timeout: Optional[float] = None):
+        """Run `func` every `interval` seconds; blocking functions go to the executor
+
+        `interval_policy`, when given, is called with each run's result and
+        returns the interval until the next run. A run that takes longer
+        than `timeout` seconds is cancelled and counted as a timeout.
+        """
+        self._register(name, lambda: self._periodic(name, func, interval, jitter, run_immediately,
+                                                    interval_policy, timeout))
+
+    def add_consumer(self, name: str, handler: Callable, maxsize: int = 1000):
+        """Run `handler` for every item posted to the named queue"""
+        self._queue_sizes[name] = maxsize
+        self._register(name, lambda: self._consume(name, handler))
+
+    def post(self, name: str, item) -> bool:
+        """Post an item to a consumer queue from any thread; False if not running"""
+        if self.loop is None or self.loop.is_closed():
+            return False
+        try:
+            self.loop.call_soon_threadsafe(self._put, name, item)
+        except RuntimeError:
+            return False
+        return True
+
+    async def run_blocking(self, func: Callable, *args):
+        """Run a blocking call in the executor under the concurrency limit
+
+        The call sees the caller's scan deadline, so it can stop cooperatively
+        once the calling task has been cancelled.
+        """
+        context = contextvars.copy_context()
+        async with self._semaphore:
+            future = self._executor.submit(context.run, functools.partial(func, *args))
+            try:
+                return await asyncio.wrap_future(future)
+            except asyncio.CancelledError:
+                if not future.cancel() and not future.done():
+                    self._restart_executor()
+                raise
+
+    def start(self, timeout: float = 5.0):
+        """Start the event loop in a background thread"""
+        if self.is_running:
+            return
+        self._started.clear()
+        self._thread = threading.Thread(target=self._run_loop, name='shadowit-runtime', daemon=True)
+        self._thread.start()
+        self._started.wait(timeout)
+
+    def stop(self, timeout: float = 5.0):
+        """Cancel every task, wait for them to unwind, then stop the loop"""
+        if self.loop is not None and self._stopping is not None and not self.loop.is_closed():
+            try:
+                self.loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass
+        if self._thread:
+            self._thread.join(timeout=timeout)
+        self._executor.shutdown(wait=False)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get per-task run statistics and queue depths"""
+        return {
+            'running': self.is_running,
+            'max_concurrency': self.max_concurrency,
+            'executor_restarts': self.executor_restarts,
+            'tasks': {name: dict(stats) for name, stats in self._stats.items()},
+            'queue_depths': {name: queue.qsize() for name, queue in self._queues.items()}
+        }
+
+    def _register(self, name: str, factory: Callable[[], Awaitable]):
+        self._factories[name] = factory
+        self._stats.setdefault(name, {'runs': 0, 'errors': 0, 'dropped': 0, 'timeouts': 0,
+                                      'last_duration': None, 'last_error': None})
+        if self.loop is not None and self.is_running:
+            self.loop.call_soon_threadsafe(self._spawn, name)
+
+    def _spawn(self, name: str):
+        if name in self._queue_sizes and name not in self._queues:
+            self._queues[name] = asyncio.Queue(maxsize=self._queue_sizes[name])
+        self._tasks[name] = self.loop.create_task(self._factories[name]())
+
+    def _put(self, name: str, item):
+        queue = self._queues.get(name)
+        if queue is None:
+            return
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self._stats[name]['dropped'] += 1
+
+    def _restart_executor(self):
+        """Replace an executor whose worker is stuck in an abandoned call"""
+        if self._stopping is not None and self._stopping.is_set():
+            return
+        stuck = self._executor
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='runtime')
+        stuck.shutdown(wait=False)
+        self.executor_restarts += 1
+
+    def _run_loop(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            self.loop.close()
+
+    async def _main(self):
+        self._stopping = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        for name in list(self._factories):
+            self._spawn(name)
+        self._started.set()
+
+        await self._stopping.wait()
+
+        # Structured shutdown: cancel everything and wait for it to finish unwinding
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._queues.clear()
+
+    async def _invoke(self, func: Callable, *args):
+        if asyncio.iscoroutinefunction(func):
+            return await func(*args)
+        return await self.run_blocking(func, *args)
+
+    async def _periodic(self, name: str, func: Callable, interval: float, jitter: float, run_immediately: bool,
+                        interval_policy: Optional[Callable[[Any], float]], timeout: Optional[float]):
+        stats = self._stats[name]
+        stats['interval'] = interval
+        base = self.loop.time() + (0.0 if run_immediately else interval)
+        while True:
+            delay = base + random.uniform(0, jitter) - self.loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            started = self.loop.time()
+            result = None
+            deadline = Deadline(timeout, self.loop.time)
+            try:
+                with deadline_scope(deadline):
+                    call = self._invoke(func)
+                    result = await (asyncio.wait_for(call, timeout) if timeout else call)
+                stats['last_error'] = None
+            except asyncio.CancelledError:
+                deadline.cancel()
+                raise
+            except (asyncio.TimeoutError, ScanTimeout):
+                deadline.cancel()
+                stats['timeouts'] += 1
+                stats['last_error'] = f"timed out after {timeout}s"
+                print(f"{name} task timed out after {timeout}s")
+            except Exception as e:
+                stats['errors'] += 1
+                stats['last_error'] = str(e)
+                print(f"Error in {name} task: {e}")
+            stats['runs'] += 1
+            stats['last_duration'] = self.loop.time() - started
+
+            if interval_policy is not None:
+                try:
+                    interval = float(interval_policy(result))
+                    stats['interval'] = interval
+                except Exception as e:
+                    print(f"Error in {name} interval policy: {e}")
+            base = max(base + interval, self.loop.time())
+
+    async def _consume(self, name: str, handler: Callable):
+        stats = self._stats[name]
+        queue = self._queues[name]
+        while True:
+            item = await queue.get()
+            try:
+                await self._invoke(handler, item)
+                stats['runs'] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats['errors'] += 1
+                stats['last_error'] = str(e)
+                print(f"Error in {name} consumer: {e}")
+            finally:
+                queue.task_done()
@@ -3,15 +3,130 @@ import json
 import sqlite3
 import platform
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterator
 import shutil
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+# Optional incremental JSON parser for very large Bookmarks files
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+from .saas_db import load_saas_catalog
+from .extension_analyzer import ExtensionPermissionAnalyzer
+from .deadline import check_deadline
+
+# Add-on locations that ship with Firefox itself rather than being user-installed
+FIREFOX_BUILTIN_LOCATIONS = {'app-builtin', 'app-system-defaults', 'app-system-addons'}
+
+XPI_READ_WORKERS = 8
+
+def _localize(value: str, messages: Dict) -> str:
+    """Resolve a __MSG_key__ placeholder from an extension's default locale"""
+    if isinstance(value, str) and value.startswith('__MSG_') and value.endswith('__'):
+        # Message keys are case-insensitive
+        key = value[len('__MSG_'):-2].lower()
+        for name, entry in messages.items():
+            if name.lower() == key:
+                return entry.get('message', value)
+    return value
+
+def _unknown_extension(ext_id: str) -> Dict:
+    """Placeholder for an extension whose manifest cannot be read"""
+    return {
+        'id': ext_id,
+        'name': ext_id,
+        'version': 'Unknown',
+        'description': '',
+        'permissions': [],
+        'host_permissions': []
+    }
+
+def _manifest_info(ext_id: str, manifest: Dict, messages: Dict) -> Dict:
+    """Extension metadata from a Firefox manifest.json"""
+    gecko = (manifest.get('browser_specific_settings') or manifest.get('applications') or {}).get('gecko', {})
+    return {
+        'id': gecko.get('id', ext_id),
+        'name': _localize(manifest.get('name', ext_id), messages),
+        'version': manifest.get('version', 'Unknown'),
+        'description': _localize(manifest.get('description', ''), messages),
+        'permissions': manifest.get('permissions', []),
+        'host_permissions': manifest.get('host_permissions', [])
+    }
+
+_CHECKSUM_PATTERN = re.compile(rb'"checksum"\s*:\s*"([0-9a-fA-F]+)"')
+
+# Fields kept for each bookmark node; everything else is discarded while parsing
+_BOOKMARK_FIELDS = ('name', 'url', 'date_added', 'type')
+
+def _read_bookmarks_checksum(bookmark_path: str) -> Optional[str]:
+    """Read the top-level checksum from the head of a Chrome Bookmarks file"""
+    with open(bookmark_path, 'rb') as f:
+        match = _CHECKSUM_PATTERN.search(f.read(4096))
+    return match.group(1).decode('ascii') if match else None
+
+def _bookmark_entry(node: Dict) -> Dict:
+    return {
+        'title': node.get('name', ''),
+        'url': node.get('url', ''),
+        'date_added': node.get('date_added', 0)
+    }
+
+def walk_bookmark_roots(roots: Dict) -> Iterator[Dict]:
+    """Yield URL bookmarks from a parsed `roots` object using an explicit stack"""
+    stack = [node for node in reversed(list(roots.values())) if isinstance(node, dict)]
+    while stack:
+        node = stack.pop()
+        if node.get('type') == 'url':
+            yield _bookmark_entry(node)
+        else:
+            stack.extend(reversed(node.get('children') or []))
+
+def _stream_bookmarks(f) -> Iterator[Dict]:
+    """Yield URL bookmarks from parser events without materializing the tree"""
+    stack = []  # (prefix, fields) for each open bookmark node
+    for prefix, event, value in ijson.parse(f):
+        if event == 'start_map' and prefix.endswith('children.item'):
+            stack.append((prefix, {}))
+        elif event == 'end_map' and stack and prefix == stack[-1][0]:
+            _, node = stack.pop()
+            if node.get('type') == 'url':
+                yield _bookmark_entry(node)
+        elif stack and event in ('string', 'number'):
+            item_prefix, node = stack[-1]
+            parent, _, field = prefix.rpartition('.')
+            if parent == item_prefix and field in _BOOKMARK_FIELDS:
+                node[field] = value
+
+def iter_chrome_bookmarks(bookmark_path: str, streaming: Optional[bool] = None) -> Iterator[Dict]:
+    """Yield bookmarks from a Chrome/Edge Bookmarks file one at a time"""
+    if streaming is None:
+        streaming = IJSON_AVAILABLE
+    
+    if streaming:
+        with open(bookmark_path, 'rb') as f:
+            yield from _stream_bookmarks(f)
+    else:
+        with open(bookmark_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        yield from walk_bookmark_roots(data.get('roots', {}))
 
 class BrowserScanner:
     """Scans browsers for SaaS usage including extensions, bookmarks, and history"""
     
-    def __init__(self):
+    def __init__(self, saas_catalog: Optional[Dict[str, Dict]] = None):
         self.system = platform.system()
         self.browser_paths = self._get_browser_paths()
+        self.saas_catalog = saas_catalog if saas_catalog is not None else load_saas_catalog()
+        self.permission_analyzer = ExtensionPermissionAnalyzer(self.saas_catalog)
+        self.catalog_index = self.permission_analyzer.index
+        self._xpi_cache = {}
+        self._bookmark_cache = {}
     
     def _get_browser_paths(self) -> Dict[str, Dict[str, str]]:
         """Get browser data paths for different operating systems"""
@@ -78,11 +193,24 @@ class BrowserScanner:
         
         return paths
     
-    def scan_browser_extensions(self) -> List[Dict]:
+    def firefox_profiles(self) -> List[str]:
+        """Get the Firefox profile directories that are scanned"""
+        root = self.browser_paths.get('firefox', {}).get('extensions')
+        if not root or not os.path.isdir(root):
+            return []
+        return [
+            os.path.join(root, profile_dir) for profile_dir in os.listdir(root)
+            if profile_dir.endswith('.default') or profile_dir.endswith('.default-release')
+        ]
+    
+    def scan_browser_extensions(self, browsers: Optional[List[str]] = None) -> List[Dict]:
         """Scan for browser extensions that might be SaaS-related"""
         extensions = []
         
         for browser, paths in self.browser_paths.items():
+            if browsers is not None and browser not in browsers:
+                continue
+            check_deadline()
             ext_path = paths.get('extensions')
             if not ext_path or not os.path.exists(ext_path):
                 continue
@@ -97,7 +225,7 @@ class BrowserScanner:
             except Exception as e:
                 print(f"Error scanning {browser} extensions: {e}")
         
-        return extensions
+        return self.permission_analyzer.annotate(extensions)
     
     def _scan_chrome_extensions(self, ext_path: str, browser: str) -> List[Dict]:
         """Scan Chrome/Edge extensions"""
@@ -133,33 +261,121 @@ class BrowserScanner:
         return extensions
     
     def _scan_firefox_extensions(self, ext_path: str, browser: str) -> List[Dict]:
-        """Scan Firefox extensions"""
+        """Scan Firefox extensions from extensions.json, falling back to XPI manifests"""
         extensions = []
         
         # Firefox stores extensions in profile directories
-        if os.path.exists(ext_path):
-            for profile_dir in os.listdir(ext_path):
-                if profile_dir.endswith('.default') or profile_dir.endswith('.default-release'):
-                    profile_path = os.path.join(ext_path, profile_dir)
-                    extensions_path = os.path.join(profile_path, 'extensions')
-                    
-                    if os.path.exists(extensions_path):
-                        for ext_file in os.listdir(extensions_path):
-                            ext_path_full = os.path.join(extensions_path, ext_file)
-                            if ext_file.endswith('.xpi') or os.path.isdir(ext_path_full):
-                                ext_info = {
-                                    'browser': browser,
-                                    'id': ext_file,
-                                    'name': ext_file,
-                                    'version': 'Unknown',
-                                    'description': '',
-                                    'permissions': [],
-                                    'host_permissions': []
-                                }
-                                extensions.append(ext_info)
+        if not os.path.exists(ext_path):
+            return extensions
+        
+        for profile_dir in os.listdir(ext_path):
+            if profile_dir.endswith('.default') or profile_dir.endswith('.default-release'):
+                extensions.extend(self.scan_firefox_profile_extensions(os.path.join(ext_path, profile_dir), browser))
+        
+        return extensions
+    
+    def scan_firefox_profile_extensions(self, profile_path: str, browser: str = 'firefox') -> List[Dict]:
+        """Scan the extensions of a single Firefox profile"""
+        extensions = []
+        known_ids = set()
+        
+        # extensions.json carries metadata and granted permissions for every add-on
+        addons_path = os.path.join(profile_path, 'extensions.json')
+        if os.path.exists(addons_path):
+            try:
+                with open(addons_path, 'r', encoding='utf-8') as f:
+                    addons = json.load(f).get('addons', [])
+                for addon in addons:
+                    if addon.get('location') in FIREFOX_BUILTIN_LOCATIONS:
+                        continue
+                    locale = addon.get('defaultLocale') or {}
+                    user_permissions = addon.get('userPermissions') or {}
+                    extensions.append({
+                        'browser': browser,
+                        'id': addon.get('id', 'Unknown'),
+                        'name': locale.get('name') or addon.get('id', 'Unknown'),
+                        'version': addon.get('version') or 'Unknown',
+                        'description': locale.get('description') or '',
+                        'permissions': user_permissions.get('permissions', []),
+                        'host_permissions': user_permissions.get('origins', [])
+                    })
+                    known_ids.add(addon.get('id'))
+            except Exception as e:
+                print(f"Error reading Firefox extensions.json: {e}")
+        
+        # Fall back to reading manifests straight out of XPIs and unpacked
+        # extension directories not listed above
+        extensions_path = os.path.join(profile_path, 'extensions')
+        if not os.path.isdir(extensions_path):
+            return extensions
+        
+        xpi_paths = []
+        for ext_file in os.listdir(extensions_path):
+            ext_path_full = os.path.join(extensions_path, ext_file)
+            if ext_file.endswith('.xpi'):
+                if ext_file[:-len('.xpi')] not in known_ids:
+                    xpi_paths.append(ext_path_full)
+            elif os.path.isdir(ext_path_full) and ext_file not in known_ids:
+                extensions.append({'browser': browser, **self._read_unpacked_manifest(ext_path_full)})
+        if xpi_paths:
+            with ThreadPoolExecutor(max_workers=min(XPI_READ_WORKERS, len(xpi_paths))) as executor:
+                for ext_info in executor.map(self._read_xpi_manifest, xpi_paths):
+                    if ext_info:
+                        extensions.append({'browser': browser, **ext_info})
         
         return extensions
     
+    def _read_unpacked_manifest(self, ext_dir: str) -> Dict:
+        """Read manifest.json from an unpacked extension directory"""
+        ext_id = os.path.basename(ext_dir)
+        try:
+            with open(os.path.join(ext_dir, 'manifest.json'), 'r', encoding='utf-8-sig') as f:
+                manifest = json.load(f)
+        except Exception:
+            return _unknown_extension(ext_id)
+        
+        messages = {}
+        default_locale = manifest.get('default_locale')
+        if default_locale:
+            try:
+                with open(os.path.join(ext_dir, '_locales', default_locale, 'messages.json'),
+                          'r', encoding='utf-8-sig') as f:
+                    messages = json.load(f)
+            except (OSError, ValueError):
+                messages = {}
+        return _manifest_info(ext_id, manifest, messages)
+    
+    def _read_xpi_manifest(self, xpi_path: str) -> Optional[Dict]:
+        """Read manifest.json from an XPI without extracting it, cached by (path, mtime)"""
+        try:
+            mtime = os.path.getmtime(xpi_path)
+        except OSError:
+            return None
+        
+        cached = self._xpi_cache.get(xpi_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        ext_id = os.path.basename(xpi_path)[:-len('.xpi')]
+        try:
+            with zipfile.ZipFile(xpi_path) as xpi:
+                manifest = json.loads(xpi.read('manifest.json').decode('utf-8-sig'))
+                messages = {}
+                default_locale = manifest.get('default_locale')
+                if default_locale:
+                    try:
+                        messages = json.loads(xpi.read(f"_locales/{default_locale}/messages.json").decode('utf-8-sig'))
+                    except (KeyError, ValueError):
+                        messages = {}
+        except Exception:
+            ext_info = _unknown_extension(ext_id)
+            self._xpi_cache[xpi_path] = (mtime, ext_info)
+            return ext_info
+        
+        ext_info = _manifest_info(ext_id, manifest, messages)
+        self._xpi_cache[xpi_path] = (mtime, ext_info)
+        return ext_info
+    
     def _scan_safari_extensions(self, ext_path: str, browser: str) -> List[Dict]:
         """Scan Safari extensions"""
         extensions = []
@@ -180,11 +396,14 @@ class BrowserScanner:
         
         return extensions
     
-    def scan_browser_bookmarks(self) -> List[Dict]:
+    def scan_browser_bookmarks(self, browsers: Optional[List[str]] = None) -> List[Dict]:
         """Scan browser bookmarks for SaaS domains"""
         bookmarks = []
         
         for browser, paths in self.browser_paths.items():
+            if browsers is not None and browser not in browsers:
+                continue
+            check_deadline()
             bookmark_path = paths.get('bookmarks')
             if not bookmark_path or not os.path.exists(bookmark_path):
                 continue
@@ -200,37 +419,49 @@ class BrowserScanner:
         return bookmarks
     
     def _scan_chrome_bookmarks(self, bookmark_path: str, browser: str) -> List[Dict]:
-        """Scan Chrome/Edge bookmarks"""
+        """Scan Chrome/Edge bookmarks, streaming matches against the SaaS catalog"""
         bookmarks = []
         
         try:
-            with open(bookmark_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-            def extract_bookmarks(bookmark_data):
-                results = []
-                if 'children' in bookmark_data:
-                    for child in bookmark_data['children']:
-                        if child.get('type') == 'url':
-                            results.append({
-                                'browser': browser,
-                                'title': child.get('name', ''),
-                                'url': child.get('url', ''),
-                                'date_added': child.get('date_added', 0)
-                            })
-                        elif child.get('type') == 'folder':
-                            results.extend(extract_bookmarks(child))
-                return results
+            # Chrome rewrites the checksum whenever bookmarks change
+            checksum = _read_bookmarks_checksum(bookmark_path)
+            cached = self._bookmark_cache.get(bookmark_path)
+            if checksum and cached and cached[0] == checksum:
+                return [dict(bookmark) for bookmark in cached[1]]
+            
+            for bookmark in iter_chrome_bookmarks(bookmark_path):
+                saas_match = self._match_saas_url(bookmark['url'])
+                if saas_match:
+                    bookmarks.append({'browser': browser, **bookmark, **saas_match})
             
-            if 'roots' in data:
-                for root_name, root_data in data['roots'].items():
-                    bookmarks.extend(extract_bookmarks(root_data))
+            if checksum:
+                self._bookmark_cache[bookmark_path] = (checksum, [dict(bookmark) for bookmark in bookmarks])
         
         except Exception as e:
             print(f"Error reading Chrome bookmarks: {e}")
         
         return bookmarks
     
+    def _match_saas_url(self, url: str) -> Optional[Dict]:
+        """Return SaaS catalog fields for a URL, or None if it is not a SaaS service"""
+        try:
+            host = urlparse(url).hostname
+        except ValueError:
+            return None
+        if not host:
+            return None
+        
+        domain = self.catalog_index.match_host(host)
+        if not domain:
+            return None
+        
+        entry = self.saas_catalog.get(domain, {})
+        return {
+            'saas_domain': domain,
+            'category': entry.get('category', 'Unknown'),
+            'risk_level': entry.get('risk_level', 'medium')
+        }
+    
     def _scan_firefox_bookmarks(self, bookmark_path: str, browser: str) -> List[Dict]:
         """Scan Firefox bookmarks"""
         bookmarks = []
@@ -258,13 +489,16 @@ class BrowserScanner:
                                 WHERE moz_bookmarks.type = 1
                             """)
                             
-                            for row in cursor.fetchall():
-                                bookmarks.append({
-                                    'browser': browser,
-                                    'title': row[0] or '',
-                                    'url': row[1] or '',
-                                    'date_added': row[2] or 0
-                                })
+                            for row in cursor:
+                                saas_match = self._match_saas_url(row[1] or '')
+                                if saas_match:
+                                    bookmarks.append({
+                                        'browser': browser,
+                                        'title': row[0] or '',
+                                        'url': row[1] or '',
+                                        'date_added': row[2] or 0,
+                                        **saas_match
+                                    })
                             
                             conn.close()
                             os.remove(temp_path)
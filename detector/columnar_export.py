@@ -0,0 +1,173 @@
+import socket
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Optional pyarrow import for Parquet / Arrow IPC exports
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+COLUMNAR_FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+# Columns every table starts with, so files from many hosts can be concatenated
+COMMON_COLUMNS = [('host', 'dict'), ('scanned_at', 'timestamp')]
+
+# Stable schema per finding type. 'dict' columns are dictionary-encoded strings;
+# fields a record lacks are written as nulls and unknown fields are ignored.
+FINDING_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    'network': [('saas_domain', 'dict'), ('fqdn', 'string'), ('raddr', 'string'), ('laddr', 'string'),
+                ('pid', 'int64'), ('category', 'dict'), ('risk_level', 'dict')],
+    'endpoint': [('name', 'string'), ('endpoint_type', 'dict'), ('saas_domain', 'dict'), ('pid', 'int64'),
+                 ('exe', 'string'), ('category', 'dict'), ('risk_level', 'dict')],
+    'extension': [('browser', 'dict'), ('id', 'string'), ('name', 'string'), ('version', 'string'),
+                  ('permissions', 'list'), ('host_permissions', 'list'), ('saas_access', 'list'),
+                  ('broad_host_access', 'bool'), ('sensitive_permissions', 'list'), ('risk_level', 'dict')],
+    'bookmark': [('browser', 'dict'), ('title', 'string'), ('url', 'string'), ('date_added', 'int64'),
+                 ('saas_domain', 'dict'), ('category', 'dict'), ('risk_level', 'dict')],
+    'history': [('browser', 'dict'), ('title', 'string'), ('url', 'string'), ('last_visit', 'int64'),
+                ('visit_count', 'int64'), ('saas_domain', 'dict'), ('category', 'dict')],
+    'usage': [('saas_domain', 'dict'), ('visits', 'int64'), ('active_seconds', 'float64')],
+}
+
+
+def _arrow_type(kind: str):
+    return {
+        'dict': pa.dictionary(pa.int32(), pa.string()),
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+        'list': pa.list_(pa.string()),
+        'timestamp': pa.timestamp('s', tz='UTC'),
+    }[kind]
+
+
+def finding_schema(finding_type: str):
+    """Arrow schema for one finding type"""
+    if not PYARROW_AVAILABLE:
+        raise ValueError("Columnar exports need pyarrow (pip install shadowit-detector[columnar])")
+    return pa.schema([(name, _arrow_type(kind)) for name, kind in COMMON_COLUMNS + FINDING_COLUMNS[finding_type]])
+
+
+def _coerce(value, kind: str):
+    if value is None:
+        return None
+    try:
+        if kind == 'int64':
+            return int(value)
+        if kind == 'float64':
+            return float(value)
+        if kind == 'bool':
+            return bool(value)
+        if kind == 'list':
+            return [str(item) for item in value]
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+class ColumnarWriter:
+    """Writes typed finding records to Parquet or Arrow IPC files
+
+    Records are buffered per finding type and written out as a row group
+    (Parquet) or record batch (Arrow) every `row_group_size` rows, so a
+    scanner's generator can be fed straight in with bounded memory. Each
+    finding type goes to its own file, <stem>_<type><suffix>, with the
+    schema from FINDING_COLUMNS. Dictionary columns share one growing
+    dictionary per file, as an Arrow IPC file only allows later batches
+    to append to a dictionary, not replace it.
+    """
+
+    def __init__(self, path, fmt: str = 'parquet', row_group_size: int = 65536,
+                 host: Optional[str] = None, scanned_at: Optional[datetime] = None):
+        if fmt not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown columnar format: {fmt}")
+        if not PYARROW_AVAILABLE:
+            raise ValueError("Columnar exports need pyarrow (pip install shadowit-detector[columnar])")
+        self.path = Path(path)
+        self.fmt = fmt
+        self.row_group_size = max(1, row_group_size)
+        self.host = host or socket.gethostname()
+        self.scanned_at = scanned_at or datetime.now(timezone.utc)
+        self.counts: Dict[str, int] = {}
+        self.paths: Dict[str, str] = {}
+        self._buffers: Dict[str, List[Dict]] = {}
+        self._writers = {}
+        # (finding type, column) -> value -> dictionary index
+        self._dictionaries: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+    def add(self, record: Dict):
+        """Buffer one record; its 'type' picks the table"""
+        finding_type = record.get('type')
+        if finding_type not in FINDING_COLUMNS:
+            return
+        buffer = self._buffers.setdefault(finding_type, [])
+        buffer.append(record)
+        if len(buffer) >= self.row_group_size:
+            self._flush(finding_type)
+
+    def write_records(self, records: Iterable[Dict]) -> int:
+        added = 0
+        for record in records:
+            self.add(record)
+            added += 1
+        return added
+
+    def close(self) -> Dict[str, str]:
+        """Flush what is buffered and close every file; returns type -> path"""
+        for finding_type in list(self._buffers):
+            self._flush(finding_type)
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+        return dict(self.paths)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _flush(self, finding_type: str):
+        records = self._buffers.pop(finding_type, None)
+        if not records:
+            return
+        schema = finding_schema(finding_type)
+        columns = [
+            self._dictionary_array(finding_type, 'host', [self.host] * len(records)),
+            pa.array([self.scanned_at] * len(records), type=schema.field('scanned_at').type)
+        ]
+        for name, kind in FINDING_COLUMNS[finding_type]:
+            values = [_coerce(record.get(name), kind) for record in records]
+            if kind == 'dict':
+                columns.append(self._dictionary_array(finding_type, name, values))
+            else:
+                columns.append(pa.array(values, type=_arrow_type(kind)))
+        batch = pa.RecordBatch.from_arrays(columns, schema=schema)
+
+        writer = self._writers.get(finding_type)
+        if writer is None:
+            path = self.path.with_name(f"{self.path.stem}_{finding_type}{COLUMNAR_FORMATS[self.fmt]}")
+            if self.fmt == 'parquet':
+                writer = pq.ParquetWriter(str(path), schema, compression='zstd')
+            else:
+                writer = pa.ipc.new_file(str(path), schema,
+                                         options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+            self._writers[finding_type] = writer
+            self.paths[finding_type] = str(path)
+        if self.fmt == 'parquet':
+            writer.write_batch(batch, row_group_size=self.row_group_size)
+        else:
+            writer.write_batch(batch)
+        self.counts[finding_type] = self.counts.get(finding_type, 0) + len(records)
+
+    def _dictionary_array(self, finding_type: str, name: str, values: List[Optional[str]]):
+        # Encode against the column's dictionary so far; new values are appended to it
+        index = self._dictionaries.setdefault((finding_type, name), {})
+        indices = [None if value is None else index.setdefault(value, len(index)) for value in values]
+        return pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int32()),
+                                              pa.array(list(index), type=pa.string()))
@@ -10,10 +10,34 @@ class ScanConfig:
     endpoint_scan_interval: int = 3600  # 1 hour
     browser_scan_interval: int = 1800  # 30 minutes
     max_connections_per_scan: int = 1000
+    scan_jitter_seconds: float = 5.0
+    scan_overlap_policy: str = "skip"  # skip, coalesce
+    monitor_runtime: str = "threads"  # threads, asyncio
+    async_max_concurrency: int = 4
+    event_queue_size: int = 1000  # per subscriber
+    event_overflow_policy: str = "drop_oldest"  # drop_oldest, drop_newest, block
+    network_scan_timeout: int = 120  # cancel a scan after this many seconds
+    endpoint_scan_timeout: int = 300
+    browser_scan_timeout: int = 600
+    adaptive_intervals: bool = False
+    adaptive_min_interval: int = 30
+    adaptive_max_interval: int = 7200  # 2 hours
+    adaptive_cpu_threshold: float = 75.0  # percent
+    adaptive_load_threshold: float = 1.0  # load average per CPU
+    adaptive_backoff_factor: float = 2.0
     enable_real_time_monitoring: bool = True
     enable_browser_extension_scan: bool = True
     enable_cloud_storage_scan: bool = True
     enable_social_media_scan: bool = True
+    enable_usage_analytics: bool = True
+    usage_retention_days: int = 90
+    state_directory: str = "state"
+    enable_state_store: bool = True
+    state_retention_days: int = 30  # forget findings not seen for this long
+    enable_fs_watch: bool = False
+    enable_bookmark_alerts: bool = False  # alert on newly bookmarked SaaS services
+    fs_watch_debounce_seconds: float = 2.0
+    fs_watch_poll_interval: int = 10
 
 @dataclass
 class AlertConfig:
@@ -21,12 +45,55 @@ class AlertConfig:
     enable_email_alerts: bool = False
     enable_console_alerts: bool = True
     enable_log_file: bool = True
+    log_directory: str = "logs"
+    log_max_bytes: int = 10485760  # 10 MB
+    log_rotation_hours: float = 24.0
+    log_backup_count: int = 14
+    log_compress: bool = True
     alert_threshold: str = "medium"  # low, medium, high
     email_recipients: Optional[List[str]] = None
     smtp_server: str = ""
     smtp_port: int = 587
     smtp_username: str = ""
     smtp_password: str = ""
+    smtp_use_starttls: bool = True
+    email_batch_size: int = 20  # alerts per digest
+    email_batch_interval: float = 60.0  # seconds an alert may wait for a digest
+    sink_retry_max_attempts: int = 8
+    sink_retry_backoff_seconds: float = 5.0  # doubled after each failed attempt
+    sink_queue_path: str = ""  # durable outbox; defaults to <state_directory>/alert_outbox.db
+    sink_max_pending: int = 10000  # per sink; oldest queued alerts are dropped beyond this
+    sink_batch_size: int = 100  # alerts per webhook request or syslog write
+    sink_batch_interval: float = 5.0  # seconds an alert may wait for a batch
+    enable_webhook_alerts: bool = False
+    webhook_url: str = ""
+    webhook_format: str = "json"  # json (SIEM collectors) or slack
+    webhook_headers: Optional[Dict[str, str]] = None  # e.g. an Authorization header
+    webhook_compress: bool = True  # gzip request bodies; ignored for the slack format
+    enable_syslog_alerts: bool = False
+    syslog_host: str = ""
+    syslog_port: int = 514
+    syslog_protocol: str = "udp"  # udp, tcp or tls
+    syslog_facility: str = "local0"
+    syslog_tls_ca_file: str = ""  # CA bundle for tls; empty uses the system store
+    alert_memory_capacity: int = 1000  # newest alerts kept in memory
+    alert_store_path: str = ""  # SQLite file for older alerts; defaults to <state_directory>/alerts.db
+    enable_alert_spill: bool = True  # false drops alerts older than the newest alert_memory_capacity
+    alert_retention_days: int = 30  # stored alerts older than this are deleted; 0 keeps them
+    enable_alert_coalescing: bool = True
+    alert_coalesce_window: float = 60.0  # seconds
+    alert_coalesce_max_window: float = 600.0  # seconds
+    alert_coalesce_max_keys: int = 10000
+    sink_rate_limit_per_minute: float = 30.0  # console alerts below urgent_alert_severity; 0 disables
+    sink_rate_burst: int = 10
+    alert_dispatch_workers: int = 2  # 0 dispatches on the caller's thread
+    alert_queue_size: int = 10000
+    alert_shed_depth: int = 5000  # queue depth beyond which alerts at alert_shed_severity are dropped
+    alert_shed_severity: str = "low"
+    urgent_alert_severity: str = "high"  # delivered without waiting for a batch
+    enable_incident_correlation: bool = True
+    incident_ttl_seconds: float = 3600.0  # an incident closes after this long without new alerts
+    incident_max_open: int = 5000
 
 @dataclass
 class ReportConfig:
@@ -34,9 +101,22 @@ class ReportConfig:
     enable_html_reports: bool = True
     enable_csv_reports: bool = True
     enable_json_reports: bool = True
+    enable_ndjson_reports: bool = False  # one finding per line, streamed
+    export_compression: str = ""  # gzip or zstd for CSV/NDJSON reports; empty for none
+    enable_columnar_reports: bool = False  # Parquet/Arrow files per finding type; needs pyarrow
+    columnar_format: str = "parquet"  # parquet or arrow
+    columnar_row_group_size: int = 65536  # rows buffered per row group / record batch
+    report_workers: int = 4  # processes rendering report formats in parallel; 0 renders inline
+    report_pool_min_findings: int = 5000  # smaller scans, or a single report, render inline
+    monitor_report_interval: int = 0  # seconds between reports of the monitor's findings; 0 disables
     report_directory: str = "reports"
     auto_generate_reports: bool = True
     report_retention_days: int = 30
+    html_page_rows: int = 1000  # rows per HTML table page; longer tables continue on linked pages
+    html_top_n: int = 20  # services summarised above paginated tables
+    console_top_n: int = 10  # rows per console table; full detail goes to the reports
+    console_max_fps: float = 4.0  # live view redraws per second
+    console_plain_interval: float = 10.0  # seconds between summary lines when not on a terminal
 
 @dataclass
 class SecurityConfig:
@@ -0,0 +1,190 @@
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+# Optional rich imports for the live view
+try:
+    from rich.console import Group
+    from rich.live import Live
+    from rich.table import Table
+    from rich.text import Text
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+SEVERITY_STYLES = {'high': 'red', 'medium': 'yellow', 'low': 'green'}
+RISK_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+# (heading, columns, rows, rows left out)
+Section = Tuple[str, List[str], List[List[str]], int]
+
+
+def scan_summary_sections(findings: Dict, top_n: int = 10) -> List[Section]:
+    """Top-N view of scan findings; the full lists belong in the reports"""
+    sections = [('Summary', ['Metric', 'Count'], [
+        ['Total Findings', str(findings['total_findings'])],
+        ['High Risk', str(findings['high_risk_count'])],
+        ['Medium Risk', str(findings['medium_risk_count'])],
+        ['Low Risk', str(findings['low_risk_count'])]
+    ], 0)]
+
+    network = findings.get('network_findings') or []
+    if network:
+        connections = Counter(finding.get('saas_domain', 'Unknown') for finding in network)
+        processes = {}
+        for finding in network:
+            processes.setdefault(finding.get('saas_domain', 'Unknown'), set()).add(finding.get('pid'))
+        rows = [[service, str(count), str(len(processes[service]))]
+                for service, count in connections.most_common(top_n)]
+        sections.append(('🌐 Network Connections', ['Service', 'Connections', 'Processes'],
+                         rows, len(connections) - len(rows)))
+
+    endpoint = findings.get('endpoint_findings') or []
+    if endpoint:
+        rows = [[finding.get('name', 'Unknown'), finding.get('type', 'Unknown'), finding.get('saas_domain', 'Unknown')]
+                for finding in endpoint[:top_n]]
+        sections.append(('💻 Endpoint Applications', ['Application', 'Type', 'SaaS Domain'],
+                         rows, len(endpoint) - len(rows)))
+
+    extensions = (findings.get('browser_findings') or {}).get('extensions') or []
+    if extensions:
+        riskiest = sorted(extensions, key=lambda ext: RISK_ORDER.get(ext.get('risk_level', 'low'), 3))[:top_n]
+        rows = [[
+            ext.get('browser', 'Unknown'),
+            ext.get('name', 'Unknown'),
+            ext.get('version', 'Unknown'),
+            ext.get('risk_level', 'low'),
+            'All sites' if ext.get('broad_host_access') else ', '.join(ext.get('saas_access', [])) or '-'
+        ] for ext in riskiest]
+        sections.append(('🌐 Browser Extensions', ['Browser', 'Extension', 'Version', 'Risk', 'SaaS Access'],
+                         rows, len(extensions) - len(rows)))
+    return sections
+
+
+def format_plain_sections(sections: List[Section]) -> str:
+    """Render summary sections as aligned plain text"""
+    lines = []
+    for heading, columns, rows, hidden in sections:
+        widths = [max(len(str(cell)) for cell in column) for column in zip(columns, *rows)]
+        lines.append(f"\n{heading}")
+        for row in [columns] + rows:
+            lines.append('  '.join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip())
+        if hidden:
+            lines.append(f"... and {hidden} more")
+    return '\n'.join(lines) + '\n'
+
+
+class AlertLiveView:
+    """Console summary of alerts that stays cheap under bursts
+
+    On a terminal, a rich.live view with counts, the top services and the
+    latest alerts is redrawn at most `max_fps` times a second, however fast
+    alerts arrive. Anywhere else a one-line summary is written at most
+    every `plain_interval` seconds. Full alert detail goes to the log file.
+    """
+
+    def __init__(self, console=None, top_n: int = 10, max_fps: float = 4.0, plain_interval: float = 10.0,
+                 stream: Optional[TextIO] = None, clock: Callable[[], float] = time.monotonic):
+        self.console = console
+        self.top_n = top_n
+        self.max_fps = max(0.1, max_fps)
+        self.plain_interval = plain_interval
+        self.stream = stream
+        self.clock = clock
+        self.total = 0
+        self.by_severity = Counter()
+        self.by_service = Counter()
+        self.recent = deque(maxlen=top_n)
+        self._lock = threading.Lock()
+        self._live = None
+        self._last_plain = clock()
+        self._unwritten = 0
+
+    @property
+    def interactive(self) -> bool:
+        return RICH_AVAILABLE and self.console is not None and self.console.is_terminal
+
+    def add(self, alert):
+        """Count an alert; O(1), rendering happens on the view's own schedule"""
+        with self._lock:
+            self.total += 1
+            self._unwritten += 1
+            self.by_severity[alert.severity] += 1
+            self.by_service[(alert.details or {}).get('saas_domain') or alert.title] += 1
+            self.recent.append(alert)
+            now = self.clock()
+            due = not self.interactive and now - self._last_plain >= self.plain_interval
+            if due:
+                self._last_plain = now
+        if due:
+            self._write_plain()
+
+    def start(self):
+        if self.interactive and self._live is None:
+            self._live = Live(get_renderable=self.render, console=self.console,
+                              refresh_per_second=self.max_fps)
+            self._live.start()
+
+    def stop(self):
+        if self._live is not None:
+            self._live.stop()
+            self._live = None
+        elif self._unwritten:
+            self._write_plain()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def render(self):
+        """Build the live view from the counters"""
+        with self._lock:
+            total = self.total
+            severities = dict(self.by_severity)
+            services = self.by_service.most_common(self.top_n)
+            recent = list(self.recent)
+
+        counts = Text(f"Alerts: {total}  ")
+        for severity in ('high', 'medium', 'low'):
+            counts.append(f"{severity.title()}: {severities.get(severity, 0)}  ",
+                          style=SEVERITY_STYLES[severity])
+
+        top = Table(title=f"Top {self.top_n} services", expand=False)
+        top.add_column("Service", style="cyan")
+        top.add_column("Alerts", style="magenta", justify="right")
+        for service, count in services:
+            top.add_row(service, str(count))
+
+        latest = Table(title="Latest alerts", expand=False)
+        latest.add_column("Time", style="dim")
+        latest.add_column("Severity")
+        latest.add_column("Alert")
+        for alert in reversed(recent):
+            color = SEVERITY_STYLES.get(alert.severity, 'white')
+            latest.add_row(alert.timestamp.strftime('%H:%M:%S'), f"[{color}]{alert.severity.upper()}[/{color}]",
+                           f"{alert.title}: {alert.description}")
+        return Group(counts, top, latest)
+
+    def plain_summary(self) -> str:
+        with self._lock:
+            severities = ', '.join(f"{severity} {self.by_severity.get(severity, 0)}"
+                                   for severity in ('high', 'medium', 'low'))
+            services = ', '.join(f"{service} {count}" for service, count in self.by_service.most_common(self.top_n))
+            total = self.total
+        return f"[{datetime.now().strftime('%H:%M:%S')}] alerts: {total} ({severities}); top: {services or '-'}"
+
+    def _write_plain(self):
+        if self.console is not None and self.console.quiet:
+            return
+        line = self.plain_summary()
+        with self._lock:
+            self._unwritten = 0
+        stream = self.stream or sys.stdout
+        stream.write(line + '\n')
+        stream.flush()
@@ -0,0 +1,75 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+
+class ScanTimeout(BaseException):
+    """Raised inside a scan whose deadline has passed or that was cancelled
+
+    Derives from BaseException so the scanners' broad `except Exception`
+    handlers do not swallow the cancellation.
+    """
+
+
+class Deadline:
+    """Deadline and cancellation flag for one scan run"""
+
+    def __init__(self, timeout: Optional[float], clock: Callable[[], float] = time.monotonic):
+        self.timeout = timeout
+        self.clock = clock
+        self.expires_at = None if timeout is None else clock() + timeout
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def expired(self) -> bool:
+        return self.cancelled or (self.expires_at is not None and self.clock() >= self.expires_at)
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - self.clock())
+
+    def check(self):
+        if self.expired():
+            raise ScanTimeout(f"scan exceeded its {self.timeout}s deadline")
+
+
+_current_deadline = ContextVar('scan_deadline', default=None)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Make `deadline` the current scan deadline for this thread or task"""
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current_deadline.get()
+
+
+def check_deadline():
+    """Cancellation point for scanners; raises ScanTimeout once the current scan is overdue"""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def remaining_time(default: Optional[float] = None) -> Optional[float]:
+    """Seconds left for the current scan, e.g. to bound a blocking call's timeout"""
+    deadline = _current_deadline.get()
+    if deadline is None or deadline.expires_at is None:
+        return default
+    remaining = deadline.remaining()
+    return remaining if default is None else min(default, remaining)
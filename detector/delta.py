@@ -0,0 +1,141 @@
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .exports import iter_finding_records, read_ndjson
+from .state_store import finding_fingerprint
+
+# Record type -> monitor state store source, so report and state fingerprints agree
+STATE_SOURCES = {'network': 'network', 'endpoint': 'endpoint', 'extension': 'browser', 'bookmark': 'bookmarks'}
+
+# Fields whose change makes a finding "changed"; volatile fields (pids, ports, remote
+# addresses and their reverse DNS names, visit times) are left out
+COMPARED_FIELDS = {
+    'network': ('category', 'risk_level'),
+    'endpoint': ('saas_domain', 'endpoint_type', 'category', 'risk_level'),
+    'extension': ('name', 'version', 'permissions', 'host_permissions', 'saas_access',
+                  'broad_host_access', 'sensitive_permissions', 'risk_level'),
+    'bookmark': ('category', 'risk_level'),
+    'history': ('title', 'saas_domain', 'category'),
+    'usage': ('visits', 'active_seconds'),
+}
+
+SQLITE_MAGIC = b'SQLite format 3\x00'
+
+
+def record_fingerprint(record: Dict) -> str:
+    """Stable identity of a typed finding record (see iter_finding_records)"""
+    record_type = record.get('type')
+    if record_type in STATE_SOURCES:
+        return finding_fingerprint(STATE_SOURCES[record_type], record)
+    if record_type == 'history':
+        return f"history|{record.get('browser', '')}|{record.get('url', '')}"
+    if record_type == 'usage':
+        return f"usage|{record.get('saas_domain', '')}"
+    raise ValueError(f"Unknown finding type: {record_type}")
+
+
+def _compared(record: Dict) -> Tuple:
+    return tuple(record.get(name) for name in COMPARED_FIELDS[record['type']])
+
+
+@dataclass
+class FindingDelta:
+    """New, resolved and changed findings between two scans"""
+    new: List[Dict] = field(default_factory=list)
+    resolved: List[Dict] = field(default_factory=list)
+    changed: List[Dict] = field(default_factory=list)
+    unchanged: int = 0
+
+    def counts(self) -> Dict[str, int]:
+        return {'new': len(self.new), 'resolved': len(self.resolved),
+                'changed': len(self.changed), 'unchanged': self.unchanged}
+
+    def to_dict(self, limit: Optional[int] = None) -> Dict:
+        return {
+            'counts': self.counts(),
+            'new': self.new[:limit],
+            'resolved': self.resolved[:limit],
+            'changed': self.changed[:limit]
+        }
+
+
+def diff_findings(current: Iterable[Dict], previous: Iterable[Dict],
+                  types: Optional[Set[str]] = None) -> FindingDelta:
+    """Hash-join two streams of typed records by fingerprint in linear time
+
+    `previous` is read once into a dict keyed by fingerprint; `current` is
+    then streamed against it. Records with the same fingerprint count as one
+    finding (the first is kept). Previous records without content, such as
+    those from a state store, can only be new or resolved, never changed.
+    When `types` is given, only those record types are compared.
+    """
+    baseline: Dict[str, Tuple[Dict, Optional[Tuple]]] = {}
+    for record in previous:
+        if record.get('type') not in COMPARED_FIELDS or (types and record['type'] not in types):
+            continue
+        has_content = not record.pop('fingerprint_only', False)
+        key = record.get('fingerprint') or record_fingerprint(record)
+        if key not in baseline:
+            baseline[key] = (record, _compared(record) if has_content else None)
+
+    delta = FindingDelta()
+    seen = set()
+    for record in current:
+        if record.get('type') not in COMPARED_FIELDS or (types and record['type'] not in types):
+            continue
+        key = record_fingerprint(record)
+        if key in seen:
+            continue
+        seen.add(key)
+        entry = baseline.pop(key, None)
+        if entry is None:
+            delta.new.append({'fingerprint': key, **record})
+            continue
+        _, old_values = entry
+        if old_values is None or old_values == _compared(record):
+            delta.unchanged += 1
+            continue
+        changes = {name: [old, new] for name, old, new in zip(COMPARED_FIELDS[record['type']], old_values,
+                                                                _compared(record)) if old != new}
+        delta.changed.append({'fingerprint': key, **record, 'changes': changes})
+
+    delta.resolved = [{'fingerprint': key, **record} for key, (record, _) in baseline.items()]
+    return delta
+
+
+def _iter_state_records(db_path: str) -> Iterator[Dict]:
+    sources = {source: record_type for record_type, source in STATE_SOURCES.items()}
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        for fingerprint, source, first_seen, last_seen in conn.execute(
+                "SELECT fingerprint, source, first_seen, last_seen FROM findings"):
+            if source in sources:
+                yield {'type': sources[source], 'fingerprint': fingerprint, 'fingerprint_only': True,
+                       'first_seen': first_seen, 'last_seen': last_seen}
+    finally:
+        conn.close()
+
+
+def load_baseline(path: str) -> Tuple[Iterator[Dict], Optional[Set[str]]]:
+    """Previous findings from a JSON or NDJSON report, or a monitor state database
+
+    Returns the records and the record types they can be compared on
+    (None for all); a state database only knows the monitor's sources.
+    """
+    with open(path, 'rb') as f:
+        magic = f.read(len(SQLITE_MAGIC))
+    if magic == SQLITE_MAGIC:
+        return _iter_state_records(path), set(STATE_SOURCES)
+    if '.ndjson' in str(path):
+        return read_ndjson(path), None
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    return iter_finding_records(report.get('findings', report)), None
+
+
+def delta_since(findings: Dict, path: str) -> FindingDelta:
+    """Diff a findings dict against a previous report or state database"""
+    previous, types = load_baseline(path)
+    return diff_findings(iter_finding_records(findings), previous, types)
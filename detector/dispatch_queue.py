@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List
+
+from .alert_aggregator import SEVERITY_RANK
+
+LATENCY_SAMPLES = 1000
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class PriorityDispatcher:
+    """Dispatches alerts from a worker pool, most severe and then oldest first
+
+    Once `shed_depth` alerts are waiting, alerts at or below `shed_severity`
+    are dropped on arrival so the backlog is spent on the ones that matter;
+    once `maxsize` are waiting every new alert is dropped. Queue depth and
+    per-severity dispatch latency are kept for get_stats().
+    """
+
+    def __init__(self, handler: Callable, workers: int = 2, maxsize: int = 10000,
+                 shed_depth: int = 5000, shed_severity: str = 'low',
+                 clock: Callable[[], float] = time.monotonic):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self.shed_depth = shed_depth
+        self.shed_rank = SEVERITY_RANK.get(shed_severity, 0)
+        self.clock = clock
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._running = False
+        self._threads = []
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.stats = {'dispatched': 0, 'shed': 0, 'dropped': 0, 'errors': 0}
+
+    def submit(self, alert) -> bool:
+        """Queue an alert; False if it was shed or dropped"""
+        rank = SEVERITY_RANK.get(alert.severity, 0)
+        with self._cond:
+            depth = len(self._heap)
+            if depth >= self.maxsize:
+                self.stats['dropped'] += 1
+                return False
+            if depth >= self.shed_depth and rank <= self.shed_rank:
+                self.stats['shed'] += 1
+                return False
+            heapq.heappush(self._heap, (-rank, next(self._seq), self.clock(), alert))
+            self._cond.notify()
+        self.start()
+        return True
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [threading.Thread(target=self._run, name=f"alert-dispatch-{i}", daemon=True)
+                             for i in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def drain(self, timeout: float = 10.0) -> bool:
+        """Wait until every queued alert has been dispatched"""
+        end = time.monotonic() + timeout
+        with self._cond:
+            while (self._heap or self._in_flight) and self._running:
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return not self._heap
+
+    def stop(self, timeout: float = 10.0):
+        """Dispatch what is queued, then stop the workers"""
+        self.drain(timeout)
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def get_stats(self) -> Dict:
+        with self._cond:
+            depth = {}
+            for *_, alert in self._heap:
+                depth[alert.severity] = depth.get(alert.severity, 0) + 1
+            latency = {}
+            for severity, samples in self._latencies.items():
+                ordered = sorted(samples)
+                latency[severity] = {
+                    'p50': round(percentile(ordered, 0.50), 4),
+                    'p90': round(percentile(ordered, 0.90), 4),
+                    'p99': round(percentile(ordered, 0.99), 4),
+                    'max': round(ordered[-1], 4)
+                }
+            return {
+                **self.stats,
+                'queue_depth': len(self._heap),
+                'queue_depth_by_severity': depth,
+                'in_flight': self._in_flight,
+                'latency_seconds': latency
+            }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._heap and self._running:
+                    self._cond.wait()
+                if not self._heap:
+                    return
+                _, _, enqueued, alert = heapq.heappop(self._heap)
+                self._in_flight += 1
+
+            try:
+                self.handler(alert)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"Error dispatching alert: {e}")
+
+            with self._cond:
+                self._in_flight -= 1
+                self.stats['dispatched'] += 1
+                samples = self._latencies.setdefault(alert.severity, deque(maxlen=LATENCY_SAMPLES))
+                samples.append(self.clock() - enqueued)
+                self._cond.notify_all()
@@ -7,6 +7,9 @@ except ImportError:
     winreg = None
 import socket
 
+# Directories holding .desktop entries for installed applications on Linux
+LINUX_APPLICATION_DIRS = ['/usr/share/applications', '~/.local/share/applications']
+
 def get_running_processes():
     processes = []
     for proc in psutil.process_iter(['pid', 'name', 'exe', 'cmdline']):
@@ -45,10 +48,16 @@ def get_installed_apps():
         # macOS: list /Applications
         apps = [f for f in os.listdir('/Applications') if f.endswith('.app')]
     elif system == 'Linux':
-        # Linux: list from /usr/share/applications
-        desktop_files = '/usr/share/applications'
-        if os.path.isdir(desktop_files):
-            for f in os.listdir(desktop_files):
-                if f.endswith('.desktop'):
+        # Linux: list .desktop entries from system and user application directories
+        for directory in LINUX_APPLICATION_DIRS:
+            for f in list_desktop_entries(directory):
+                if f not in apps:
                     apps.append(f)
-    return apps 
\ No newline at end of file
+    return apps
+
+def list_desktop_entries(directory):
+    """List .desktop entries in a Linux application directory"""
+    directory = os.path.expanduser(directory)
+    if not os.path.isdir(directory):
+        return []
+    return [f for f in os.listdir(directory) if f.endswith('.desktop')] 
\ No newline at end of file
@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Optional, Tuple, Type
+
+OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest', 'block')
+
+
+@dataclass(frozen=True)
+class FindingEvent:
+    """A finding the monitor has not seen before"""
+    source: str  # network, endpoint, browser, bookmarks, apps
+    fingerprint: str
+    finding: Dict
+    timestamp: datetime = field(default_factory=datetime.now)
+
+
+@dataclass(frozen=True)
+class AlertEvent:
+    """An alert ready for delivery to the sinks"""
+    alert: Any
+
+
+class Subscription:
+    """A subscriber's bounded queue and the worker thread that drains it"""
+
+    def __init__(self, name: str, handler: Callable, event_types: Optional[Tuple[Type, ...]],
+                 maxsize: int, policy: str, block_timeout: float):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.name = name
+        self.handler = handler
+        self.event_types = event_types
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._queue: Deque = deque()
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+    def accepts(self, event) -> bool:
+        return self.event_types is None or isinstance(event, self.event_types)
+
+    def offer(self, event) -> bool:
+        """Queue an event, applying the overflow policy; False if it was dropped"""
+        with self._cond:
+            if len(self._queue) >= self.maxsize:
+                if self.policy == 'drop_oldest':
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif self.policy == 'drop_newest':
+                    self.dropped += 1
+                    return False
+                else:
+                    # Backpressure, bounded so a stuck subscriber cannot stall the publisher
+                    end = time.monotonic() + self.block_timeout
+                    while len(self._queue) >= self.maxsize and self._running:
+                        remaining = end - time.monotonic()
+                        if remaining <= 0:
+                            break
+                        self._cond.wait(remaining)
+                    if len(self._queue) >= self.maxsize:
+                        self.dropped += 1
+                        return False
+            self._queue.append(event)
+            self._cond.notify_all()
+            return True
+
+    def deliver(self, event):
+        try:
+            self.handler(event)
+            self.delivered += 1
+        except Exception as e:
+            self.errors += 1
+            print(f"Error in {self.name} subscriber: {e}")
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"events-{self.name}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop after draining what is already queued, waiting at most `timeout` seconds"""
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+
+    def get_status(self) -> Dict:
+        with self._cond:
+            depth = len(self._queue)
+        return {
+            'queue_depth': depth,
+            'maxsize': self.maxsize,
+            'policy': self.policy,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and self._running:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._cond.notify_all()
+            self.deliver(event)
+
+
+class EventBus:
+    """In-process publish/subscribe for findings and alerts
+
+    Every subscriber has its own bounded queue and worker thread, so a slow
+    SMTP server or HTTP endpoint only ever delays its own subscriber. Until
+    the bus is started, events are delivered inline on the publishing thread.
+    """
+
+    def __init__(self, maxsize: int = 1000, policy: str = 'drop_oldest', block_timeout: float = 1.0):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self._subscriptions: Dict[str, Subscription] = {}
+        self._lock = threading.Lock()
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def subscribe(self, name: str, handler: Callable, event_types=None, maxsize: Optional[int] = None,
+                  policy: Optional[str] = None) -> Subscription:
+        """Subscribe `handler` to events of the given type(s), or to every event"""
+        if event_types is not None and not isinstance(event_types, tuple):
+            event_types = (event_types,)
+        subscription = Subscription(name, handler, event_types,
+                                    maxsize or self.maxsize, policy or self.policy, self.block_timeout)
+        with self._lock:
+            previous = self._subscriptions.get(name)
+            self._subscriptions[name] = subscription
+            running = self._running
+        if previous:
+            previous.stop()
+        if running:
+            subscription.start()
+        return subscription
+
+    def unsubscribe(self, name: str):
+        with self._lock:
+            subscription = self._subscriptions.pop(name, None)
+        if subscription:
+            subscription.stop()
+
+    def publish(self, event) -> int:
+        """Fan an event out to matching subscribers; returns how many queued it"""
+        with self._lock:
+            subscriptions = [s for s in self._subscriptions.values() if s.accepts(event)]
+            running = self._running
+
+        if not running:
+            for subscription in subscriptions:
+                subscription.deliver(event)
+            return len(subscriptions)
+        return sum(1 for subscription in subscriptions if subscription.offer(event))
+
+    def start(self):
+        """Start a worker for every subscriber"""
+        with self._lock:
+            self._running = True
+            subscriptions = list(self._subscriptions.values())
+        for subscription in subscriptions:
+            subscription.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Drain and stop every subscriber"""
+        with self._lock:
+            self._running = False
+            subscriptions = list(self._subscriptions.values())
+        for subscription in subscriptions:
+            subscription.stop(timeout)
+
+    def get_status(self) -> Dict[str, Dict]:
+        with self._lock:
+            subscriptions = list(self._subscriptions.values())
+        return {subscription.name: subscription.get_status() for subscription in subscriptions}
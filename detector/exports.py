@@ -0,0 +1,166 @@
+import csv
+import gzip
+import json
+from typing import Dict, Iterator, List, Optional, TextIO
+
+# Optional zstandard import for .zst exports
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+COMPRESSIONS = ('gzip', 'zstd')
+COMPRESSED_SUFFIXES = {'gzip': '.gz', 'zstd': '.zst'}
+CSV_HEADER = ['Type', 'Service/Application', 'Risk Level', 'Category', 'Details', 'Source']
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def iter_finding_records(findings: Dict) -> Iterator[Dict]:
+    """One flat record per finding of every type, for NDJSON exports"""
+    for finding in findings.get('network_findings', []):
+        yield {'type': 'network', **finding}
+    for finding in findings.get('endpoint_findings', []):
+        # Endpoint findings carry their own 'type' (process/application); keep it apart
+        record = {**finding, 'type': 'endpoint'}
+        record['endpoint_type'] = finding.get('type')
+        yield record
+    browser_findings = findings.get('browser_findings') or {}
+    for ext in browser_findings.get('extensions', []):
+        yield {'type': 'extension', **ext}
+    for bookmark in browser_findings.get('bookmarks', []):
+        yield {'type': 'bookmark', **bookmark}
+    for entry in browser_findings.get('history', []):
+        yield {'type': 'history', **entry}
+    for service, trend in (findings.get('usage_trends') or {}).items():
+        yield {'type': 'usage', 'saas_domain': service, **trend}
+
+
+def iter_csv_rows(findings: Dict) -> Iterator[List]:
+    """CSV report rows for every finding type"""
+    for finding in findings.get('network_findings', []):
+        yield [
+            'Network Connection',
+            finding.get('saas_domain', 'Unknown'),
+            finding.get('risk_level', 'low'),
+            finding.get('category', 'Unknown'),
+            f"Remote: {finding.get('raddr', 'Unknown')}",
+            'Network Scanner'
+        ]
+
+    for finding in findings.get('endpoint_findings', []):
+        yield [
+            'Application',
+            finding.get('name', 'Unknown'),
+            finding.get('risk_level', 'low'),
+            finding.get('category', 'Unknown'),
+            f"PID: {finding.get('pid', 'Unknown')}",
+            'Endpoint Scanner'
+        ]
+
+    browser_findings = findings.get('browser_findings') or {}
+    for ext in browser_findings.get('extensions', []):
+        yield [
+            'Browser Extension',
+            ext.get('name', 'Unknown'),
+            ext.get('risk_level', 'low'),
+            'Browser',
+            f"Browser: {ext.get('browser', 'Unknown')}; SaaS access: {', '.join(ext.get('saas_access', [])) or 'None'}",
+            'Browser Scanner'
+        ]
+
+    for bookmark in browser_findings.get('bookmarks', []):
+        yield [
+            'Bookmark',
+            bookmark.get('saas_domain', 'Unknown'),
+            bookmark.get('risk_level', 'low'),
+            bookmark.get('category', 'Unknown'),
+            f"Browser: {bookmark.get('browser', 'Unknown')}; URL: {bookmark.get('url', '')}",
+            'Browser Scanner'
+        ]
+
+    for entry in browser_findings.get('history', []):
+        yield [
+            'History Entry',
+            entry.get('title') or entry.get('url', ''),
+            entry.get('risk_level', 'low'),
+            'Browser',
+            f"Browser: {entry.get('browser', 'Unknown')}; URL: {entry.get('url', '')}; Visits: {entry.get('visit_count', 0)}",
+            'Browser Scanner'
+        ]
+
+    for service, trend in (findings.get('usage_trends') or {}).items():
+        yield [
+            'SaaS Usage',
+            service,
+            '',
+            'Usage',
+            f"Visits: {trend.get('visits', 0)}; Active hours: {trend.get('active_seconds', 0) / 3600:.1f}",
+            'Usage Analytics'
+        ]
+
+
+def compression_for(path: str, compression: Optional[str] = None) -> Optional[str]:
+    """The requested compression, or the one implied by the file suffix"""
+    if compression:
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        return compression
+    for name, suffix in COMPRESSED_SUFFIXES.items():
+        if str(path).endswith(suffix):
+            return name
+    return None
+
+
+def open_export(path: str, compression: Optional[str] = None, newline: Optional[str] = None) -> TextIO:
+    """Open a text stream that compresses on the fly"""
+    compression = compression_for(path, compression)
+    if compression == 'gzip':
+        # Level 6 is several times faster than the default 9 for a little more size
+        return gzip.open(path, 'wt', compresslevel=6, encoding='utf-8', newline=newline)
+    if compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression needs the zstandard package (pip install shadowit-detector[zstd])")
+        return zstandard.open(path, 'wt', encoding='utf-8', newline=newline)
+    return open(path, 'w', encoding='utf-8', newline=newline, buffering=WRITE_BUFFER_SIZE)
+
+
+def write_ndjson(records: Iterator[Dict], path: str, compression: Optional[str] = None) -> int:
+    """Write one JSON object per line; returns the number of records"""
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str).encode
+    count = 0
+    with open_export(path, compression) as f:
+        for record in records:
+            f.write(encode(record))
+            f.write('\n')
+            count += 1
+    return count
+
+
+def read_ndjson(path: str) -> Iterator[Dict]:
+    """Stream records back from an NDJSON export, compressed or not"""
+    compression = compression_for(path)
+    if compression == 'gzip':
+        f = gzip.open(path, 'rt', encoding='utf-8')
+    elif compression == 'zstd':
+        if not ZSTD_AVAILABLE:
+            raise ValueError("zstd compression needs the zstandard package (pip install shadowit-detector[zstd])")
+        f = zstandard.open(path, 'rt', encoding='utf-8')
+    else:
+        f = open(path, 'r', encoding='utf-8')
+    with f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_csv(header: List[str], rows: Iterator[List], path: str, compression: Optional[str] = None) -> int:
+    """Write CSV rows as they are produced; returns the number of rows"""
+    count = 0
+    with open_export(path, compression, newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
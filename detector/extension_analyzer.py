@@ -0,0 +1,195 @@
+import re
+from typing import Dict, List, Optional, Iterable, NamedTuple
+
+# Match patterns that grant access to every site
+BROAD_HOST_PATTERNS = {'<all_urls>', '*://*/*', 'http://*/*', 'https://*/*'}
+
+# API permissions that let an extension read or redirect user data
+SENSITIVE_PERMISSIONS = {
+    'cookies', 'history', 'tabs', 'webRequest', 'webRequestBlocking',
+    'declarativeNetRequest', 'clipboardRead', 'nativeMessaging', 'debugger',
+    'proxy', 'downloads', 'management', 'identity', 'privacy', 'scripting'
+}
+
+RISK_RANK = {'low': 1, 'medium': 2, 'high': 3}
+RISK_NAMES = {rank: name for name, rank in RISK_RANK.items()}
+
+_MATCH_PATTERN = re.compile(r'^(\*|https?|wss?|ftp|file|urn)://([^/]*)(/.*)?$')
+
+
+class CompiledPermissions(NamedTuple):
+    """Host match patterns bucketed by how they are matched"""
+    broad: List[str]
+    wildcard_hosts: List[str]
+    exact_hosts: List[str]
+    api_permissions: List[str]
+
+
+class _TrieNode:
+    __slots__ = ('children', 'domain')
+
+    def __init__(self):
+        self.children = {}
+        self.domain = None
+
+
+def _split_host(host: str) -> List[str]:
+    """Return the labels of a host in reverse order (TLD first)"""
+    host = host.split(':')[0].strip('.').lower()
+    return list(reversed(host.split('.'))) if host else []
+
+
+def compile_permissions(permissions: Iterable[str]) -> CompiledPermissions:
+    """Bucket manifest permissions into broad, wildcard, exact and API entries"""
+    compiled = CompiledPermissions([], [], [], [])
+
+    for permission in permissions:
+        if not isinstance(permission, str):
+            continue
+
+        if permission in BROAD_HOST_PATTERNS:
+            compiled.broad.append(permission)
+            continue
+
+        match = _MATCH_PATTERN.match(permission)
+        if not match:
+            compiled.api_permissions.append(permission)
+            continue
+
+        scheme, host = match.group(1), match.group(2)
+        if scheme == 'file' or not host:
+            continue
+        if host == '*':
+            compiled.broad.append(permission)
+        elif host.startswith('*.'):
+            # A wildcard over a bare TLD (e.g. *.com) is effectively broad
+            if len(_split_host(host[2:])) <= 1:
+                compiled.broad.append(permission)
+            else:
+                compiled.wildcard_hosts.append(host[2:])
+        else:
+            compiled.exact_hosts.append(host)
+
+    return compiled
+
+
+class SaaSCatalogIndex:
+    """Host-suffix trie over the SaaS catalog domains"""
+
+    def __init__(self, catalog: Dict[str, Dict]):
+        self.catalog = catalog
+        self._root = _TrieNode()
+
+        for domain in catalog:
+            labels = _split_host(domain)
+            if not labels:
+                continue
+            node = self._root
+            for label in labels:
+                node = node.children.setdefault(label, _TrieNode())
+            node.domain = domain
+
+    def match_host(self, host: str) -> Optional[str]:
+        """Return the catalog domain that owns a host (longest suffix match)"""
+        node = self._root
+        matched = None
+        for label in _split_host(host):
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.domain:
+                matched = node.domain
+        return matched
+
+    def domains_under(self, host: str) -> List[str]:
+        """Return catalog domains covered by a `*.host` wildcard"""
+        domains = []
+        owner = self.match_host(host)
+        if owner:
+            domains.append(owner)
+
+        node = self._root
+        for label in _split_host(host):
+            node = node.children.get(label)
+            if node is None:
+                return domains
+
+        stack = list(node.children.values())
+        while stack:
+            child = stack.pop()
+            if child.domain and child.domain != owner:
+                domains.append(child.domain)
+            stack.extend(child.children.values())
+
+        return domains
+
+
+class ExtensionPermissionAnalyzer:
+    """Scores browser extensions by the SaaS services their host permissions can read"""
+
+    def __init__(self, catalog: Dict[str, Dict]):
+        self.catalog = catalog
+        self.index = SaaSCatalogIndex(catalog)
+        # Fleets share a small set of patterns, so resolve each host only once
+        self._wildcard_cache = {}
+        self._exact_cache = {}
+
+    def _services_for_wildcard(self, host: str) -> List[str]:
+        services = self._wildcard_cache.get(host)
+        if services is None:
+            services = self.index.domains_under(host)
+            self._wildcard_cache[host] = services
+        return services
+
+    def _service_for_exact(self, host: str) -> Optional[str]:
+        if host not in self._exact_cache:
+            self._exact_cache[host] = self.index.match_host(host)
+        return self._exact_cache[host]
+
+    def analyze(self, extension: Dict) -> Dict:
+        """Analyze an extension's permissions against the SaaS catalog"""
+        compiled = compile_permissions(
+            list(extension.get('permissions') or []) +
+            list(extension.get('host_permissions') or [])
+        )
+
+        services = set()
+        for host in compiled.wildcard_hosts:
+            services.update(self._services_for_wildcard(host))
+        for host in compiled.exact_hosts:
+            service = self._service_for_exact(host)
+            if service:
+                services.add(service)
+
+        broad_host_access = bool(compiled.broad)
+        sensitive = sorted(p for p in compiled.api_permissions if p in SENSITIVE_PERMISSIONS)
+
+        return {
+            'saas_access': sorted(services),
+            'broad_host_access': broad_host_access,
+            'sensitive_permissions': sensitive,
+            'risk_level': self._risk_level(services, broad_host_access, sensitive)
+        }
+
+    def _risk_level(self, services, broad_host_access: bool, sensitive: List[str]) -> str:
+        """Derive a risk level from host reach and sensitive API permissions"""
+        if broad_host_access:
+            return 'high'
+
+        rank = RISK_RANK['low']
+        for service in services:
+            service_risk = self.catalog.get(service, {}).get('risk_level', 'medium')
+            rank = max(rank, RISK_RANK.get(service_risk, RISK_RANK['medium']))
+
+        if sensitive:
+            rank = max(rank, RISK_RANK['medium'])
+            if services:
+                rank = RISK_RANK['high']
+
+        return RISK_NAMES[rank]
+
+    def annotate(self, extensions: List[Dict]) -> List[Dict]:
+        """Add permission analysis fields to each extension in place"""
+        for extension in extensions:
+            extension.update(self.analyze(extension))
+        return extensions
@@ -0,0 +1,216 @@
+import os
+import time
+import struct
+import select
+import platform
+import threading
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+# inotify is only available on Linux; everything else uses the polling backend
+try:
+    import ctypes
+    import ctypes.util
+    _libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+    INOTIFY_AVAILABLE = platform.system() == 'Linux' and hasattr(_libc, 'inotify_init1')
+except (ImportError, OSError, AttributeError):
+    _libc = None
+    INOTIFY_AVAILABLE = False
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Minimal ctypes binding to the Linux inotify API"""
+
+    def __init__(self):
+        self.fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+
+    def add_watch(self, path: str) -> int:
+        wd = _libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed for {path}')
+        return wd
+
+    def read_events(self, timeout: float) -> List[Tuple[int, int, str]]:
+        """Return (wd, mask, name) tuples, waiting at most `timeout` seconds"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            events.append((wd, mask, name))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Watches files and directories and reports debounced changes per target key"""
+
+    def __init__(self, callback: Callable[[Hashable], None], debounce: float = 2.0,
+                 poll_interval: float = 5.0, use_inotify: Optional[bool] = None):
+        self.callback = callback
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = INOTIFY_AVAILABLE if use_inotify is None else use_inotify and INOTIFY_AVAILABLE
+        # directory -> list of (file name or None for the whole directory, key)
+        self._targets: Dict[str, List[Tuple[Optional[str], Hashable]]] = {}
+        self._snapshots: Dict[str, Tuple] = {}
+        self._pending: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+        self._inotify = None
+        self._watch_dirs: Dict[int, str] = {}
+        self._last_poll = 0.0
+        self._thread = None
+        self._running = False
+
+    @property
+    def backend(self) -> str:
+        return 'inotify' if self.use_inotify else 'polling'
+
+    def watch(self, path: str, key: Hashable):
+        """Watch a directory, or a single file via its parent directory"""
+        if os.path.isdir(path):
+            directory, name = path, None
+        else:
+            directory, name = os.path.dirname(path), os.path.basename(path)
+        if not os.path.isdir(directory):
+            return
+
+        with self._lock:
+            self._targets.setdefault(directory, []).append((name, key))
+            self._snapshots[path] = self._snapshot(path)
+            if self._inotify is not None and directory not in self._watch_dirs.values():
+                self._add_inotify_watch(directory)
+
+    def start(self):
+        """Start the watcher thread"""
+        if self._running:
+            return
+        self._running = True
+        if self.use_inotify:
+            try:
+                self._inotify = _Inotify()
+                for directory in list(self._targets):
+                    self._add_inotify_watch(directory)
+            except OSError as e:
+                print(f"inotify unavailable, falling back to polling: {e}")
+                self._inotify = None
+                self.use_inotify = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the watcher thread"""
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=5)
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._watch_dirs.clear()
+
+    def _add_inotify_watch(self, directory: str):
+        try:
+            self._watch_dirs[self._inotify.add_watch(directory)] = directory
+        except OSError as e:
+            print(f"Could not watch {directory}: {e}")
+
+    def _run(self):
+        while self._running:
+            if self._inotify is not None:
+                self._read_inotify(min(self.debounce, 1.0))
+            else:
+                self._poll()
+                time.sleep(min(self.poll_interval, self.debounce, 1.0))
+            self._fire_settled()
+
+    def _read_inotify(self, timeout: float):
+        for wd, mask, name in self._inotify.read_events(timeout):
+            if mask & IN_IGNORED:
+                self._watch_dirs.pop(wd, None)
+                continue
+            directory = self._watch_dirs.get(wd)
+            if directory is not None:
+                self._mark_changed(directory, name)
+
+    def _poll(self):
+        now = time.monotonic()
+        if now - self._last_poll < self.poll_interval:
+            return
+        self._last_poll = now
+
+        with self._lock:
+            paths = list(self._snapshots)
+        for path in paths:
+            snapshot = self._snapshot(path)
+            if snapshot != self._snapshots.get(path):
+                self._snapshots[path] = snapshot
+                if os.path.isdir(path):
+                    self._mark_changed(path, None)
+                else:
+                    self._mark_changed(os.path.dirname(path), os.path.basename(path))
+
+    @staticmethod
+    def _snapshot(path: str) -> Tuple:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return ()
+        if os.path.isdir(path):
+            try:
+                return (stat.st_mtime_ns, tuple(sorted(os.listdir(path))))
+            except OSError:
+                return (stat.st_mtime_ns,)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _mark_changed(self, directory: str, name: Optional[str]):
+        """Record a change for every target that covers the changed path"""
+        now = time.monotonic()
+        with self._lock:
+            for target_name, key in self._targets.get(directory, []):
+                if target_name is None or target_name == name:
+                    self._pending[key] = now
+
+    def _fire_settled(self):
+        """Invoke the callback for targets that have been quiet for the debounce period"""
+        now = time.monotonic()
+        with self._lock:
+            settled = [key for key, last in self._pending.items() if now - last >= self.debounce]
+            for key in settled:
+                del self._pending[key]
+
+        for key in settled:
+            try:
+                self.callback(key)
+            except Exception as e:
+                print(f"Error handling change for {key}: {e}")
@@ -0,0 +1,101 @@
+import html
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Sequence
+
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def escape(value) -> str:
+    return html.escape(str(value), quote=True)
+
+
+def badge(level) -> str:
+    """Risk badge markup; the level is escaped"""
+    level = escape(level or 'low')
+    return f'<span class="badge badge-{level}">{level.upper()}</span>'
+
+
+class HtmlReportWriter:
+    """Streams an HTML report to disk through a buffered file
+
+    Sections are written as they are produced, so memory stays flat however
+    many rows a report has. Each table keeps its first `page_rows` rows
+    inline; the rest go to numbered page files next to the report
+    (report_<section>_2.html, ...), linked from the table and from each
+    other.
+    """
+
+    def __init__(self, path, page_rows: int = 1000, head: Callable[[str], str] = None,
+                 foot: Callable[[], str] = None):
+        self.path = Path(path)
+        self.page_rows = max(1, page_rows)
+        self.head = head or (lambda title: f"<!DOCTYPE html>\n<html><head><meta charset=\"UTF-8\"><title>{escape(title)}</title></head><body>\n")
+        self.foot = foot or (lambda: "</body></html>\n")
+        self.pages: List[str] = [str(self.path)]
+        self._file = open(self.path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+
+    def write(self, markup: str):
+        """Write trusted markup as-is"""
+        self._file.write(markup)
+
+    def table(self, section: str, columns: Sequence[str], rows: Iterable[Sequence],
+              raw_columns: Sequence[int] = ()) -> int:
+        """Stream a table and return its row count
+
+        Cells are escaped, except those in `raw_columns`, which must already
+        be markup (e.g. from badge()).
+        """
+        header = "<table>\n<thead><tr>" + ''.join(f"<th>{escape(c)}</th>" for c in columns) + "</tr></thead>\n<tbody>\n"
+        footer = "</tbody>\n</table>\n"
+        raw = set(raw_columns)
+
+        self._file.write(header)
+        target = self._file
+        count = 0
+        number = 1
+        page_links = []
+        for row in rows:
+            if count and count % self.page_rows == 0:
+                # Current page is full; continue the table on a new page
+                number += 1
+                path = self.path.with_name(f"{self.path.stem}_{section}_{number}{self.path.suffix}")
+                if target is self._file:
+                    target.write(footer)
+                else:
+                    target.write(footer + self._page_nav(section, number - 1, next_page=path.name) + self.foot())
+                    target.close()
+                target = open(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE)
+                target.write(self.head(f"{section} rows {count + 1}+") + header)
+                self.pages.append(str(path))
+                page_links.append((path.name, count + 1))
+            target.write("<tr>" + ''.join(
+                f"<td>{cell if i in raw else escape(cell)}</td>" for i, cell in enumerate(row)) + "</tr>\n")
+            count += 1
+
+        if target is self._file:
+            target.write(footer)
+        else:
+            target.write(footer + self._page_nav(section, number) + self.foot())
+            target.close()
+            links = ' '.join(
+                f'<a href="{escape(name)}">rows {start}&ndash;{min(start + self.page_rows - 1, count)}</a>'
+                for name, start in page_links)
+            self._file.write(f'<p class="pages">Showing {self.page_rows} of {count} rows. More: {links}</p>\n')
+        return count
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _page_nav(self, section: str, number: int, next_page: Optional[str] = None) -> str:
+        previous = (self.path.name if number == 2
+                    else f"{self.path.stem}_{section}_{number - 1}{self.path.suffix}")
+        nav = f'<p class="pages"><a href="{escape(previous)}">&larr; previous</a>'
+        if next_page:
+            nav += f' <a href="{escape(next_page)}">next &rarr;</a>'
+        return nav + f' <a href="{escape(self.path.name)}">report</a></p>\n'
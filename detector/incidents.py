@@ -0,0 +1,163 @@
+import getpass
+import itertools
+import socket
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from .alert_aggregator import SEVERITY_RANK
+
+SEVERITY_NAMES = {rank: name for name, rank in SEVERITY_RANK.items()}
+MAX_EVIDENCE = 20
+
+
+@dataclass
+class Incident:
+    """Alerts about one service for one user on one host, merged across sources"""
+    id: int
+    host: str
+    user: str
+    service: str
+    first_seen: datetime
+    last_seen: datetime
+    base_severity: str
+    sources: Set[str] = field(default_factory=set)
+    alert_count: int = 0
+    evidence: Deque[Dict] = field(default_factory=lambda: deque(maxlen=MAX_EVIDENCE))
+
+    @property
+    def severity(self) -> str:
+        """Highest alert severity, raised one level for each extra source that agrees"""
+        rank = SEVERITY_RANK.get(self.base_severity, 1) + max(0, len(self.sources) - 1)
+        return SEVERITY_NAMES[min(rank, max(SEVERITY_RANK.values()))]
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'host': self.host,
+            'user': self.user,
+            'service': self.service,
+            'severity': self.severity,
+            'sources': sorted(self.sources),
+            'alert_count': self.alert_count,
+            'first_seen': self.first_seen.isoformat(),
+            'last_seen': self.last_seen.isoformat(),
+            'evidence': list(self.evidence)
+        }
+
+
+class IncidentCorrelator:
+    """Correlates alerts from every scanner into incidents
+
+    Incidents are indexed by (host, user, service). An alert joins the open
+    incident for its key, or opens a new one; an incident closes once no
+    alert has joined it for `ttl` seconds. At most `max_incidents` are kept,
+    least recently active first out.
+    """
+
+    def __init__(self, ttl: float = 3600.0, max_incidents: int = 5000,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_incidents = max_incidents
+        self.clock = clock
+        self.hostname = socket.gethostname()
+        try:
+            self.username = getpass.getuser()
+        except Exception:
+            self.username = 'unknown'
+        self._incidents: 'OrderedDict[Tuple[str, str, str], Tuple[float, Incident]]' = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.stats = {'opened': 0, 'expired': 0, 'evicted': 0, 'correlated': 0}
+
+    def add_alert(self, alert) -> List[Incident]:
+        """Fold an alert into its incidents; alerts not about a service are ignored"""
+        details = alert.details or {}
+        host = details.get('host') or self.hostname
+        user = details.get('user') or self.username
+        evidence = {
+            'source': alert.source,
+            'severity': alert.severity,
+            'title': alert.title,
+            'description': alert.description,
+            'timestamp': alert.timestamp.isoformat(),
+            'details': details
+        }
+
+        touched = []
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            for service in self._services(details):
+                key = (host, user, service)
+                entry = self._incidents.pop(key, None)
+                if entry is None:
+                    incident = Incident(id=next(self._ids), host=host, user=user, service=service,
+                                        first_seen=alert.timestamp, last_seen=alert.timestamp,
+                                        base_severity=alert.severity)
+                    self.stats['opened'] += 1
+                else:
+                    incident = entry[1]
+                    if alert.source not in incident.sources:
+                        self.stats['correlated'] += 1
+                incident.sources.add(alert.source)
+                incident.alert_count += 1
+                incident.last_seen = max(incident.last_seen, alert.timestamp)
+                if SEVERITY_RANK.get(alert.severity, 0) > SEVERITY_RANK.get(incident.base_severity, 0):
+                    incident.base_severity = alert.severity
+                incident.evidence.append(evidence)
+                self._incidents[key] = (now, incident)
+                touched.append(incident)
+
+            while len(self._incidents) > self.max_incidents:
+                self._incidents.popitem(last=False)
+                self.stats['evicted'] += 1
+        return touched
+
+    def get(self, incident_id: int) -> Optional[Incident]:
+        with self._lock:
+            self._expire(self.clock())
+            for _, incident in self._incidents.values():
+                if incident.id == incident_id:
+                    return incident
+        return None
+
+    def query(self, service: Optional[str] = None, host: Optional[str] = None,
+              min_severity: Optional[str] = None, limit: int = 50, offset: int = 0) -> List[Incident]:
+        """Open incidents, most recently active first"""
+        floor = SEVERITY_RANK.get(min_severity, 0)
+        with self._lock:
+            self._expire(self.clock())
+            matches = (incident for _, incident in reversed(self._incidents.values())
+                       if (not service or incident.service == service)
+                       and (not host or incident.host == host)
+                       and SEVERITY_RANK.get(incident.severity, 0) >= floor)
+            return list(itertools.islice(matches, offset, offset + limit))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(self.clock())
+            return len(self._incidents)
+
+    def get_status(self) -> Dict:
+        return {**self.stats, 'open': len(self)}
+
+    def _expire(self, now: float):
+        # Entries are kept in order of last activity, so expired ones are at the front
+        while self._incidents:
+            updated, _ = next(iter(self._incidents.values()))
+            if now - updated < self.ttl:
+                break
+            self._incidents.popitem(last=False)
+            self.stats['expired'] += 1
+
+    @staticmethod
+    def _services(details: Dict) -> List[str]:
+        service = details.get('saas_domain')
+        if service and service != 'Unknown':
+            return [service]
+        # Browser extensions name every service they can reach
+        return list(dict.fromkeys(details.get('saas_access') or []))
@@ -0,0 +1,190 @@
+import atexit
+import glob
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+LOGGER_NAME = 'shadowit_detector'
+LOG_QUEUE_SIZE = 10000
+
+# Attributes every LogRecord has; anything else came in through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats records as one JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created).astimezone().isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class CompressingRotatingFileHandler(logging.handlers.BaseRotatingHandler):
+    """Rotates on size or age, whichever comes first, and gzips rotated segments"""
+
+    def __init__(self, filename: str, max_bytes: int = 10 * 1024 * 1024, interval: float = 86400,
+                 backup_count: int = 14, compress: bool = True):
+        super().__init__(filename, 'a', encoding='utf-8', delay=True)
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compress = compress
+        try:
+            started = os.stat(self.baseFilename).st_mtime
+        except OSError:
+            started = time.time()
+        self.rollover_at = started + interval if interval > 0 else None
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return os.path.exists(self.baseFilename)
+        return False
+
+    def emit(self, record: logging.LogRecord):
+        # Check the size after writing, so each record is formatted only once
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            logging.FileHandler.emit(self, record)
+            if self.max_bytes > 0 and self.stream is not None and self.stream.tell() >= self.max_bytes:
+                self.doRollover()
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename):
+            stamp = time.strftime('%Y%m%d-%H%M%S')
+            destination = f"{self.baseFilename}.{stamp}"
+            suffix = 1
+            while os.path.exists(destination) or os.path.exists(destination + '.gz'):
+                destination = f"{self.baseFilename}.{stamp}-{suffix}"
+                suffix += 1
+            os.rename(self.baseFilename, destination)
+            if self.compress:
+                with open(destination, 'rb') as source, gzip.open(destination + '.gz', 'wb') as target:
+                    shutil.copyfileobj(source, target)
+                os.remove(destination)
+            self._delete_old_segments()
+
+        if self.interval > 0:
+            self.rollover_at = time.time() + self.interval
+
+    def rotated_segments(self):
+        """Rotated files, oldest first"""
+        return sorted(glob.glob(glob.escape(self.baseFilename) + '.*'), key=os.path.getmtime)
+
+    def _delete_old_segments(self):
+        if self.backup_count <= 0:
+            return
+        segments = self.rotated_segments()
+        for path in segments[:-self.backup_count]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking or raising when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_pipeline = {'key': None, 'handler': None, 'listener': None}
+
+
+def setup_logging(alert_config) -> logging.Logger:
+    """Attach the JSON Lines pipeline to the shared logger
+
+    Safe to call any number of times: the logger only ever has one queue
+    handler, and it is rebuilt only when the log settings change.
+    """
+    logger = logging.getLogger(LOGGER_NAME)
+    logger.setLevel(logging.INFO)
+
+    if not alert_config.enable_log_file:
+        shutdown_logging()
+        return logger
+
+    key = (os.path.abspath(alert_config.log_directory), alert_config.log_max_bytes,
+           alert_config.log_rotation_hours, alert_config.log_backup_count, alert_config.log_compress)
+    # Check and rebuild under one lock so concurrent callers never attach two handlers
+    with _lock:
+        if _pipeline['key'] == key and _pipeline['handler'] in logger.handlers:
+            return logger
+        _shutdown()
+
+        os.makedirs(alert_config.log_directory, exist_ok=True)
+        file_handler = CompressingRotatingFileHandler(
+            os.path.join(alert_config.log_directory, 'shadowit_alerts.jsonl'),
+            max_bytes=alert_config.log_max_bytes,
+            interval=alert_config.log_rotation_hours * 3600,
+            backup_count=alert_config.log_backup_count,
+            compress=alert_config.log_compress
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+
+        queue_handler = DroppingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, respect_handler_level=True)
+        listener.start()
+
+        _pipeline.update(key=key, handler=queue_handler, listener=listener)
+        logger.addHandler(queue_handler)
+    return logger
+
+
+def shutdown_logging():
+    """Detach the queue handler and write out everything still queued"""
+    with _lock:
+        _shutdown()
+
+
+def _shutdown():
+    """shutdown_logging without taking the lock; the caller holds it"""
+    handler, listener = _pipeline['handler'], _pipeline['listener']
+    _pipeline.update(key=None, handler=None, listener=None)
+    if handler is not None:
+        logging.getLogger(LOGGER_NAME).removeHandler(handler)
+    if listener is not None:
+        listener.stop()
+        for target in listener.handlers:
+            target.close()
+
+
+def dropped_log_records() -> Optional[int]:
+    handler = _pipeline['handler']
+    return handler.dropped if handler is not None else None
+
+
+atexit.register(shutdown_logging)
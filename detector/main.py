@@ -1,7 +1,7 @@
 import argparse
+import multiprocessing
 import sys
 import os
-from datetime import datetime
 
 # Optional rich imports for enhanced console output
 try:
@@ -21,7 +21,12 @@ from .endpoint_scanner import get_running_processes, get_installed_apps
 from .browser_scanner import BrowserScanner
 from .alert_manager import AlertManager
 from .report_generator import ReportGenerator
+from .report_pool import ReportJob, ReportPool, auto_report_jobs
 from .real_time_monitor import RealTimeMonitor
+from .usage_analytics import UsageRollupStore, BrowserUsageScanner, usage_db_path
+from .console_view import AlertLiveView, format_plain_sections, scan_summary_sections
+from .delta import delta_since
+from .exports import COMPRESSIONS
 
 class ShadowITDetector:
     """Main Shadow IT Detection application"""
@@ -111,6 +116,18 @@ class ShadowITDetector:
                     'history': history
                 }
                 progress.update(task, description=f"Browser scan complete - {len(extensions)} extensions, {len(bookmarks)} bookmarks")
+            
+            # Usage analytics (incremental rollups of browser visit tables)
+            if self.config.scan_config.enable_usage_analytics:
+                task = progress.add_task("Updating browser usage rollups...", total=None)
+                try:
+                    usage_store = UsageRollupStore(usage_db_path(self.config))
+                    visits = BrowserUsageScanner(self.browser_scanner, usage_store).scan()
+                    usage_store.prune(self.config.scan_config.usage_retention_days)
+                    findings['usage_trends'] = usage_store.trends(self.config.scan_config.usage_retention_days)
+                    progress.update(task, description=f"Usage rollups updated - {visits} new visits")
+                except Exception as e:
+                    progress.update(task, description=f"Usage rollups failed: {e}")
         
         # Calculate totals and risk levels
         findings['total_findings'] = (
@@ -120,7 +137,8 @@ class ShadowITDetector:
         )
         
         # Count by risk level (simplified - you can enhance this based on your SaaS database)
-        for finding in findings['network_findings'] + findings['endpoint_findings']:
+        for finding in (findings['network_findings'] + findings['endpoint_findings'] +
+                        findings['browser_findings'].get('extensions', [])):
             risk_level = finding.get('risk_level', 'medium')
             if risk_level == 'high':
                 findings['high_risk_count'] += 1
@@ -132,96 +150,81 @@ class ShadowITDetector:
         return findings
     
     def display_results(self, findings):
-        """Display scan results in console"""
+        """Display a top-N summary of scan results; full detail goes to the reports"""
+        sections = scan_summary_sections(findings, self.config.report_config.console_top_n)
+        
+        # Pipes and log files get plain text in a single write
+        if not self.console.is_terminal:
+            if not self.console.quiet:
+                self.console.file.write("\nSCAN RESULTS\n" + format_plain_sections(sections))
+                self.console.file.flush()
+            return
+        
         self.console.print("\n" + "="*60)
         self.console.print("📊 SCAN RESULTS", style="bold blue")
         self.console.print("="*60)
         
-        # Summary table
-        summary_table = Table(title="Summary")
-        summary_table.add_column("Metric", style="cyan")
-        summary_table.add_column("Count", style="magenta")
-        
-        summary_table.add_row("Total Findings", str(findings['total_findings']))
-        summary_table.add_row("High Risk", str(findings['high_risk_count']))
-        summary_table.add_row("Medium Risk", str(findings['medium_risk_count']))
-        summary_table.add_row("Low Risk", str(findings['low_risk_count']))
-        
-        self.console.print(summary_table)
-        
-        # Network findings
-        if findings['network_findings']:
-            self.console.print("\n🌐 Network Connections:", style="bold")
-            network_table = Table()
-            network_table.add_column("Service", style="cyan")
-            network_table.add_column("Remote Address", style="yellow")
-            network_table.add_column("Process ID", style="green")
-            
-            for finding in findings['network_findings']:
-                network_table.add_row(
-                    finding.get('saas_domain', 'Unknown'),
-                    finding.get('raddr', 'Unknown'),
-                    str(finding.get('pid', 'Unknown'))
-                )
-            self.console.print(network_table)
-        
-        # Endpoint findings
-        if findings['endpoint_findings']:
-            self.console.print("\n💻 Endpoint Applications:", style="bold")
-            endpoint_table = Table()
-            endpoint_table.add_column("Application", style="cyan")
-            endpoint_table.add_column("Type", style="yellow")
-            endpoint_table.add_column("SaaS Domain", style="green")
-            
-            for finding in findings['endpoint_findings']:
-                endpoint_table.add_row(
-                    finding.get('name', 'Unknown'),
-                    finding.get('type', 'Unknown'),
-                    finding.get('saas_domain', 'Unknown')
-                )
-            self.console.print(endpoint_table)
+        hidden_total = 0
+        for heading, columns, rows, hidden in sections:
+            if heading == 'Summary':
+                table = Table(title=heading)
+                styles = ["cyan", "magenta"]
+            else:
+                self.console.print(f"\n{heading}:", style="bold")
+                table = Table()
+                styles = ["cyan", "yellow", "green", "red", "magenta"]
+            for column, style in zip(columns, styles):
+                table.add_column(column, style=style)
+            for row in rows:
+                table.add_row(*row)
+            if hidden:
+                table.caption = f"... and {hidden} more"
+                hidden_total += hidden
+            self.console.print(table)
         
-        # Browser findings
-        browser_findings = findings['browser_findings']
-        if browser_findings.get('extensions'):
-            self.console.print("\n🌐 Browser Extensions:", style="bold")
-            browser_table = Table()
-            browser_table.add_column("Browser", style="cyan")
-            browser_table.add_column("Extension", style="yellow")
-            browser_table.add_column("Version", style="green")
-            
-            for ext in browser_findings['extensions']:
-                browser_table.add_row(
-                    ext.get('browser', 'Unknown'),
-                    ext.get('name', 'Unknown'),
-                    ext.get('version', 'Unknown')
-                )
-            self.console.print(browser_table)
+        if hidden_total:
+            self.console.print("Full findings are in the generated reports.", style="dim")
     
     def generate_reports(self, findings, args):
-        """Generate reports based on command line arguments"""
-        if args.export_csv:
-            csv_file = self.report_generator.generate_csv_report(findings, args.export_csv)
-            self.console.print(f"📄 CSV report generated: {csv_file}")
-        
-        if args.export_json:
-            json_file = self.report_generator.generate_json_report(findings, args.export_json)
-            self.console.print(f"📄 JSON report generated: {json_file}")
-        
-        if args.export_html:
-            html_file = self.report_generator.generate_html_report(findings, args.export_html)
-            self.console.print(f"📄 HTML report generated: {html_file}")
+        """Generate reports based on command line arguments, all formats in parallel"""
+        jobs = []
+        for fmt, path, compression in [('csv', args.export_csv, args.compress),
+                                       ('ndjson', args.export_ndjson, args.compress),
+                                       ('parquet', args.export_parquet, None),
+                                       ('arrow', args.export_arrow, None),
+                                       ('json', args.export_json, None),
+                                       ('html', args.export_html, None)]:
+            if path:
+                jobs.append(ReportJob(fmt, path, compression, f"{fmt.upper()} report generated"))
         
         # Auto-generate reports if enabled
-        if self.config.report_config.auto_generate_reports:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if self.config.report_config.enable_html_reports:
-                html_file = self.report_generator.generate_html_report(findings, f"auto_report_{timestamp}.html")
-                self.console.print(f"📄 Auto-generated HTML report: {html_file}")
-            
-            if self.config.report_config.enable_csv_reports:
-                csv_file = self.report_generator.generate_csv_report(findings, f"auto_report_{timestamp}.csv")
-                self.console.print(f"📄 Auto-generated CSV report: {csv_file}")
+        report_config = self.config.report_config
+        if report_config.auto_generate_reports:
+            jobs.extend(auto_report_jobs(report_config))
+        
+        if not jobs:
+            return
+        pool = ReportPool(self.config, min(len(jobs), report_config.report_workers))
+        try:
+            results = pool.generate(findings, jobs)
+        finally:
+            pool.shutdown()
+        for job, result in results:
+            if isinstance(result, Exception):
+                self.console.print(f"❌ {job.title} failed: {result}", style="red")
+            elif isinstance(result, dict):
+                self.console.print(f"📄 {job.title}: {', '.join(result.values()) or 'no findings'}")
+            else:
+                self.console.print(f"📄 {job.title}: {result}")
+    
+    def generate_delta_report(self, findings, since):
+        """Report what changed since a previous report or monitor state database"""
+        delta = delta_since(findings, since)
+        delta_file = self.report_generator.generate_delta_report(delta, since)
+        counts = delta.counts()
+        self.console.print(f"🔁 Since {since}: {counts['new']} new, {counts['resolved']} resolved, "
+                           f"{counts['changed']} changed, {counts['unchanged']} unchanged")
+        self.console.print(f"📄 Delta report generated: {delta_file}")
     
     def start_monitoring(self, args):
         """Start real-time monitoring"""
@@ -253,16 +256,27 @@ class ShadowITDetector:
             )
         
         self.console.print("🚀 Starting real-time monitoring...")
-        self.real_time_monitor.start_monitoring()
+        
+        # Alerts update a live summary instead of printing a panel each;
+        # it is in place before the first scan raises any
+        report_config = self.config.report_config
+        view = AlertLiveView(self.console, top_n=report_config.console_top_n,
+                             max_fps=report_config.console_max_fps,
+                             plain_interval=report_config.console_plain_interval,
+                             stream=self.console.file)
+        self.alert_manager.console_view = view
         
         try:
-            while True:
-                # Keep the main thread alive
-                import time
-                time.sleep(1)
+            with view:
+                self.real_time_monitor.start_monitoring()
+                while True:
+                    # Keep the main thread alive
+                    import time
+                    time.sleep(1)
         except KeyboardInterrupt:
             self.console.print("\n⏹️ Stopping real-time monitoring...")
             self.real_time_monitor.stop_monitoring()
+            self.alert_manager.console_view = None
             self.alert_manager.display_alerts_summary()
 
 def main():
@@ -276,6 +290,9 @@ Examples:
   python -m detector.main --export-csv report.csv
   python -m detector.main --export-html report.html
   python -m detector.main --export-json report.json
+  python -m detector.main --export-ndjson findings.ndjson.gz
+  python -m detector.main --since reports/report.json     # Changes since an --export-json report
+  python -m detector.main --since state/monitor_state.db  # Changes since the monitor's known findings
         """
     )
     
@@ -287,6 +304,16 @@ Examples:
                        help='Export findings to JSON file')
     parser.add_argument('--export-html', metavar='FILE',
                        help='Export findings to HTML file')
+    parser.add_argument('--export-ndjson', metavar='FILE',
+                       help='Export findings to NDJSON file, one finding per line')
+    parser.add_argument('--export-parquet', metavar='FILE',
+                       help='Export findings to Parquet, one FILE_<type>.parquet per finding type (needs pyarrow)')
+    parser.add_argument('--export-arrow', metavar='FILE',
+                       help='Export findings to Arrow IPC, one FILE_<type>.arrow per finding type (needs pyarrow)')
+    parser.add_argument('--since', metavar='REPORT|STATE',
+                       help='Also report new, resolved and changed findings since a JSON/NDJSON report or monitor state database')
+    parser.add_argument('--compress', choices=COMPRESSIONS,
+                       help='Compress CSV/NDJSON exports (default: inferred from .gz/.zst suffix)')
     parser.add_argument('--config', metavar='FILE',
                        help='Use custom configuration file')
     parser.add_argument('--quiet', action='store_true',
@@ -311,6 +338,8 @@ Examples:
             findings = detector.run_scan(args)
             detector.display_results(findings)
             detector.generate_reports(findings, args)
+            if args.since:
+                detector.generate_delta_report(findings, args.since)
             
             # Display alerts summary
             detector.alert_manager.display_alerts_summary()
@@ -323,4 +352,6 @@ Examples:
         sys.exit(1)
 
 if __name__ == '__main__':
+    # Report workers are spawned processes; needed for frozen builds
+    multiprocessing.freeze_support()
     main() 
\ No newline at end of file
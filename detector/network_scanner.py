@@ -1,7 +1,10 @@
+import asyncio
 import psutil
 from urllib.parse import urlparse
 import socket
 
+from .deadline import check_deadline
+
 def get_active_connections():
     connections = []
     for conn in psutil.net_connections(kind='inet'):
@@ -18,6 +21,7 @@ def get_active_connections():
 def match_saas_connections(connections, saas_domains):
     matches = []
     for conn in connections:
+        check_deadline()
         try:
             host = conn['raddr'].split(':')[0]
             domain = socket.getfqdn(host)
@@ -26,4 +30,21 @@ def match_saas_connections(connections, saas_domains):
                     matches.append({**conn, 'saas_domain': saas, 'fqdn': domain})
         except Exception:
             continue
-    return matches 
\ No newline at end of file
+    return matches 
+
+async def match_saas_connections_async(connections, saas_domains, run_blocking):
+    """Match connections like match_saas_connections, resolving unique hosts concurrently"""
+    hosts = sorted({conn['raddr'].split(':')[0] for conn in connections})
+    results = await asyncio.gather(*(run_blocking(socket.getfqdn, host) for host in hosts),
+                                   return_exceptions=True)
+    fqdns = {host: fqdn for host, fqdn in zip(hosts, results) if isinstance(fqdn, str)}
+
+    matches = []
+    for conn in connections:
+        domain = fqdns.get(conn['raddr'].split(':')[0])
+        if domain is None:
+            continue
+        for saas in saas_domains:
+            if saas in domain:
+                matches.append({**conn, 'saas_domain': saas, 'fqdn': domain})
+    return matches
@@ -1,16 +1,30 @@
-import time
 import threading
+from concurrent.futures import Future
 from datetime import datetime
 from typing import Dict, List, Callable, Optional
 import psutil
 import os
+import platform
 
-# Optional schedule import for advanced scheduling
-try:
-    import schedule
-    SCHEDULE_AVAILABLE = True
-except ImportError:
-    SCHEDULE_AVAILABLE = False
+from .usage_analytics import UsageRollupStore, BrowserUsageScanner, usage_db_path
+from .fs_watcher import FileWatcher
+from .scheduler import ScanScheduler
+from .async_runtime import AsyncRuntime
+from .network_scanner import match_saas_connections_async
+from .deadline import check_deadline, current_deadline
+from .event_bus import EventBus, FindingEvent, AlertEvent
+from .incidents import IncidentCorrelator
+from .adaptive import AdaptiveInterval, HostLoadProbe
+from .state_store import FindingStateStore, finding_fingerprint, fingerprint_part, state_db_path
+from .endpoint_scanner import LINUX_APPLICATION_DIRS, list_desktop_entries
+from .report_pool import ReportJob, ReportPool, auto_report_jobs
+
+# Finding sources whose new items count as change for each periodic scanner
+SCANNER_SOURCES = {
+    'network': ('network',),
+    'endpoint': ('endpoint',),
+    'browser': ('browser', 'bookmarks')
+}
 
 class RealTimeMonitor:
     """Real-time monitoring system for Shadow IT detection"""
@@ -22,13 +36,66 @@ class RealTimeMonitor:
         self.endpoint_scanner = endpoint_scanner
         self.browser_scanner = browser_scanner
         self.is_running = False
-        self.monitor_thread = None
+        self.scheduler = None
+        self.runtime = None
         self.previous_findings = {
             'network': set(),
             'endpoint': set(),
-            'browser': set()
+            'browser': set(),
+            'bookmarks': set(),
+            'apps': set()
         }
+        # Finding records from each source's last full scan, for reports and agent uploads
+        self.current_findings = {'network': [], 'endpoint': [], 'browser': []}
+        # previous_findings is updated from scheduler, runtime and file watcher threads
+        self._findings_lock = threading.Lock()
         self.callbacks = []
+        self.event_bus = EventBus(config.scan_config.event_queue_size, config.scan_config.event_overflow_policy)
+        self.event_bus.subscribe('alert-sinks', self._deliver_alert, AlertEvent)
+        self.incidents = None
+        if config.alert_config.enable_incident_correlation:
+            self.incidents = IncidentCorrelator(config.alert_config.incident_ttl_seconds,
+                                                config.alert_config.incident_max_open)
+            self.event_bus.subscribe('incidents', self._correlate_alert, AlertEvent)
+        self.usage_scanner = None
+        self.fs_watcher = None
+        # New findings per source since startup; drives adaptive intervals
+        self.new_finding_counts = {source: 0 for source in self.previous_findings}
+        self.adaptive_intervals = {}
+        self.load_probe = None
+        self.report_pool = None
+        self.state_store = None
+        if config.scan_config.enable_state_store:
+            try:
+                self.state_store = FindingStateStore(
+                    state_db_path(config),
+                    retention_seconds=config.scan_config.state_retention_days * 86400
+                )
+            except Exception as e:
+                print(f"Could not open monitor state store, running without it: {e}")
+        if self.state_store is not None:
+            self._seed_previous_findings()
+    
+    def _seed_previous_findings(self, now: Optional[float] = None):
+        """Treat findings seen in the last scan before a restart as current
+
+        Only fingerprints seen within about one scan interval are seeded, so
+        a finding that disappeared and later comes back alerts again.
+        """
+        scan_config = self.config.scan_config
+        intervals = {
+            'network': scan_config.network_scan_interval,
+            'endpoint': scan_config.endpoint_scan_interval,
+            'browser': scan_config.browser_scan_interval,
+            'bookmarks': scan_config.browser_scan_interval,
+            'apps': scan_config.browser_scan_interval
+        }
+        now = datetime.now().timestamp() if now is None else now
+        for source, interval in intervals.items():
+            if scan_config.adaptive_intervals:
+                interval = max(interval, scan_config.adaptive_max_interval)
+            # Twice the interval allows for the scan that was due while stopped
+            self.previous_findings[source] = self.state_store.fingerprints(source, since=now - 2 * interval)
     
     def start_monitoring(self):
         """Start real-time monitoring"""
@@ -37,55 +104,173 @@ class RealTimeMonitor:
             return
         
         self.is_running = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.event_bus.start()
+        if self.config.scan_config.monitor_runtime == 'asyncio':
+            self.runtime = self._create_runtime()
+            self.runtime.start()
+        else:
+            self.scheduler = self._create_scheduler()
+            self.scheduler.start()
+        
+        if self.config.scan_config.enable_fs_watch:
+            self._start_fs_watcher()
         print("Real-time monitoring started")
     
     def stop_monitoring(self):
         """Stop real-time monitoring"""
         self.is_running = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        if self.fs_watcher:
+            self.fs_watcher.stop()
+            self.fs_watcher = None
+        if self.scheduler:
+            self.scheduler.stop()
+            self.scheduler = None
+        if self.runtime:
+            self.runtime.stop()
+            self.runtime = None
+        self.event_bus.stop()
+        self.alert_manager.close()
+        if self.report_pool is not None:
+            # Let reports already handed off finish writing
+            self.report_pool.shutdown()
+            self.report_pool = None
+        if self.state_store is not None:
+            self.state_store.flush()
         print("Real-time monitoring stopped")
     
-    def _monitor_loop(self):
-        """Main monitoring loop"""
-        if SCHEDULE_AVAILABLE:
-            # Schedule different types of scans
-            schedule.every(self.config.scan_config.network_scan_interval).seconds.do(self._network_scan)
-            schedule.every(self.config.scan_config.endpoint_scan_interval).seconds.do(self._endpoint_scan)
-            schedule.every(self.config.scan_config.browser_scan_interval).seconds.do(self._browser_scan)
-            
-            # Run initial scans
-            self._network_scan()
-            self._endpoint_scan()
-            self._browser_scan()
-            
-            while self.is_running:
-                schedule.run_pending()
-                time.sleep(1)
-        else:
-            # Fallback to simple timing without schedule library
-            last_network_scan = 0
-            last_endpoint_scan = 0
-            last_browser_scan = 0
-            
-            while self.is_running:
-                current_time = time.time()
-                
-                if current_time - last_network_scan >= self.config.scan_config.network_scan_interval:
-                    self._network_scan()
-                    last_network_scan = current_time
-                
-                if current_time - last_endpoint_scan >= self.config.scan_config.endpoint_scan_interval:
-                    self._endpoint_scan()
-                    last_endpoint_scan = current_time
-                
-                if current_time - last_browser_scan >= self.config.scan_config.browser_scan_interval:
-                    self._browser_scan()
-                    last_browser_scan = current_time
-                
-                time.sleep(1)
+    def _start_fs_watcher(self):
+        """Watch extension, bookmark and application directories for changes"""
+        self.fs_watcher = FileWatcher(
+            self._on_fs_change,
+            debounce=self.config.scan_config.fs_watch_debounce_seconds,
+            poll_interval=self.config.scan_config.fs_watch_poll_interval
+        )
+        
+        for browser, paths in self.browser_scanner.browser_paths.items():
+            if browser == 'firefox':
+                for profile in self.browser_scanner.firefox_profiles():
+                    self.fs_watcher.watch(os.path.join(profile, 'extensions.json'), ('extensions', browser, profile))
+                    self.fs_watcher.watch(os.path.join(profile, 'extensions'), ('extensions', browser, profile))
+                continue
+            if paths.get('extensions'):
+                self.fs_watcher.watch(paths['extensions'], ('extensions', browser, None))
+            if (self.config.scan_config.enable_bookmark_alerts and browser in ['chrome', 'edge']
+                    and paths.get('bookmarks')):
+                self.fs_watcher.watch(paths['bookmarks'], ('bookmarks', browser, None))
+        
+        if platform.system() == 'Linux':
+            for directory in LINUX_APPLICATION_DIRS:
+                directory = os.path.expanduser(directory)
+                if os.path.isdir(directory):
+                    # Record what is already installed so only new entries alert
+                    self._app_scan(directory, alert=False)
+                    self.fs_watcher.watch(directory, ('apps', None, directory))
+        
+        self.fs_watcher.start()
+    
+    def _on_fs_change(self, key):
+        """Rescan only the browser profile or directory that changed"""
+        kind, browser, path = key
+        if not self.is_running:
+            return
+        
+        if kind == 'extensions':
+            try:
+                if path:
+                    extensions = self.browser_scanner.permission_analyzer.annotate(
+                        self.browser_scanner.scan_firefox_profile_extensions(path, browser)
+                    )
+                else:
+                    extensions = self.browser_scanner.scan_browser_extensions([browser])
+                found = self._alert_new_extensions(extensions)
+                with self._findings_lock:
+                    self.previous_findings['browser'] |= found
+            except Exception as e:
+                print(f"Error in {browser} extension rescan: {e}")
+        elif kind == 'bookmarks':
+            self._bookmark_scan([browser])
+        elif kind == 'apps':
+            self._app_scan(path)
+    
+    def _create_scheduler(self) -> ScanScheduler:
+        """Create a scheduler with one job per scanner"""
+        scan_config = self.config.scan_config
+        scheduler = ScanScheduler()
+        for name, func, interval, timeout in [
+            ('network', self._network_scan, scan_config.network_scan_interval, scan_config.network_scan_timeout),
+            ('endpoint', self._endpoint_scan, scan_config.endpoint_scan_interval, scan_config.endpoint_scan_timeout),
+            ('browser', self._browser_scan, scan_config.browser_scan_interval, scan_config.browser_scan_timeout)
+        ]:
+            policy = self._interval_policy(name, interval)
+            scheduler.add_job(
+                name, func, self.adaptive_intervals[name].interval if policy else interval,
+                jitter=scan_config.scan_jitter_seconds,
+                overlap=scan_config.scan_overlap_policy,
+                interval_policy=policy,
+                timeout=timeout or None
+            )
+        if self._reports_enabled():
+            scheduler.add_job('reports', self._generate_reports, self.config.report_config.monitor_report_interval,
+                              run_immediately=False)
+        return scheduler
+    
+    def _create_runtime(self) -> AsyncRuntime:
+        """Create an asyncio runtime hosting the scanners"""
+        scan_config = self.config.scan_config
+        runtime = AsyncRuntime(max_concurrency=scan_config.async_max_concurrency)
+        for name, func, interval, timeout in [
+            ('network', self._network_scan_async, scan_config.network_scan_interval, scan_config.network_scan_timeout),
+            ('endpoint', self._endpoint_scan, scan_config.endpoint_scan_interval, scan_config.endpoint_scan_timeout),
+            ('browser', self._browser_scan, scan_config.browser_scan_interval, scan_config.browser_scan_timeout)
+        ]:
+            policy = self._interval_policy(name, interval)
+            runtime.add_periodic(name, func, self.adaptive_intervals[name].interval if policy else interval,
+                                 jitter=scan_config.scan_jitter_seconds, interval_policy=policy,
+                                 timeout=timeout or None)
+        if self._reports_enabled():
+            runtime.add_periodic('reports', self._generate_reports, self.config.report_config.monitor_report_interval,
+                                 run_immediately=False)
+        return runtime
+    
+    def _interval_policy(self, name: str, interval: float):
+        """Build the adaptive interval policy for a scanner, or None when disabled"""
+        scan_config = self.config.scan_config
+        if not scan_config.adaptive_intervals:
+            return None
+        
+        if self.load_probe is None:
+            self.load_probe = HostLoadProbe(scan_config.adaptive_cpu_threshold, scan_config.adaptive_load_threshold)
+        adaptive = AdaptiveInterval(
+            interval, scan_config.adaptive_min_interval, scan_config.adaptive_max_interval,
+            backoff=scan_config.adaptive_backoff_factor, load_probe=self.load_probe
+        )
+        self.adaptive_intervals[name] = adaptive
+        
+        sources = SCANNER_SOURCES[name]
+        last_total = [sum(self.new_finding_counts[source] for source in sources)]
+        
+        def policy(_result):
+            total = sum(self.new_finding_counts[source] for source in sources)
+            new_findings = total - last_total[0]
+            last_total[0] = total
+            return adaptive.update(new_findings)
+        return policy
+    
+    def _send_alert(self, alert):
+        """Hand an alert to the event bus; sinks deliver it off the scan path"""
+        self.event_bus.publish(AlertEvent(alert))
+    
+    def _deliver_alert(self, event: AlertEvent):
+        """Alert sink subscriber"""
+        self.alert_manager.send_alert(event.alert)
+    
+    def _correlate_alert(self, event: AlertEvent):
+        """Incident correlation subscriber"""
+        self.incidents.add_alert(event.alert)
+    
+    def _publish_finding(self, source: str, fingerprint: str, finding: Dict):
+        """Announce a new finding to subscribers"""
+        self.event_bus.publish(FindingEvent(source, fingerprint, finding))
     
     def _network_scan(self):
         """Perform network scan and check for new findings"""
@@ -95,22 +280,48 @@ class RealTimeMonitor:
             
             connections = self.network_scanner.get_active_connections()
             saas_conns = self.network_scanner.match_saas_connections(connections, saas_domains)
+            self._process_network_findings(saas_conns)
             
-            # Create unique identifiers for findings
-            current_findings = set()
-            for conn in saas_conns:
-                finding_id = f"{conn.get('saas_domain')}_{conn.get('raddr')}"
-                current_findings.add(finding_id)
-                
-                # Check if this is a new finding
-                if finding_id not in self.previous_findings['network']:
-                    self._create_network_alert(conn)
+        except Exception as e:
+            print(f"Error in network scan: {e}")
+    
+    async def _network_scan_async(self):
+        """Network scan for the asyncio runtime, resolving hosts concurrently"""
+        try:
+            from .saas_db import load_saas_domains
+            saas_domains = await self.runtime.run_blocking(load_saas_domains)
             
-            self.previous_findings['network'] = current_findings
+            connections = await self.runtime.run_blocking(self.network_scanner.get_active_connections)
+            saas_conns = await match_saas_connections_async(connections, saas_domains, self.runtime.run_blocking)
+            self._process_network_findings(saas_conns)
             
         except Exception as e:
             print(f"Error in network scan: {e}")
     
+    def _process_network_findings(self, saas_conns: List[Dict]):
+        """Alert on new network findings and remember the current set"""
+        # Create unique identifiers for findings
+        current_findings = set()
+        records = []
+        for conn in saas_conns:
+            finding_id = finding_fingerprint('network', conn)
+            if finding_id in current_findings:
+                continue
+            current_findings.add(finding_id)
+            records.append(conn)
+            
+            # Check if this is a new finding
+            if self._is_new_finding('network', finding_id):
+                self._publish_finding('network', finding_id, conn)
+                self._create_network_alert(conn)
+        
+        self._record_findings('network', current_findings)
+        with self._findings_lock:
+            if self._scan_cancelled():
+                return
+            self.previous_findings['network'] = current_findings
+            self.current_findings['network'] = records
+    
     def _endpoint_scan(self):
         """Perform endpoint scan and check for new findings"""
         try:
@@ -121,21 +332,31 @@ class RealTimeMonitor:
             
             # Create unique identifiers for findings
             current_findings = set()
+            records = []
             for proc in processes:
+                check_deadline()
                 proc_name = proc.get('name', '').lower()
                 
                 # Check if process matches any SaaS service
                 for saas in saas_domains:
                     if saas.split('.')[0] in proc_name:
-                        finding_id = f"{proc.get('pid')}_{proc_name}"
-                        current_findings.add(finding_id)
-                        
-                        # Check if this is a new finding
-                        if finding_id not in self.previous_findings['endpoint']:
-                            self._create_endpoint_alert(proc, saas)
+                        finding_id = finding_fingerprint('endpoint', proc)
+                        if finding_id not in current_findings:
+                            current_findings.add(finding_id)
+                            records.append({**proc, 'saas_domain': saas})
+                            
+                            # Check if this is a new finding
+                            if self._is_new_finding('endpoint', finding_id):
+                                self._publish_finding('endpoint', finding_id, proc)
+                                self._create_endpoint_alert(proc, saas)
                         break
             
-            self.previous_findings['endpoint'] = current_findings
+            self._record_findings('endpoint', current_findings)
+            with self._findings_lock:
+                if self._scan_cancelled():
+                    return
+                self.previous_findings['endpoint'] = current_findings
+                self.current_findings['endpoint'] = records
             
         except Exception as e:
             print(f"Error in endpoint scan: {e}")
@@ -145,21 +366,133 @@ class RealTimeMonitor:
         try:
             # Scan browser extensions
             extensions = self.browser_scanner.scan_browser_extensions()
+            found = self._alert_new_extensions(extensions)
+            with self._findings_lock:
+                if self._scan_cancelled():
+                    return
+                self.previous_findings['browser'] = found
+                self.current_findings['browser'] = list(extensions)
+            
+        except Exception as e:
+            print(f"Error in browser scan: {e}")
+        
+        if self.config.scan_config.enable_bookmark_alerts:
+            self._bookmark_scan()
+        
+        if self.config.scan_config.enable_usage_analytics:
+            self._usage_scan()
+    
+    def _alert_new_extensions(self, extensions: List[Dict]) -> set:
+        """Alert on extensions not seen before and return their identifiers"""
+        current_findings = set()
+        for ext in extensions:
+            finding_id = finding_fingerprint('browser', ext)
+            if finding_id in current_findings:
+                continue
+            current_findings.add(finding_id)
+            
+            # Check if this is a new finding
+            if self._is_new_finding('browser', finding_id):
+                self._publish_finding('browser', finding_id, ext)
+                self._create_browser_alert(ext)
+        
+        self._record_findings('browser', current_findings)
+        return current_findings
+    
+    def _bookmark_scan(self, browsers: Optional[List[str]] = None):
+        """Scan bookmarks and alert on newly bookmarked SaaS services"""
+        try:
+            bookmarks = self.browser_scanner.scan_browser_bookmarks(browsers)
             
-            # Create unique identifiers for findings
             current_findings = set()
-            for ext in extensions:
-                finding_id = f"{ext.get('browser')}_{ext.get('id')}"
+            for bookmark in bookmarks:
+                finding_id = finding_fingerprint('bookmarks', bookmark)
+                if finding_id in current_findings:
+                    continue
                 current_findings.add(finding_id)
                 
-                # Check if this is a new finding
-                if finding_id not in self.previous_findings['browser']:
-                    self._create_browser_alert(ext)
+                if self._is_new_finding('bookmarks', finding_id):
+                    self._publish_finding('bookmarks', finding_id, bookmark)
+                    self._create_bookmark_alert(bookmark)
             
-            self.previous_findings['browser'] = current_findings
+            self._record_findings('bookmarks', current_findings)
+            
+            # Keep findings for browsers outside this scan
+            with self._findings_lock:
+                if self._scan_cancelled():
+                    return
+                kept = {
+                    finding_id for finding_id in self.previous_findings['bookmarks']
+                    if browsers is not None and fingerprint_part(finding_id, 1) not in browsers
+                }
+                self.previous_findings['bookmarks'] = kept | current_findings
             
         except Exception as e:
-            print(f"Error in browser scan: {e}")
+            print(f"Error in bookmark scan: {e}")
+    
+    def _app_scan(self, directory: str, alert: bool = True):
+        """Scan one application directory and alert on new SaaS applications"""
+        try:
+            from .saas_db import load_saas_domains
+            saas_domains = load_saas_domains()
+            
+            current_findings = set()
+            for entry in list_desktop_entries(directory):
+                app_name = entry.lower()
+                for saas in saas_domains:
+                    if saas.split('.')[0] in app_name:
+                        finding_id = finding_fingerprint('apps', {'path': os.path.join(directory, entry)})
+                        current_findings.add(finding_id)
+                        
+                        if alert and self._is_new_finding('apps', finding_id):
+                            self._publish_finding('apps', finding_id, {
+                                'name': entry, 'path': os.path.join(directory, entry), 'saas_domain': saas
+                            })
+                            self._create_app_alert(entry, directory, saas)
+                        break
+            
+            self._record_findings('apps', current_findings)
+            
+            with self._findings_lock:
+                if self._scan_cancelled():
+                    return
+                kept = {
+                    finding_id for finding_id in self.previous_findings['apps']
+                    if os.path.dirname(fingerprint_part(finding_id, 1)) != directory
+                }
+                self.previous_findings['apps'] = kept | current_findings
+            
+        except Exception as e:
+            print(f"Error in application scan: {e}")
+    
+    def _is_new_finding(self, source: str, fingerprint: str) -> bool:
+        """A finding is new if it was not found by the previous scan of its source"""
+        with self._findings_lock:
+            if fingerprint in self.previous_findings[source]:
+                return False
+            self.new_finding_counts[source] += 1
+        return True
+    
+    def _record_findings(self, source: str, fingerprints):
+        """Persist that findings were seen in this scan"""
+        if self.state_store is not None and not self._scan_cancelled():
+            self.state_store.record(source, fingerprints)
+    
+    def _scan_cancelled(self) -> bool:
+        """True once the scheduler cancelled or abandoned the running scan; its results are stale"""
+        deadline = current_deadline()
+        return deadline is not None and deadline.cancelled
+    
+    def _usage_scan(self):
+        """Roll browser visits made since the last scan into usage trends"""
+        try:
+            if self.usage_scanner is None:
+                store = UsageRollupStore(usage_db_path(self.config))
+                self.usage_scanner = BrowserUsageScanner(self.browser_scanner, store)
+            self.usage_scanner.scan()
+            self.usage_scanner.store.prune(self.config.scan_config.usage_retention_days)
+        except Exception as e:
+            print(f"Error in usage scan: {e}")
     
     def _create_network_alert(self, connection: Dict):
         """Create alert for network finding"""
@@ -176,7 +509,7 @@ class RealTimeMonitor:
             },
             source='network'
         )
-        self.alert_manager.send_alert(alert)
+        self._send_alert(alert)
     
     def _create_endpoint_alert(self, process: Dict, saas_domain: str):
         """Create alert for endpoint finding"""
@@ -193,12 +526,12 @@ class RealTimeMonitor:
             },
             source='endpoint'
         )
-        self.alert_manager.send_alert(alert)
+        self._send_alert(alert)
     
     def _create_browser_alert(self, extension: Dict):
         """Create alert for browser finding"""
         alert = self.alert_manager.create_alert(
-            severity='low',
+            severity=extension.get('risk_level', 'low'),
             category='browser',
             title=f"Browser Extension Detected",
             description=f"Extension {extension.get('name', 'Unknown')} in {extension.get('browser', 'Unknown browser')}",
@@ -207,35 +540,120 @@ class RealTimeMonitor:
                 'extension_id': extension.get('id', 'Unknown'),
                 'browser': extension.get('browser', 'Unknown'),
                 'version': extension.get('version', 'Unknown'),
-                'description': extension.get('description', 'No description')
+                'description': extension.get('description', 'No description'),
+                'saas_access': extension.get('saas_access', []),
+                'broad_host_access': extension.get('broad_host_access', False)
+            },
+            source='browser'
+        )
+        self._send_alert(alert)
+    
+    def _create_bookmark_alert(self, bookmark: Dict):
+        """Create alert for bookmark finding"""
+        alert = self.alert_manager.create_alert(
+            severity='low',
+            category='browser',
+            title=f"SaaS Bookmark Detected",
+            description=f"Bookmark to {bookmark.get('saas_domain', 'Unknown SaaS service')} in {bookmark.get('browser', 'Unknown browser')}",
+            details={
+                'saas_domain': bookmark.get('saas_domain', 'Unknown'),
+                'title': bookmark.get('title', ''),
+                'url': bookmark.get('url', ''),
+                'browser': bookmark.get('browser', 'Unknown')
             },
             source='browser'
         )
-        self.alert_manager.send_alert(alert)
+        self._send_alert(alert)
+    
+    def _create_app_alert(self, app_name: str, directory: str, saas_domain: str):
+        """Create alert for newly installed application"""
+        alert = self.alert_manager.create_alert(
+            severity='medium',
+            category='endpoint',
+            title=f"SaaS Application Installed",
+            description=f"Application {app_name} related to {saas_domain} installed",
+            details={
+                'application': app_name,
+                'directory': directory,
+                'saas_domain': saas_domain
+            },
+            source='endpoint'
+        )
+        self._send_alert(alert)
+    
+    def _reports_enabled(self) -> bool:
+        report_config = self.config.report_config
+        return report_config.auto_generate_reports and report_config.monitor_report_interval > 0
+    
+    def _generate_reports(self):
+        """Report the current findings in every enabled format"""
+        jobs = auto_report_jobs(self.config.report_config, 'monitor_report')
+        if jobs:
+            self.submit_reports(self.findings_snapshot(), jobs).add_done_callback(self._reports_done)
+    
+    def _reports_done(self, done: Future):
+        for job, result in done.result():
+            if isinstance(result, Exception):
+                print(f"Error generating {job.title}: {result}")
+    
+    def submit_reports(self, findings: Dict, jobs: List[ReportJob]) -> Future:
+        """Hand report generation to the report pool without blocking the next scan"""
+        if self.report_pool is None:
+            self.report_pool = ReportPool(self.config)
+        return self.report_pool.submit(findings, jobs)
     
     def add_callback(self, callback: Callable):
-        """Add callback function to be called when new findings are detected"""
+        """Add callback function to be called with a FindingEvent for each new finding"""
         self.callbacks.append(callback)
+        self.event_bus.subscribe(f"callback-{len(self.callbacks)}", callback, FindingEvent)
+    
+    def findings_snapshot(self) -> Dict:
+        """Current findings in the shape of a scan's findings dict"""
+        with self._findings_lock:
+            return {
+                'scan_timestamp': datetime.now().isoformat(),
+                'network_findings': list(self.current_findings['network']),
+                'endpoint_findings': list(self.current_findings['endpoint']),
+                'browser_findings': {'extensions': list(self.current_findings['browser'])}
+            }
     
     def get_monitoring_status(self) -> Dict:
         """Get current monitoring status"""
+        with self._findings_lock:
+            counts = {source: len(findings) for source, findings in self.previous_findings.items()}
         return {
             'is_running': self.is_running,
-            'network_findings_count': len(self.previous_findings['network']),
-            'endpoint_findings_count': len(self.previous_findings['endpoint']),
-            'browser_findings_count': len(self.previous_findings['browser']),
+            'network_findings_count': counts['network'],
+            'endpoint_findings_count': counts['endpoint'],
+            'browser_findings_count': counts['browser'],
+            'fs_watch_backend': self.fs_watcher.backend if self.fs_watcher else None,
+            'scheduler': self.scheduler.get_status() if self.scheduler else {},
+            'runtime': self.runtime.get_status() if self.runtime else None,
+            'event_bus': self.event_bus.get_status(),
+            'incidents': self.incidents.get_status() if self.incidents else None,
+            'known_findings_count': len(self.state_store) if self.state_store is not None else None,
             'scan_intervals': {
-                'network': self.config.scan_config.network_scan_interval,
-                'endpoint': self.config.scan_config.endpoint_scan_interval,
-                'browser': self.config.scan_config.browser_scan_interval
+                name: self.adaptive_intervals[name].effective_interval if name in self.adaptive_intervals else interval
+                for name, interval in [
+                    ('network', self.config.scan_config.network_scan_interval),
+                    ('endpoint', self.config.scan_config.endpoint_scan_interval),
+                    ('browser', self.config.scan_config.browser_scan_interval)
+                ]
+            },
+            'adaptive_intervals': {
+                name: adaptive.get_status() for name, adaptive in self.adaptive_intervals.items()
             }
         }
     
     def reset_findings(self):
         """Reset previous findings (useful for testing)"""
-        self.previous_findings = {
-            'network': set(),
-            'endpoint': set(),
-            'browser': set()
-        }
+        with self._findings_lock:
+            self.previous_findings = {
+                'network': set(),
+                'endpoint': set(),
+                'browser': set(),
+                'bookmarks': set(),
+                'apps': set()
+            }
+            self.current_findings = {'network': [], 'endpoint': [], 'browser': []}
         print("Previous findings reset") 
\ No newline at end of file
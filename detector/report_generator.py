@@ -1,185 +1,181 @@
 import os
 import json
-import csv
+from collections import Counter
 from datetime import datetime
+from itertools import chain
 from typing import List, Dict, Any
 from pathlib import Path
 
-class ReportGenerator:
-    """Generates comprehensive reports for Shadow IT detection findings"""
-    
-    def __init__(self, config):
-        self.config = config
-        self.report_dir = Path(self.config.report_config.report_directory)
-        self.report_dir.mkdir(exist_ok=True)
-    
-    def generate_html_report(self, findings: Dict[str, Any], filename: str = None) -> str:
-        """Generate a comprehensive HTML report"""
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"shadowit_report_{timestamp}.html"
-        
-        filepath = self.report_dir / filename
-        
-        html_content = self._create_html_content(findings)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(html_content)
-        
-        return str(filepath)
-    
-    def _create_html_content(self, findings: Dict[str, Any]) -> str:
-        """Create HTML content for the report"""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        html = f"""
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Shadow IT Detection Report</title>
-    <style>
-        body {{
+from .columnar_export import COLUMNAR_FORMATS, ColumnarWriter
+from .delta import FindingDelta
+from .exports import COMPRESSED_SUFFIXES, CSV_HEADER, iter_csv_rows, iter_finding_records, write_csv, write_ndjson
+from .html_writer import HtmlReportWriter, badge, escape
+
+HTML_STYLE = """
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 20px;
             background-color: #f5f5f5;
-        }}
-        .container {{
+        }
+        .container {
             max-width: 1200px;
             margin: 0 auto;
             background-color: white;
             border-radius: 8px;
             box-shadow: 0 2px 10px rgba(0,0,0,0.1);
             overflow: hidden;
-        }}
-        .header {{
+        }
+        .header {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 30px;
             text-align: center;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0;
             font-size: 2.5em;
             font-weight: 300;
-        }}
-        .header p {{
+        }
+        .header p {
             margin: 10px 0 0 0;
             opacity: 0.9;
-        }}
-        .summary {{
+        }
+        .summary {
             padding: 30px;
             border-bottom: 1px solid #eee;
-        }}
-        .summary-grid {{
+        }
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
-        .summary-card {{
+        }
+        .summary-card {
             background: #f8f9fa;
             padding: 20px;
             border-radius: 8px;
             text-align: center;
             border-left: 4px solid #667eea;
-        }}
-        .summary-card h3 {{
+        }
+        .summary-card h3 {
             margin: 0 0 10px 0;
             color: #333;
-        }}
-        .summary-card .number {{
+        }
+        .summary-card .number {
             font-size: 2em;
             font-weight: bold;
             color: #667eea;
-        }}
-        .section {{
+        }
+        .section {
             padding: 30px;
             border-bottom: 1px solid #eee;
-        }}
-        .section:last-child {{
+        }
+        .section:last-child {
             border-bottom: none;
-        }}
-        .section h2 {{
+        }
+        .section h2 {
             color: #333;
             border-bottom: 2px solid #667eea;
             padding-bottom: 10px;
             margin-bottom: 20px;
-        }}
-        .risk-high {{ color: #dc3545; }}
-        .risk-medium {{ color: #ffc107; }}
-        .risk-low {{ color: #28a745; }}
-        table {{
+        }
+        .risk-high { color: #dc3545; }
+        .risk-medium { color: #ffc107; }
+        .risk-low { color: #28a745; }
+        table {
             width: 100%;
             border-collapse: collapse;
             margin-top: 15px;
-        }}
-        th, td {{
+        }
+        th, td {
             padding: 12px;
             text-align: left;
             border-bottom: 1px solid #ddd;
-        }}
-        th {{
+        }
+        th {
             background-color: #f8f9fa;
             font-weight: 600;
-        }}
-        tr:hover {{
+        }
+        tr:hover {
             background-color: #f5f5f5;
-        }}
-        .badge {{
+        }
+        .badge {
             padding: 4px 8px;
             border-radius: 12px;
             font-size: 0.8em;
             font-weight: 500;
-        }}
-        .badge-high {{ background-color: #dc3545; color: white; }}
-        .badge-medium {{ background-color: #ffc107; color: black; }}
-        .badge-low {{ background-color: #28a745; color: white; }}
-        .footer {{
+        }
+        .badge-high { background-color: #dc3545; color: white; }
+        .badge-medium { background-color: #ffc107; color: black; }
+        .badge-low { background-color: #28a745; color: white; }
+        .pages {
+            color: #666;
+            font-size: 0.9em;
+        }
+        .footer {
             background-color: #f8f9fa;
             padding: 20px;
             text-align: center;
             color: #666;
             font-size: 0.9em;
-        }}
-    </style>
+        }
+    """
+
+class ReportGenerator:
+    """Generates comprehensive reports for Shadow IT detection findings"""
+    
+    def __init__(self, config):
+        self.config = config
+        self.report_dir = Path(self.config.report_config.report_directory)
+        self.report_dir.mkdir(exist_ok=True)
+    
+    def generate_html_report(self, findings: Dict[str, Any], filename: str = None) -> str:
+        """Generate a comprehensive HTML report
+        
+        The report is streamed to disk section by section; tables longer than
+        html_page_rows continue on linked page files next to the report.
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"shadowit_report_{timestamp}.html"
+        
+        filepath = self.report_dir / filename
+        
+        with HtmlReportWriter(filepath, self.config.report_config.html_page_rows,
+                              head=self._html_head, foot=self._html_foot) as out:
+            out.write(self._html_head("Shadow IT Detection Report"))
+            self._write_summary_section(out, findings)
+            self._write_network_section(out, findings.get('network_findings', []))
+            self._write_endpoint_section(out, findings.get('endpoint_findings', []))
+            self._write_browser_section(out, findings.get('browser_findings', {}))
+            self._write_usage_section(out, findings.get('usage_trends', {}))
+            self._write_recommendations_section(out, findings)
+            out.write(self._html_foot())
+        
+        return str(filepath)
+    
+    def _html_head(self, title: str) -> str:
+        """Document head and page header"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{escape(title)}</title>
+    <style>{HTML_STYLE}</style>
 </head>
 <body>
     <div class="container">
         <div class="header">
-            <h1>🔍 Shadow IT Detection Report</h1>
+            <h1>🔍 {escape(title)}</h1>
             <p>Generated on {timestamp}</p>
         </div>
-        
-        <div class="summary">
-            <h2>Executive Summary</h2>
-            <div class="summary-grid">
-                <div class="summary-card">
-                    <h3>Total Findings</h3>
-                    <div class="number">{findings.get('total_findings', 0)}</div>
-                </div>
-                <div class="summary-card">
-                    <h3>High Risk</h3>
-                    <div class="number risk-high">{findings.get('high_risk_count', 0)}</div>
-                </div>
-                <div class="summary-card">
-                    <h3>Medium Risk</h3>
-                    <div class="number risk-medium">{findings.get('medium_risk_count', 0)}</div>
-                </div>
-                <div class="summary-card">
-                    <h3>Low Risk</h3>
-                    <div class="number risk-low">{findings.get('low_risk_count', 0)}</div>
-                </div>
-            </div>
-        </div>
-        
-        {self._generate_network_section(findings.get('network_findings', []))}
-        {self._generate_endpoint_section(findings.get('endpoint_findings', []))}
-        {self._generate_browser_section(findings.get('browser_findings', []))}
-        {self._generate_recommendations_section(findings)}
-        
+"""
+    
+    def _html_foot(self) -> str:
+        return """
         <div class="footer">
             <p>This report was generated by Shadow IT Detector</p>
             <p>For security inquiries, contact your IT department</p>
@@ -187,193 +183,161 @@ class ReportGenerator:
     </div>
 </body>
 </html>
-        """
-        
-        return html
+"""
     
-    def _generate_network_section(self, network_findings: List[Dict]) -> str:
-        """Generate HTML for network findings section"""
-        if not network_findings:
-            return """
-        <div class="section">
-            <h2>🌐 Network Connections</h2>
-            <p>No suspicious network connections detected.</p>
+    def _write_summary_section(self, out: HtmlReportWriter, findings: Dict[str, Any]):
+        """Write the executive summary cards"""
+        cards = [('Total Findings', '', 'total_findings'), ('High Risk', ' risk-high', 'high_risk_count'),
+                 ('Medium Risk', ' risk-medium', 'medium_risk_count'), ('Low Risk', ' risk-low', 'low_risk_count')]
+        out.write("""
+        <div class="summary">
+            <h2>Executive Summary</h2>
+            <div class="summary-grid">
+""")
+        for title, risk_class, key in cards:
+            out.write(f"""                <div class="summary-card">
+                    <h3>{title}</h3>
+                    <div class="number{risk_class}">{escape(findings.get(key, 0))}</div>
+                </div>
+""")
+        out.write("""            </div>
         </div>
-            """
-        
-        html = """
+""")
+    
+    def _write_top_services(self, out: HtmlReportWriter, items: List[Dict], key: str = 'saas_domain'):
+        """Top-N services of a section too long to show inline"""
+        if len(items) <= self.config.report_config.html_page_rows:
+            return
+        counts = Counter(item.get(key) or 'Unknown' for item in items)
+        top_n = self.config.report_config.html_top_n
+        out.write(f"<h3>Top {top_n} services</h3>\n")
+        out.table('top', ['Service', 'Findings'], counts.most_common(top_n))
+    
+    def _write_network_section(self, out: HtmlReportWriter, network_findings: List[Dict]):
+        """Write network findings section"""
+        out.write("""
         <div class="section">
             <h2>🌐 Network Connections</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Service</th>
-                        <th>Domain</th>
-                        <th>Local Address</th>
-                        <th>Remote Address</th>
-                        <th>Risk Level</th>
-                        <th>Category</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for finding in network_findings:
-            risk_class = f"risk-{finding.get('risk_level', 'low')}"
-            badge_class = f"badge-{finding.get('risk_level', 'low')}"
-            
-            html += f"""
-                    <tr>
-                        <td>{finding.get('saas_domain', 'Unknown')}</td>
-                        <td>{finding.get('fqdn', 'Unknown')}</td>
-                        <td>{finding.get('laddr', 'Unknown')}</td>
-                        <td>{finding.get('raddr', 'Unknown')}</td>
-                        <td><span class="badge {badge_class}">{finding.get('risk_level', 'low').upper()}</span></td>
-                        <td>{finding.get('category', 'Unknown')}</td>
-                    </tr>
-            """
-        
-        html += """
-                </tbody>
-            </table>
+""")
+        if not network_findings:
+            out.write("""            <p>No suspicious network connections detected.</p>
         </div>
-        """
+""")
+            return
         
-        return html
+        self._write_top_services(out, network_findings)
+        out.table('network', ['Service', 'Domain', 'Local Address', 'Remote Address', 'Risk Level', 'Category'], (
+            [
+                finding.get('saas_domain', 'Unknown'),
+                finding.get('fqdn', 'Unknown'),
+                finding.get('laddr', 'Unknown'),
+                finding.get('raddr', 'Unknown'),
+                badge(finding.get('risk_level', 'low')),
+                finding.get('category', 'Unknown')
+            ] for finding in network_findings
+        ), raw_columns=[4])
+        out.write("        </div>\n")
     
-    def _generate_endpoint_section(self, endpoint_findings: List[Dict]) -> str:
-        """Generate HTML for endpoint findings section"""
-        if not endpoint_findings:
-            return """
-        <div class="section">
-            <h2>💻 Endpoint Applications</h2>
-            <p>No suspicious applications detected.</p>
-        </div>
-            """
-        
-        html = """
+    def _write_endpoint_section(self, out: HtmlReportWriter, endpoint_findings: List[Dict]):
+        """Write endpoint findings section"""
+        out.write("""
         <div class="section">
             <h2>💻 Endpoint Applications</h2>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Application</th>
-                        <th>Process ID</th>
-                        <th>Executable Path</th>
-                        <th>Risk Level</th>
-                        <th>Category</th>
-                    </tr>
-                </thead>
-                <tbody>
-        """
-        
-        for finding in endpoint_findings:
-            risk_class = f"risk-{finding.get('risk_level', 'low')}"
-            badge_class = f"badge-{finding.get('risk_level', 'low')}"
-            
-            html += f"""
-                    <tr>
-                        <td>{finding.get('name', 'Unknown')}</td>
-                        <td>{finding.get('pid', 'Unknown')}</td>
-                        <td>{finding.get('exe', 'Unknown')}</td>
-                        <td><span class="badge {badge_class}">{finding.get('risk_level', 'low').upper()}</span></td>
-                        <td>{finding.get('category', 'Unknown')}</td>
-                    </tr>
-            """
-        
-        html += """
-                </tbody>
-            </table>
+""")
+        if not endpoint_findings:
+            out.write("""            <p>No suspicious applications detected.</p>
         </div>
-        """
+""")
+            return
         
-        return html
+        self._write_top_services(out, endpoint_findings)
+        out.table('endpoint', ['Application', 'Process ID', 'Executable Path', 'Risk Level', 'Category'], (
+            [
+                finding.get('name', 'Unknown'),
+                finding.get('pid', 'Unknown'),
+                finding.get('exe', 'Unknown'),
+                badge(finding.get('risk_level', 'low')),
+                finding.get('category', 'Unknown')
+            ] for finding in endpoint_findings
+        ), raw_columns=[3])
+        out.write("        </div>\n")
     
-    def _generate_browser_section(self, browser_findings: Dict) -> str:
-        """Generate HTML for browser findings section"""
-        if not browser_findings:
-            return """
+    def _write_browser_section(self, out: HtmlReportWriter, browser_findings: Dict):
+        """Write browser findings section"""
+        out.write("""
         <div class="section">
             <h2>🌐 Browser Activity</h2>
-            <p>No suspicious browser activity detected.</p>
+""")
+        if not browser_findings:
+            out.write("""            <p>No suspicious browser activity detected.</p>
         </div>
-            """
-        
-        html = """
-        <div class="section">
-            <h2>🌐 Browser Activity</h2>
-        """
+""")
+            return
         
         # Extensions
         if browser_findings.get('extensions'):
-            html += """
-            <h3>Browser Extensions</h3>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Browser</th>
-                        <th>Extension Name</th>
-                        <th>Version</th>
-                        <th>Description</th>
-                    </tr>
-                </thead>
-                <tbody>
-            """
-            
-            for ext in browser_findings['extensions']:
-                html += f"""
-                    <tr>
-                        <td>{ext.get('browser', 'Unknown')}</td>
-                        <td>{ext.get('name', 'Unknown')}</td>
-                        <td>{ext.get('version', 'Unknown')}</td>
-                        <td>{ext.get('description', 'No description')}</td>
-                    </tr>
-                """
-            
-            html += """
-                </tbody>
-            </table>
-            """
+            out.write("<h3>Browser Extensions</h3>\n")
+            out.table('extensions', ['Browser', 'Extension Name', 'Version', 'Risk Level', 'SaaS Access', 'Description'], (
+                [
+                    ext.get('browser', 'Unknown'),
+                    ext.get('name', 'Unknown'),
+                    ext.get('version', 'Unknown'),
+                    badge(ext.get('risk_level', 'low')),
+                    'All sites' if ext.get('broad_host_access') else ', '.join(ext.get('saas_access', [])) or 'None',
+                    ext.get('description', 'No description')
+                ] for ext in browser_findings['extensions']
+            ), raw_columns=[3])
         
         # Bookmarks
         if browser_findings.get('bookmarks'):
-            html += """
-            <h3>Browser Bookmarks</h3>
-            <table>
-                <thead>
-                    <tr>
-                        <th>Browser</th>
-                        <th>Title</th>
-                        <th>URL</th>
-                        <th>Date Added</th>
-                    </tr>
-                </thead>
-                <tbody>
-            """
-            
-            for bookmark in browser_findings['bookmarks']:
-                html += f"""
-                    <tr>
-                        <td>{bookmark.get('browser', 'Unknown')}</td>
-                        <td>{bookmark.get('title', 'Unknown')}</td>
-                        <td>{bookmark.get('url', 'Unknown')}</td>
-                        <td>{bookmark.get('date_added', 'Unknown')}</td>
-                    </tr>
-                """
-            
-            html += """
-                </tbody>
-            </table>
-            """
-        
-        html += """
-        </div>
-        """
+            out.write("<h3>Browser Bookmarks</h3>\n")
+            self._write_top_services(out, browser_findings['bookmarks'])
+            out.table('bookmarks', ['Browser', 'Title', 'URL', 'Date Added'], (
+                [
+                    bookmark.get('browser', 'Unknown'),
+                    bookmark.get('title', 'Unknown'),
+                    bookmark.get('url', 'Unknown'),
+                    bookmark.get('date_added', 'Unknown')
+                ] for bookmark in browser_findings['bookmarks']
+            ))
+        
+        # History
+        if browser_findings.get('history'):
+            out.write("<h3>Browser History</h3>\n")
+            out.table('history', ['Browser', 'Title', 'URL', 'Visits'], (
+                [
+                    entry.get('browser', 'Unknown'),
+                    entry.get('title', ''),
+                    entry.get('url', ''),
+                    entry.get('visit_count', 0)
+                ] for entry in browser_findings['history']
+            ))
+        
+        out.write("        </div>\n")
+    
+    def _write_usage_section(self, out: HtmlReportWriter, usage_trends: Dict):
+        """Write browser usage trends section"""
+        if not usage_trends:
+            return
         
-        return html
+        out.write("""
+        <div class="section">
+            <h2>📈 SaaS Usage Trends</h2>
+""")
+        ranked = sorted(usage_trends.items(), key=lambda item: item[1]['active_seconds'], reverse=True)
+        out.table('usage', ['Service', 'Visits', 'Active Time (hours)', 'Active Days', 'Last Active'], (
+            [
+                service,
+                trend.get('visits', 0),
+                f"{trend.get('active_seconds', 0) / 3600:.1f}",
+                len(trend.get('daily', [])),
+                trend['daily'][-1]['date'] if trend.get('daily') else 'Unknown'
+            ] for service, trend in ranked
+        ))
+        out.write("        </div>\n")
     
-    def _generate_recommendations_section(self, findings: Dict) -> str:
-        """Generate HTML for recommendations section"""
+    def _write_recommendations_section(self, out: HtmlReportWriter, findings: Dict):
+        """Write recommendations section"""
         recommendations = []
         
         if findings.get('high_risk_count', 0) > 0:
@@ -391,68 +355,69 @@ class ReportGenerator:
         if not recommendations:
             recommendations.append("Continue monitoring for new Shadow IT usage")
         
-        html = """
+        out.write("""
         <div class="section">
             <h2>📋 Recommendations</h2>
             <ul>
-        """
-        
+""")
         for rec in recommendations:
-            html += f"<li>{rec}</li>"
-        
-        html += """
-            </ul>
+            out.write(f"<li>{escape(rec)}</li>\n")
+        out.write("""            </ul>
         </div>
-        """
+""")
+    
+    def generate_csv_report(self, findings: Dict[str, Any], filename: str = None, compression: str = None) -> str:
+        """Generate CSV report, streamed row by row and optionally compressed"""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"shadowit_report_{timestamp}.csv{COMPRESSED_SUFFIXES.get(compression, '')}"
         
-        return html
+        filepath = self.report_dir / filename
+        write_csv(CSV_HEADER, iter_csv_rows(findings), str(filepath), compression)
+        return str(filepath)
     
-    def generate_csv_report(self, findings: Dict[str, Any], filename: str = None) -> str:
-        """Generate CSV report"""
+    def generate_ndjson_report(self, findings: Dict[str, Any], filename: str = None, compression: str = None) -> str:
+        """Generate NDJSON report: one finding per line, optionally compressed"""
         if filename is None:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"shadowit_report_{timestamp}.csv"
+            filename = f"shadowit_report_{timestamp}.ndjson{COMPRESSED_SUFFIXES.get(compression, '')}"
         
         filepath = self.report_dir / filename
+        write_ndjson(iter_finding_records(findings), str(filepath), compression)
+        return str(filepath)
+    
+    def generate_columnar_report(self, findings: Dict[str, Any], filename: str = None,
+                                 fmt: str = None) -> Dict[str, str]:
+        """Generate Parquet or Arrow IPC files, one per finding type; returns type -> path"""
+        fmt = fmt or self.config.report_config.columnar_format
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"shadowit_report_{timestamp}{COLUMNAR_FORMATS.get(fmt, '')}"
         
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Write header
-            writer.writerow(['Type', 'Service/Application', 'Risk Level', 'Category', 'Details', 'Source'])
-            
-            # Write network findings
-            for finding in findings.get('network_findings', []):
-                writer.writerow([
-                    'Network Connection',
-                    finding.get('saas_domain', 'Unknown'),
-                    finding.get('risk_level', 'low'),
-                    finding.get('category', 'Unknown'),
-                    f"Remote: {finding.get('raddr', 'Unknown')}",
-                    'Network Scanner'
-                ])
-            
-            # Write endpoint findings
-            for finding in findings.get('endpoint_findings', []):
-                writer.writerow([
-                    'Application',
-                    finding.get('name', 'Unknown'),
-                    finding.get('risk_level', 'low'),
-                    finding.get('category', 'Unknown'),
-                    f"PID: {finding.get('pid', 'Unknown')}",
-                    'Endpoint Scanner'
-                ])
-            
-            # Write browser findings
-            for ext in findings.get('browser_findings', {}).get('extensions', []):
-                writer.writerow([
-                    'Browser Extension',
-                    ext.get('name', 'Unknown'),
-                    'low',  # Default risk for extensions
-                    'Browser',
-                    f"Browser: {ext.get('browser', 'Unknown')}",
-                    'Browser Scanner'
-                ])
+        writer = ColumnarWriter(self.report_dir / filename, fmt,
+                                row_group_size=self.config.report_config.columnar_row_group_size)
+        with writer:
+            writer.write_records(iter_finding_records(findings))
+        return writer.paths
+    
+    def generate_delta_report(self, delta: FindingDelta, since: str, filename: str = None) -> str:
+        """Generate JSON report of new, resolved and changed findings (see delta.delta_since)"""
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"shadowit_delta_{timestamp}.json"
+        
+        filepath = self.report_dir / filename
+        report_data = {
+            'metadata': {
+                'generated_at': datetime.now().isoformat(),
+                'version': '1.0',
+                'since': str(since)
+            },
+            **delta.to_dict()
+        }
+        
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(report_data, f, indent=2, default=str)
         
         return str(filepath)
     
@@ -489,7 +454,7 @@ class ReportGenerator:
         
         cutoff_date = datetime.now().timestamp() - (self.config.report_config.report_retention_days * 24 * 3600)
         
-        for file_path in self.report_dir.glob("shadowit_report_*"):
+        for file_path in chain(self.report_dir.glob("shadowit_report_*"), self.report_dir.glob("shadowit_delta_*")):
             if file_path.stat().st_mtime < cutoff_date:
                 try:
                     file_path.unlink()
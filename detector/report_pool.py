@@ -0,0 +1,187 @@
+import mmap
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .columnar_export import COLUMNAR_FORMATS
+from .exports import COMPRESSED_SUFFIXES
+from .report_generator import ReportGenerator
+
+# Report format -> ReportGenerator method
+RENDERERS = {
+    'html': 'generate_html_report',
+    'csv': 'generate_csv_report',
+    'json': 'generate_json_report',
+    'ndjson': 'generate_ndjson_report',
+    'parquet': 'generate_columnar_report',
+    'arrow': 'generate_columnar_report',
+}
+
+# Last snapshot a worker loaded; jobs for the same scan reuse it
+_loaded_snapshot: Dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class ReportJob:
+    """One report to render: its format, file name and options"""
+    fmt: str
+    filename: Optional[str] = None
+    compression: Optional[str] = None
+    label: str = ''
+
+    @property
+    def title(self) -> str:
+        return self.label or f"{self.fmt.upper()} report"
+
+
+def auto_report_jobs(report_config, prefix: str = 'auto_report') -> List[ReportJob]:
+    """Jobs for the report formats enabled in the report configuration"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    compression = report_config.export_compression or None
+    suffix = COMPRESSED_SUFFIXES.get(compression, '')
+    jobs = []
+    for enabled, fmt, filename in [
+        (report_config.enable_html_reports, 'html', f"{prefix}_{timestamp}.html"),
+        (report_config.enable_csv_reports, 'csv', f"{prefix}_{timestamp}.csv{suffix}"),
+        (report_config.enable_ndjson_reports, 'ndjson', f"{prefix}_{timestamp}.ndjson{suffix}"),
+        (report_config.enable_columnar_reports, report_config.columnar_format,
+         f"{prefix}_{timestamp}{COLUMNAR_FORMATS.get(report_config.columnar_format, '')}")
+    ]:
+        if enabled:
+            jobs.append(ReportJob(fmt, filename, compression, f"Auto-generated {fmt.upper()} report"))
+    return jobs
+
+
+def finding_count(findings: Dict) -> int:
+    """Number of finding records in a findings dict"""
+    browser_findings = findings.get('browser_findings') or {}
+    return (len(findings.get('network_findings', [])) + len(findings.get('endpoint_findings', [])) +
+            sum(len(browser_findings.get(kind, [])) for kind in ('extensions', 'bookmarks', 'history')))
+
+
+def freeze_findings(findings: Dict, directory) -> str:
+    """Serialize findings once into a read-only snapshot file; returns its path"""
+    fd, path = tempfile.mkstemp(prefix='.findings_', suffix='.snapshot', dir=str(directory))
+    with os.fdopen(fd, 'wb') as f:
+        pickle.dump(findings, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def load_snapshot(path: str) -> Dict:
+    """Unpickle a snapshot straight from a read-only memory map of the file"""
+    if path not in _loaded_snapshot:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            findings = pickle.loads(view)
+        _loaded_snapshot.clear()
+        _loaded_snapshot[path] = findings
+    return _loaded_snapshot[path]
+
+
+def render_report(config, findings: Dict, job: ReportJob):
+    """Render one report with a ReportGenerator; returns its path(s)"""
+    generator = ReportGenerator(config)
+    method = getattr(generator, RENDERERS[job.fmt])
+    if job.fmt in ('parquet', 'arrow'):
+        return method(findings, job.filename, job.fmt)
+    if job.fmt in ('csv', 'ndjson'):
+        return method(findings, job.filename, job.compression)
+    return method(findings, job.filename)
+
+
+def _render_snapshot(config, snapshot_path: str, job: ReportJob):
+    # Runs in a worker process
+    return render_report(config, load_snapshot(snapshot_path), job)
+
+
+class ReportPool:
+    """Renders several report formats concurrently from one frozen snapshot
+
+    submit() serializes the findings once to a snapshot file in the report
+    directory and returns straight away; worker processes map that file and
+    render one format each, so the caller (a scan, the monitor) is free to
+    mutate its findings or start the next scan. The snapshot is removed once
+    every job has finished. Workers are spawned rather than forked, as the
+    monitor runs scanner threads. With `workers` 0, a single job, or fewer
+    than `report_pool_min_findings` findings, reports render inline, as
+    starting the workers would cost more than it saves.
+    """
+
+    def __init__(self, config, workers: Optional[int] = None):
+        self.config = config
+        self.workers = config.report_config.report_workers if workers is None else workers
+        self.min_findings = config.report_config.report_pool_min_findings
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, findings: Dict, jobs: List[ReportJob]) -> Future:
+        """Start rendering; the future resolves to [(job, path(s) or exception)] in job order"""
+        done = Future()
+        if not jobs:
+            done.set_result([])
+            return done
+
+        if self.workers <= 0 or len(jobs) == 1 or finding_count(findings) < self.min_findings:
+            results = []
+            for job in jobs:
+                try:
+                    results.append((job, render_report(self.config, findings, job)))
+                except Exception as e:
+                    results.append((job, e))
+            done.set_result(results)
+            return done
+
+        report_dir = ReportGenerator(self.config).report_dir
+        snapshot = freeze_findings(findings, report_dir)
+        executor = self._get_executor()
+        futures = [executor.submit(_render_snapshot, self.config, snapshot, job) for job in jobs]
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def finished(_):
+            with lock:
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                os.remove(snapshot)
+            except OSError:
+                pass
+            if any(isinstance(future.exception(), BrokenProcessPool) for future in futures):
+                # A worker died; start a fresh pool for the next submit
+                self._discard_executor(executor)
+            done.set_result([(job, future.exception() or future.result())
+                             for job, future in zip(jobs, futures)])
+
+        for future in futures:
+            future.add_done_callback(finished)
+        return done
+
+    def generate(self, findings: Dict, jobs: List[ReportJob]) -> List[Tuple[ReportJob, Any]]:
+        """Render and wait for every report"""
+        return self.submit(findings, jobs).result()
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
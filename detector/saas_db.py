@@ -10,4 +10,21 @@ def load_saas_domains(csv_path=None):
         for row in reader:
             if row and not row[0].startswith('#'):
                 saas_domains.add(row[0].strip().lower())
-    return saas_domains 
\ No newline at end of file
+    return saas_domains
+
+
+def load_saas_catalog(csv_path=None):
+    """Load the SaaS catalog as domain -> {category, risk_level, description}"""
+    if csv_path is None:
+        csv_path = os.path.join(os.path.dirname(__file__), '../data/saas_services.csv')
+    catalog = {}
+    with open(csv_path, newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        for row in reader:
+            if row and not row[0].startswith('#'):
+                catalog[row[0].strip().lower()] = {
+                    'category': row[1].strip() if len(row) > 1 else 'unknown',
+                    'risk_level': row[2].strip().lower() if len(row) > 2 else 'medium',
+                    'description': row[3].strip() if len(row) > 3 else ''
+                }
+    return catalog
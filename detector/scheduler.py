@@ -0,0 +1,268 @@
+import heapq
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .deadline import Deadline, ScanTimeout, deadline_scope
+
+OVERLAP_POLICIES = ('skip', 'coalesce')
+
+
+@dataclass
+class ScanJob:
+    """A periodic scan owned by a ScanScheduler"""
+    name: str
+    func: Callable
+    interval: float
+    jitter: float = 0.0
+    overlap: str = 'skip'  # skip, coalesce
+    next_run: float = 0.0
+    running: bool = False
+    pending: bool = False
+    runs: int = 0
+    skipped: int = 0
+    coalesced: int = 0
+    last_duration: Optional[float] = None
+    last_error: Optional[str] = None
+    base_run: float = 0.0
+    version: int = 0
+    # Called with each run's result; returns the interval until the next run
+    interval_policy: Optional[Callable[[Any], float]] = None
+    # Runs are cancelled cooperatively after `timeout` seconds and abandoned after twice that
+    timeout: Optional[float] = None
+    timeouts: int = 0
+    restarts: int = 0
+    started_at: float = 0.0
+    deadline: Optional[Deadline] = None
+    generation: int = 0
+
+
+class ScanScheduler:
+    """Deadline-heap scheduler that runs each scan job on its own worker
+
+    The dispatcher doubles as a watchdog: a run that outlives its timeout
+    is asked to stop, and one that ignores that is abandoned so the job
+    gets a fresh worker thread on its next run.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._jobs: Dict[str, ScanJob] = {}
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    def add_job(self, name: str, func: Callable, interval: float, jitter: float = 0.0,
+                overlap: str = 'skip', run_immediately: bool = True,
+                interval_policy: Optional[Callable[[Any], float]] = None,
+                timeout: Optional[float] = None) -> ScanJob:
+        """Register a periodic job; the first run is spread by up to `jitter` seconds"""
+        if overlap not in OVERLAP_POLICIES:
+            raise ValueError(f"Unknown overlap policy: {overlap}")
+
+        job = ScanJob(name=name, func=func, interval=float(interval), jitter=float(jitter), overlap=overlap,
+                      interval_policy=interval_policy, timeout=timeout)
+        job.base_run = self.clock() + (0.0 if run_immediately else job.interval)
+        with self._cond:
+            self._jobs[name] = job
+            self._push(job, job.base_run + self._jitter(job))
+        return job
+
+    def run_now(self, name: str):
+        """Move a job's next deadline to now"""
+        with self._cond:
+            job = self._jobs[name]
+            job.base_run = self.clock()
+            self._push(job, job.base_run)
+
+    def start(self):
+        """Start the dispatcher thread"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._loop, name='scan-scheduler', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Stop dispatching and ask running jobs to cancel"""
+        with self._cond:
+            self._running = False
+            for job in self._jobs.values():
+                if job.running and job.deadline is not None:
+                    job.deadline.cancel()
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=timeout)
+
+    @property
+    def is_running(self) -> bool:
+        return self._running
+
+    def get_status(self) -> Dict[str, Dict]:
+        """Get per-job scheduling state"""
+        now = self.clock()
+        with self._cond:
+            return {
+                name: {
+                    'interval': job.interval,
+                    'next_run_in': max(0.0, job.next_run - now),
+                    'running': job.running,
+                    'runs': job.runs,
+                    'skipped': job.skipped,
+                    'coalesced': job.coalesced,
+                    'last_duration': job.last_duration,
+                    'last_error': job.last_error,
+                    'timeout': job.timeout,
+                    'timeouts': job.timeouts,
+                    'restarts': job.restarts
+                }
+                for name, job in self._jobs.items()
+            }
+
+    def _jitter(self, job: ScanJob) -> float:
+        return random.uniform(0, job.jitter) if job.jitter > 0 else 0.0
+
+    def _push(self, job: ScanJob, deadline: float):
+        """Schedule a job's next run; older heap entries for it become stale"""
+        job.version += 1
+        job.next_run = deadline
+        self._seq += 1
+        heapq.heappush(self._heap, (deadline, self._seq, job.name, job.version))
+        self._cond.notify_all()
+
+    def _loop(self):
+        with self._cond:
+            while self._running:
+                now = self.clock()
+                wake = self._watchdog(now)
+                if self._heap:
+                    deadline, _, name, version = self._heap[0]
+                    job = self._jobs.get(name)
+                    if job is None or version != job.version:
+                        heapq.heappop(self._heap)
+                        continue
+
+                    if deadline <= now:
+                        heapq.heappop(self._heap)
+                        self._dispatch(job)
+                        # Jitter offsets each deadline without accumulating into the base period
+                        job.base_run = max(job.base_run + job.interval, self.clock())
+                        self._push(job, job.base_run + self._jitter(job))
+                        continue
+                    wake = deadline if wake is None else min(wake, deadline)
+
+                # Sleep precisely until the earliest deadline, or until woken by a change
+                self._cond.wait(None if wake is None else wake - now)
+
+    def _watchdog(self, now: float) -> Optional[float]:
+        """Cancel overdue runs, abandon wedged ones; returns the next time to check"""
+        wake = None
+        for job in self._jobs.values():
+            if not job.running or job.timeout is None:
+                continue
+
+            expires = job.started_at + job.timeout
+            if now >= expires and not job.deadline.cancelled:
+                job.deadline.cancel()
+                job.timeouts += 1
+                job.last_error = f"timed out after {job.timeout}s"
+                print(f"{job.name} scan timed out after {job.timeout}s, cancelling")
+
+            if now >= expires + job.timeout:
+                # The run ignored cancellation; leave its thread behind
+                job.generation += 1
+                job.running = False
+                job.pending = False
+                job.restarts += 1
+                print(f"{job.name} scan is not responding, restarting its worker")
+                continue
+
+            check_at = expires if now < expires else expires + job.timeout
+            wake = check_at if wake is None else min(wake, check_at)
+        return wake
+
+    def _dispatch(self, job: ScanJob):
+        """Hand a due job to a worker, honoring its overlap policy"""
+        if job.running:
+            if job.overlap == 'coalesce':
+                if job.pending:
+                    job.coalesced += 1
+                job.pending = True
+            else:
+                job.skipped += 1
+            return
+
+        job.running = True
+        self._begin_run(job)
+        # Daemon threads, so an abandoned run can never block shutdown
+        threading.Thread(target=self._run_job, args=(job, job.generation),
+                         name=f"scan-{job.name}", daemon=True).start()
+
+    def _begin_run(self, job: ScanJob):
+        job.started_at = self.clock()
+        job.deadline = Deadline(job.timeout, self.clock)
+        self._cond.notify_all()
+
+    def _run_job(self, job: ScanJob, generation: int):
+        while True:
+            with self._cond:
+                deadline = job.deadline
+            started = self.clock()
+            result = None
+            error = None
+            timed_out = False
+            try:
+                with deadline_scope(deadline):
+                    result = job.func()
+            except ScanTimeout as e:
+                error = str(e)
+                timed_out = True
+            except Exception as e:
+                error = str(e)
+                print(f"Error in {job.name} scan: {e}")
+            finally:
+                duration = self.clock() - started
+
+            with self._cond:
+                if generation != job.generation:
+                    # Abandoned by the watchdog; a newer worker owns the job now
+                    return
+                if timed_out and not deadline.cancelled:
+                    # The scan noticed its deadline before the watchdog did
+                    deadline.cancel()
+                    job.timeouts += 1
+                job.last_error = error
+            interval = self._next_interval(job, result)
+            with self._cond:
+                job.runs += 1
+                job.last_duration = duration
+                if interval is not None and interval != job.interval:
+                    self._reschedule(job, interval)
+                if job.pending and self._running:
+                    # A run was requested while this one was in progress
+                    job.pending = False
+                    self._begin_run(job)
+                    continue
+                job.running = False
+                return
+
+    def _next_interval(self, job: ScanJob, result) -> Optional[float]:
+        if job.interval_policy is None:
+            return None
+        try:
+            return float(job.interval_policy(result))
+        except Exception as e:
+            print(f"Error in {job.name} interval policy: {e}")
+            return None
+
+    def _reschedule(self, job: ScanJob, interval: float):
+        """Apply a new interval to the deadline that is already queued"""
+        job.base_run += interval - job.interval
+        job.interval = interval
+        if self._running:
+            self._push(job, max(job.base_run, self.clock()) + self._jitter(job))
@@ -0,0 +1,176 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+
+def finding_fingerprint(source: str, finding: Dict) -> str:
+    """Stable identity of a finding that survives restarts
+
+    Pids and local (ephemeral) ports change on every restart or reconnect,
+    so they are never part of the fingerprint. Neither are remote IPs (or
+    their reverse DNS names), which rotate across a service's CDN nodes;
+    a network finding is the SaaS service and the remote port.
+    """
+    if source == 'network':
+        remote_port = (finding.get('raddr', '') or '').rpartition(':')[2]
+        return f"network|{finding.get('saas_domain', '')}|{remote_port}"
+    if source == 'endpoint':
+        return f"endpoint|{(finding.get('name') or '').lower()}|{finding.get('exe') or ''}"
+    if source == 'browser':
+        return f"browser|{finding.get('browser', '')}|{finding.get('id', '')}"
+    if source == 'bookmarks':
+        return f"bookmarks|{finding.get('browser', '')}|{finding.get('saas_domain', '')}"
+    if source == 'apps':
+        return f"apps|{finding.get('path', '')}"
+    raise ValueError(f"Unknown finding source: {source}")
+
+
+def fingerprint_part(fingerprint: str, index: int) -> str:
+    """Return one field of a fingerprint (0 is the source)"""
+    parts = fingerprint.split('|', 2)
+    return parts[index] if index < len(parts) else ''
+
+
+class FindingStateStore:
+    """Durable record of the findings the monitor has seen (SQLite, WAL mode)
+
+    Findings not seen for `retention_seconds` are pruned, so the store does
+    not grow without bound and a finding that comes back later is new again.
+    """
+
+    # Seconds between automatic prunes
+    prune_interval = 3600.0
+
+    def __init__(self, db_path: str, batch_size: int = 500, flush_interval: float = 5.0,
+                 retention_seconds: Optional[float] = None):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_seconds = retention_seconds
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS findings (
+                fingerprint TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                seen_count INTEGER NOT NULL
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+
+        # fingerprint -> [source, first_seen, last_seen, seen_count]
+        self._known: Dict[str, list] = {}
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._last_flush = time.monotonic()
+        self._last_prune = time.monotonic()
+        self._load()
+        if retention_seconds:
+            self.prune(retention_seconds)
+
+    def _load(self):
+        """Load every known finding in a single pass"""
+        for fingerprint, source, first_seen, last_seen, seen_count in self._conn.execute(
+                "SELECT fingerprint, source, first_seen, last_seen, seen_count FROM findings"):
+            self._known[fingerprint] = [source, first_seen, last_seen, seen_count]
+
+    def __len__(self) -> int:
+        return len(self._known)
+
+    def is_known(self, fingerprint: str) -> bool:
+        return fingerprint in self._known
+
+    def get(self, fingerprint: str) -> Optional[Dict]:
+        """Get first_seen, last_seen and seen_count for a finding"""
+        with self._lock:
+            entry = self._known.get(fingerprint)
+            if entry is None:
+                return None
+            source, first_seen, last_seen, seen_count = entry
+            return {'source': source, 'first_seen': first_seen, 'last_seen': last_seen, 'seen_count': seen_count}
+
+    def fingerprints(self, source: Optional[str] = None, since: Optional[float] = None) -> set:
+        """Get the fingerprints of known findings, optionally for one source or last seen since a time"""
+        with self._lock:
+            return {
+                fp for fp, entry in self._known.items()
+                if (source is None or entry[0] == source) and (since is None or entry[2] >= since)
+            }
+
+    def record(self, source: str, fingerprints: Iterable[str], now: Optional[float] = None):
+        """Record that findings were seen; writes are batched"""
+        now = time.time() if now is None else now
+        with self._lock:
+            for fingerprint in fingerprints:
+                entry = self._known.get(fingerprint)
+                if entry is None:
+                    self._known[fingerprint] = [source, now, now, 1]
+                else:
+                    entry[2] = now
+                    entry[3] += 1
+                self._pending[fingerprint] = (source, now)
+
+            due = (len(self._pending) >= self.batch_size or
+                   time.monotonic() - self._last_flush >= self.flush_interval)
+            prune_due = (self.retention_seconds and
+                         time.monotonic() - self._last_prune >= self.prune_interval)
+        if due:
+            self.flush()
+        if prune_due:
+            self.prune(self.retention_seconds)
+
+    def prune(self, max_age: float, now: Optional[float] = None) -> int:
+        """Forget findings last seen more than max_age seconds ago; returns how many"""
+        self.flush()
+        cutoff = (time.time() if now is None else now) - max_age
+        with self._lock:
+            self._last_prune = time.monotonic()
+            stale = [fp for fp, entry in self._known.items() if entry[2] < cutoff]
+            for fingerprint in stale:
+                del self._known[fingerprint]
+            try:
+                with self._conn:
+                    self._conn.execute("DELETE FROM findings WHERE last_seen < ?", (cutoff,))
+            except sqlite3.Error as e:
+                print(f"Failed to prune monitor state: {e}")
+        return len(stale)
+
+    def flush(self):
+        """Write pending updates in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(fp, self._known[fp][0], self._known[fp][1], self._known[fp][2], self._known[fp][3])
+                    for fp in self._pending]
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+            try:
+                with self._conn:
+                    self._conn.executemany("""
+                        INSERT INTO findings (fingerprint, source, first_seen, last_seen, seen_count)
+                        VALUES (?, ?, ?, ?, ?)
+                        ON CONFLICT (fingerprint) DO UPDATE SET
+                            last_seen = excluded.last_seen,
+                            seen_count = excluded.seen_count
+                    """, rows)
+            except sqlite3.Error as e:
+                print(f"Failed to write monitor state: {e}")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def state_db_path(config) -> str:
+    """Path of the monitor state database for a configuration"""
+    return os.path.join(config.scan_config.state_directory, 'monitor_state.db')
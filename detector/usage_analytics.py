@@ -0,0 +1,254 @@
+import os
+import shutil
+import sqlite3
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from .deadline import check_deadline, remaining_time
+
+# Chrome stores timestamps as microseconds since 1601-01-01
+WEBKIT_EPOCH_OFFSET_US = 11644473600 * 1000000
+
+SECONDS_PER_DAY = 86400
+
+# Caps applied when estimating how long a visit kept the user on a service
+MAX_VISIT_SECONDS = 1800
+IDLE_GAP_SECONDS = 300
+DEFAULT_VISIT_SECONDS = 30
+
+
+class UsageRollupStore:
+    """Compact SQLite store of per-service, per-day browser usage rollups"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._create_schema()
+
+    def _connect(self) -> sqlite3.Connection:
+        # A locked database must not hold a scan past its deadline
+        return sqlite3.connect(self.db_path, timeout=remaining_time(10))
+
+    def _create_schema(self):
+        conn = self._connect()
+        try:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS usage_rollups (
+                    day INTEGER NOT NULL,
+                    service TEXT NOT NULL,
+                    browser TEXT NOT NULL,
+                    visits INTEGER NOT NULL,
+                    active_seconds INTEGER NOT NULL,
+                    PRIMARY KEY (day, service, browser)
+                ) WITHOUT ROWID;
+                CREATE TABLE IF NOT EXISTS usage_watermarks (
+                    source TEXT PRIMARY KEY,
+                    last_visit_time INTEGER NOT NULL
+                );
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_watermark(self, source: str) -> int:
+        """Get the last visit time already rolled up for a history source"""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT last_visit_time FROM usage_watermarks WHERE source = ?", (source,)
+            ).fetchone()
+            return row[0] if row else 0
+        finally:
+            conn.close()
+
+    def apply(self, source: str, rollups: Dict[Tuple[int, str, str], List[int]], watermark: int):
+        """Merge new rollups and advance the source watermark in one transaction"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO usage_rollups (day, service, browser, visits, active_seconds)
+                    VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (day, service, browser) DO UPDATE SET
+                        visits = visits + excluded.visits,
+                        active_seconds = active_seconds + excluded.active_seconds
+                """, [(day, service, browser, totals[0], totals[1])
+                      for (day, service, browser), totals in rollups.items()])
+                conn.execute("""
+                    INSERT INTO usage_watermarks (source, last_visit_time) VALUES (?, ?)
+                    ON CONFLICT (source) DO UPDATE SET last_visit_time = excluded.last_visit_time
+                """, (source, watermark))
+        finally:
+            conn.close()
+
+    def prune(self, retention_days: int, today: Optional[int] = None):
+        """Drop rollups older than the retention window"""
+        today = _today() if today is None else today
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM usage_rollups WHERE day < ?", (today - retention_days + 1,))
+        finally:
+            conn.close()
+
+    def trends(self, days: int = 90, today: Optional[int] = None) -> Dict[str, Dict]:
+        """Get per-service totals and daily series for the last `days` days"""
+        today = _today() if today is None else today
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT service, day, SUM(visits), SUM(active_seconds)
+                FROM usage_rollups
+                WHERE day >= ?
+                GROUP BY service, day
+                ORDER BY service, day
+            """, (today - days + 1,)).fetchall()
+        finally:
+            conn.close()
+
+        trends = {}
+        for service, day, visits, active_seconds in rows:
+            trend = trends.setdefault(service, {'visits': 0, 'active_seconds': 0, 'daily': []})
+            trend['visits'] += visits
+            trend['active_seconds'] += active_seconds
+            trend['daily'].append({
+                'date': _day_to_date(day),
+                'visits': visits,
+                'active_seconds': active_seconds
+            })
+        return trends
+
+
+class BrowserUsageScanner:
+    """Rolls browser visit tables up into per-service daily usage"""
+
+    def __init__(self, browser_scanner, store: UsageRollupStore):
+        self.browser_scanner = browser_scanner
+        self.store = store
+
+    def scan(self) -> int:
+        """Roll up visits recorded since the last scan; returns visits processed"""
+        processed = 0
+
+        for browser, paths in self.browser_scanner.browser_paths.items():
+            history_path = paths.get('history')
+            if not history_path or not os.path.exists(history_path):
+                continue
+            check_deadline()
+
+            try:
+                if browser in ['chrome', 'edge']:
+                    processed += self._scan_source(browser, history_path, self._chrome_visits)
+                elif browser == 'firefox':
+                    for profile_dir in os.listdir(history_path):
+                        if profile_dir.endswith('.default') or profile_dir.endswith('.default-release'):
+                            places_path = os.path.join(history_path, profile_dir, 'places.sqlite')
+                            if os.path.exists(places_path):
+                                processed += self._scan_source(browser, places_path, self._firefox_visits)
+            except Exception as e:
+                print(f"Error scanning {browser} usage: {e}")
+
+        return processed
+
+    def _scan_source(self, browser: str, db_path: str, read_visits) -> int:
+        source = f"{browser}:{db_path}"
+        watermark = self.store.get_watermark(source)
+
+        # Create a copy to avoid database lock issues
+        temp_path = db_path + '.usage.temp'
+        shutil.copy2(db_path, temp_path)
+        try:
+            conn = sqlite3.connect(temp_path)
+            try:
+                rollups, new_watermark, processed = self._rollup(browser, read_visits(conn, watermark))
+            finally:
+                conn.close()
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        if processed:
+            self.store.apply(source, rollups, max(watermark, new_watermark))
+        return processed
+
+    def _rollup(self, browser: str, visits):
+        """Aggregate (raw_time, unix_seconds, duration_seconds, url) visit rows"""
+        rollups = {}
+        host_cache = {}
+        watermark = 0
+        processed = 0
+        pending = None  # Firefox visits wait for the next visit to estimate their duration
+
+        for raw_time, unix_seconds, duration, url in visits:
+            watermark = raw_time
+            processed += 1
+
+            if pending is not None:
+                gap = max(0, unix_seconds - pending[0])
+                self._add(rollups, browser, pending[0], pending[1], min(gap, IDLE_GAP_SECONDS))
+                pending = None
+
+            if url not in host_cache:
+                saas_match = self.browser_scanner._match_saas_url(url)
+                host_cache[url] = saas_match['saas_domain'] if saas_match else None
+            service = host_cache[url]
+            if not service:
+                continue
+
+            if duration is None:
+                pending = (unix_seconds, service)
+            else:
+                self._add(rollups, browser, unix_seconds, service,
+                          min(duration, MAX_VISIT_SECONDS) if duration else DEFAULT_VISIT_SECONDS)
+
+        if pending is not None:
+            self._add(rollups, browser, pending[0], pending[1], DEFAULT_VISIT_SECONDS)
+
+        return rollups, watermark, processed
+
+    @staticmethod
+    def _add(rollups: Dict, browser: str, unix_seconds: int, service: str, active_seconds: int):
+        totals = rollups.setdefault((unix_seconds // SECONDS_PER_DAY, service, browser), [0, 0])
+        totals[0] += 1
+        totals[1] += int(active_seconds)
+
+    @staticmethod
+    def _chrome_visits(conn: sqlite3.Connection, watermark: int):
+        cursor = conn.execute("""
+            SELECT visits.visit_time, visits.visit_duration, urls.url
+            FROM visits
+            JOIN urls ON visits.url = urls.id
+            WHERE visits.visit_time > ?
+            ORDER BY visits.visit_time
+        """, (watermark,))
+        for visit_time, visit_duration, url in cursor:
+            yield (visit_time, (visit_time - WEBKIT_EPOCH_OFFSET_US) // 1000000,
+                   (visit_duration or 0) // 1000000, url or '')
+
+    @staticmethod
+    def _firefox_visits(conn: sqlite3.Connection, watermark: int):
+        cursor = conn.execute("""
+            SELECT moz_historyvisits.visit_date, moz_places.url
+            FROM moz_historyvisits
+            JOIN moz_places ON moz_historyvisits.place_id = moz_places.id
+            WHERE moz_historyvisits.visit_date > ?
+            ORDER BY moz_historyvisits.visit_date
+        """, (watermark,))
+        # Firefox has no visit duration; it is estimated from the gap to the next visit
+        for visit_date, url in cursor:
+            yield visit_date, visit_date // 1000000, None, url or ''
+
+
+def usage_db_path(config) -> str:
+    """Path of the usage rollup database for a configuration"""
+    return os.path.join(config.scan_config.state_directory, 'usage_rollups.db')
+
+
+def _today() -> int:
+    return int(datetime.now(timezone.utc).timestamp()) // SECONDS_PER_DAY
+
+
+def _day_to_date(day: int) -> str:
+    return datetime.fromtimestamp(day * SECONDS_PER_DAY, timezone.utc).date().isoformat()
@@ -6,6 +6,13 @@ from typing import Dict, List
 import threading
 import time
 
+from .usage_analytics import UsageRollupStore, usage_db_path
+from .event_bus import AlertEvent
+from .delta import delta_since
+from .state_store import state_db_path
+
+DASHBOARD_ALERT_LIMIT = 200
+
 class WebDashboard:
     """Web dashboard for Shadow IT detection monitoring"""
     
@@ -27,6 +34,17 @@ class WebDashboard:
             }
         }
         self.setup_routes()
+        
+        # Live alerts arrive on the monitor's event bus
+        event_bus = getattr(real_time_monitor, 'event_bus', None) if real_time_monitor else None
+        if event_bus is not None:
+            event_bus.subscribe('dashboard', self._on_alert_event, AlertEvent)
+    
+    def _on_alert_event(self, event: AlertEvent):
+        """Keep the most recent alerts for the dashboard"""
+        alerts = self.dashboard_data['alerts']
+        alerts.append(event.alert.__dict__)
+        del alerts[:-DASHBOARD_ALERT_LIMIT]
     
     def setup_routes(self):
         """Setup Flask routes"""
@@ -45,7 +63,81 @@ class WebDashboard:
         
         @self.app.route('/api/alerts')
         def get_alerts():
-            return jsonify(self.dashboard_data['alerts'])
+            if not self.alert_manager:
+                return jsonify(self.dashboard_data['alerts'])
+            
+            filters = {name: request.args[name] for name in ('severity', 'source', 'service') if request.args.get(name)}
+            for name in ('since', 'until'):
+                if request.args.get(name):
+                    try:
+                        filters[name] = datetime.fromisoformat(request.args[name])
+                    except ValueError:
+                        return jsonify({'error': f"Invalid {name} timestamp, expected ISO 8601"}), 400
+            result = self.alert_manager.get_alerts(
+                page=request.args.get('page', 1, type=int),
+                page_size=min(request.args.get('page_size', 50, type=int), 500),
+                **filters
+            )
+            result['alerts'] = [alert.__dict__ for alert in result['alerts']]
+            return jsonify(result)
+        
+        @self.app.route('/api/alerts/summary')
+        def get_alerts_summary():
+            if not self.alert_manager:
+                return jsonify({})
+            return jsonify(self.alert_manager.get_alerts_summary())
+        
+        @self.app.route('/api/incidents')
+        def get_incidents():
+            incidents = getattr(self.real_time_monitor, 'incidents', None)
+            if incidents is None:
+                return jsonify({'incidents': []})
+            page = max(1, request.args.get('page', 1, type=int))
+            page_size = min(request.args.get('page_size', 50, type=int), 500)
+            matches = incidents.query(
+                service=request.args.get('service'),
+                host=request.args.get('host'),
+                min_severity=request.args.get('min_severity'),
+                limit=page_size,
+                offset=(page - 1) * page_size
+            )
+            return jsonify({
+                'page': page,
+                'page_size': page_size,
+                'open': len(incidents),
+                'incidents': [incident.to_dict() for incident in matches]
+            })
+        
+        @self.app.route('/api/incidents/<int:incident_id>')
+        def get_incident(incident_id):
+            incidents = getattr(self.real_time_monitor, 'incidents', None)
+            incident = incidents.get(incident_id) if incidents is not None else None
+            if incident is None:
+                return jsonify({'error': 'Incident not found'}), 404
+            return jsonify(incident.to_dict())
+        
+        @self.app.route('/api/delta')
+        def get_delta():
+            # Only reports in the report directory, or 'state' for the monitor state database
+            since = request.args.get('since', 'state')
+            if since == 'state':
+                path = state_db_path(self.config)
+            else:
+                path = os.path.join(self.config.report_config.report_directory, os.path.basename(since))
+            if not os.path.isfile(path):
+                return jsonify({'error': 'Baseline not found'}), 404
+            findings = self._current_findings()
+            if not findings:
+                return jsonify({'error': 'No current scan to compare'}), 409
+            limit = min(request.args.get('limit', 500, type=int), 5000)
+            delta = delta_since(findings, path)
+            return jsonify({'since': since, **delta.to_dict(limit)})
+        
+        @self.app.route('/api/usage-trends')
+        def get_usage_trends():
+            days = request.args.get('days', self.config.scan_config.usage_retention_days, type=int)
+            store = UsageRollupStore(usage_db_path(self.config))
+            return jsonify(store.trends(days))
         
         @self.app.route('/api/start-monitoring', methods=['POST'])
         def start_monitoring():
@@ -82,6 +174,12 @@ class WebDashboard:
                     'security': self.config.security_config.__dict__
                 })
     
+    def _current_findings(self) -> Dict:
+        """The monitor's current findings, or the last scan pushed to the dashboard"""
+        if self.real_time_monitor is not None and hasattr(self.real_time_monitor, 'findings_snapshot'):
+            return self.real_time_monitor.findings_snapshot()
+        return self.dashboard_data['findings']
+    
     def update_dashboard_data(self, findings: Dict, alerts: List):
         """Update dashboard data with new findings and alerts"""
         self.dashboard_data['findings'] = findings
@@ -53,6 +53,15 @@ setup(
         "monitoring": [
             "schedule>=1.2",
         ],
+        "streaming": [
+            "ijson>=3.1",
+        ],
+        "zstd": [
+            "zstandard>=0.21",
+        ],
+        "columnar": [
+            "pyarrow>=12.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -9,6 +9,12 @@ import os
 import sys
 from unittest.mock import Mock, patch, MagicMock
 import json
+import time
+import gzip
+import http.server
+import socketserver
+import threading
+from datetime import datetime, timedelta
 
 # Add the parent directory to the path so we can import the detector module
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -18,7 +24,38 @@ from detector.network_scanner import get_active_connections, match_saas_connecti
 from detector.endpoint_scanner import get_running_processes, get_installed_apps
 from detector.config import ConfigManager
 from detector.alert_manager import AlertManager, Alert
+from detector.alert_store import AlertStore, WindowCounter
+from detector.incidents import IncidentCorrelator
+from detector.dispatch_queue import PriorityDispatcher, percentile
+from detector.report_generator import ReportGenerator
+from detector.columnar_export import PYARROW_AVAILABLE as COLUMNAR_AVAILABLE
+from detector.report_pool import ReportJob, ReportPool, freeze_findings, load_snapshot
+from detector.delta import delta_since, diff_findings
+from detector.exports import iter_finding_records
+from detector.console_view import AlertLiveView, format_plain_sections, scan_summary_sections
+from detector.alert_aggregator import AlertAggregator, TokenBucket
+from detector.alert_sinks import (EmailSink, SinkOutbox, SyslogSink, WebhookSink, alert_payload, format_syslog,
+                                   sink_outbox_path)
+from detector.log_pipeline import (CompressingRotatingFileHandler, DroppingQueueHandler, JsonLinesFormatter,
+                                   setup_logging, shutdown_logging)
 from detector.browser_scanner import BrowserScanner
+from detector.extension_analyzer import ExtensionPermissionAnalyzer, compile_permissions
+from detector.browser_scanner import iter_chrome_bookmarks, walk_bookmark_roots, IJSON_AVAILABLE
+from detector.usage_analytics import UsageRollupStore, BrowserUsageScanner, WEBKIT_EPOCH_OFFSET_US
+from detector.fs_watcher import FileWatcher, INOTIFY_AVAILABLE
+from detector.real_time_monitor import RealTimeMonitor
+from detector.scheduler import ScanScheduler
+from detector.async_runtime import AsyncRuntime
+from detector.adaptive import AdaptiveInterval
+from detector.deadline import Deadline, check_deadline, deadline_scope
+from detector.event_bus import EventBus, AlertEvent, FindingEvent
+from detector.state_store import FindingStateStore, finding_fingerprint, state_db_path
+
+def _alert(title='SaaS Network Connection Detected', severity='medium', service='slack.com', source='network',
+           description='', timestamp=None, **details):
+    """Build an alert; extra keyword arguments become alert details"""
+    return Alert(timestamp=timestamp or datetime.now(), severity=severity, category=source, title=title,
+                 description=description, details={'saas_domain': service, **details}, source=source)
 
 class TestSaaSDatabase(unittest.TestCase):
     """Test SaaS database functionality"""
@@ -297,6 +334,2234 @@ class TestBrowserScanner(unittest.TestCase):
             expected_chrome_path = os.path.join('/home/test', '.config', 'google-chrome', 'Default', 'Extensions')
             self.assertEqual(paths['chrome']['extensions'], expected_chrome_path)
 
+class TestAlertStore(unittest.TestCase):
+    """Test the bounded alert store"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'alerts.db')
+        self.start = datetime(2024, 1, 1)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_ring_spills_to_disk(self):
+        """Test that pages cross the ring/disk boundary in newest-first order"""
+        store = AlertStore(capacity=3, db_path=self.db_path)
+        for i in range(250):
+            store.append(_alert(f"Alert {i}", timestamp=self.start + timedelta(minutes=i)))
+        
+        self.assertEqual(len(store), 250)
+        self.assertEqual(len(store._ring), 3)
+        page = store.query(limit=5, offset=1)
+        self.assertEqual([alert.title for alert in page], [f"Alert {i}" for i in range(248, 243, -1)])
+        self.assertEqual([alert.title for alert in store][:2], ['Alert 0', 'Alert 1'])
+        self.assertEqual(len(list(store)), 250)
+        
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.query(), [])
+    
+    def test_filtered_queries(self):
+        """Test severity, service and time filters across memory and disk"""
+        store = AlertStore(capacity=2, db_path=self.db_path)
+        for i in range(10):
+            store.append(_alert(f"Alert {i}", severity='high' if i % 2 else 'low',
+                                service='github.com' if i < 5 else 'slack.com',
+                                timestamp=self.start + timedelta(minutes=i)))
+        
+        self.assertEqual(store.count(severity='high'), 5)
+        self.assertEqual([a.title for a in store.query(severity='high', service='github.com')],
+                         ['Alert 3', 'Alert 1'])
+        self.assertEqual(store.count(since=datetime(2024, 1, 1, 0, 8)), 2)
+        self.assertEqual(store.summary()['by_severity'], {'low': 5, 'high': 5})
+    
+    def test_summary_rates_slide(self):
+        """Test that recent-alert counts follow the clock without a recompute"""
+        now = [datetime(2024, 1, 1, 1, 0).timestamp()]
+        store = AlertStore(capacity=10, db_path=self.db_path, clock=lambda: now[0])
+        for i in range(60):
+            store.append(_alert(f"Alert {i}", service='slack.com' if i % 2 else 'dropbox.com',
+                                timestamp=self.start + timedelta(minutes=i)))
+        
+        summary = store.summary()
+        self.assertEqual(summary['by_service'], {'slack.com': 30, 'dropbox.com': 30})
+        self.assertEqual(summary['recent'], {'5m': 5, '1h': 60, '24h': 60})
+        self.assertEqual(summary['rate_per_minute']['1h'], 1.0)
+        
+        now[0] += 3600
+        self.assertEqual(store.summary()['recent'], {'5m': 0, '1h': 0, '24h': 60})
+        now[0] += 86400
+        self.assertEqual(store.summary()['recent']['24h'], 0)
+        self.assertEqual(store.summary()['total'], 60)
+    
+    def test_without_path_old_alerts_are_evicted(self):
+        """Test that a store without a database keeps only the ring"""
+        store = AlertStore(capacity=3)
+        for i in range(10):
+            store.append(_alert(f"Alert {i}", severity='high' if i % 2 else 'low',
+                                timestamp=self.start + timedelta(minutes=i)))
+        
+        self.assertEqual(len(store), 3)
+        self.assertEqual([alert.title for alert in store], ['Alert 7', 'Alert 8', 'Alert 9'])
+        self.assertEqual(store.summary()['by_severity'], {'high': 2, 'low': 1})
+        self.assertEqual(store.count(), 3)
+    
+    def test_window_counter_late_arrivals(self):
+        """Test that out-of-order events land in their own slot"""
+        counter = WindowCounter(60, slots=6, clock=lambda: 1000.0)
+        counter.add(995)
+        counter.add(945)
+        counter.add(955)
+        counter.add(935)
+        
+        self.assertEqual(counter.count(), 3)
+        self.assertEqual([slot[0] for slot in counter._slots], [940, 950, 990])
+    
+    def test_alerts_persist_across_restarts(self):
+        """Test that a file-backed store keeps earlier alerts queryable but out of the session counts"""
+        db_path = os.path.join(self.temp_dir, 'alerts.db')
+        store = AlertStore(capacity=2, db_path=db_path)
+        for i in range(5):
+            store.append(_alert(f"Alert {i}", timestamp=self.start + timedelta(minutes=i)))
+        store.close()
+        
+        store = AlertStore(capacity=2, db_path=db_path)
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.count(), 5)
+        store.append(_alert("Alert 5", timestamp=self.start + timedelta(minutes=5)))
+        self.assertEqual(store.query(limit=2)[1].title, 'Alert 4')
+        self.assertEqual(store.summary()['by_source'], {'network': 1})
+        self.assertEqual([alert.title for alert in store], ['Alert 5'])
+        store.close()
+    
+    def test_retention_prunes_old_alerts(self):
+        """Test that stored alerts past the retention window are deleted"""
+        store = AlertStore(capacity=2, db_path=self.db_path)
+        for i in range(5):
+            store.append(_alert(f"Alert {i}", timestamp=self.start + timedelta(minutes=i)))
+        store.close()
+        
+        # Alerts are at 2024-01-01 00:00 plus i minutes; keep the last two
+        cutoff = datetime(2024, 1, 1, 0, 3).timestamp()
+        store = AlertStore(db_path=self.db_path)
+        self.assertEqual(store.prune(60, now=cutoff + 60), 3)
+        self.assertEqual([alert.title for alert in store.query()], ['Alert 4', 'Alert 3'])
+        store.close()
+        
+        store = AlertStore(db_path=self.db_path, retention_seconds=86400)
+        self.assertEqual(store.count(), 0)
+        store.close()
+    
+    def test_alert_manager_pages(self):
+        """Test paged alert queries through the alert manager"""
+        config = ConfigManager()
+        config.scan_config.state_directory = self.temp_dir
+        alert_manager = AlertManager(config)
+        for i in range(7):
+            alert_manager.create_alert('high', 'network', f"Alert {i}", '', {'saas_domain': 'slack.com'}, 'network')
+        
+        result = alert_manager.get_alerts(page=2, page_size=3, service='slack.com')
+        self.assertEqual(result['total'], 7)
+        self.assertEqual([alert.title for alert in result['alerts']], ['Alert 3', 'Alert 2', 'Alert 1'])
+        
+        # Closing moves the ring to <state_directory>/alerts.db
+        alert_manager.close()
+        self.assertEqual(AlertStore(db_path=self.db_path).count(), 7)
+        alert_manager.alerts.close()
+
+class TestAlertAggregator(unittest.TestCase):
+    """Test alert coalescing and per-sink rate limits"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = [0.0]
+        self.emitted = []
+        self.aggregator = AlertAggregator(self.emitted.append, window=60, max_window=600,
+                                          max_keys=2, clock=lambda: self.now[0])
+    
+    def test_burst_becomes_one_alert_and_one_summary(self):
+        """Test that a burst for one service yields the first alert plus a summary"""
+        for i in range(20):
+            self.now[0] += 1
+            self.aggregator.submit(_alert(service='slack.com', severity='high' if i == 5 else 'medium',
+                                          remote_address=f"10.0.0.{i}:443"))
+        self.assertEqual(len(self.emitted), 1)
+        
+        self.now[0] += 30
+        self.aggregator.flush()
+        self.assertEqual(len(self.emitted), 1)
+        
+        self.now[0] += 30
+        self.aggregator.flush()
+        self.assertEqual(len(self.emitted), 2)
+        summary = self.emitted[1]
+        self.assertEqual(summary.details['coalesced_count'], 19)
+        self.assertEqual(summary.severity, 'high')
+        self.assertEqual(self.aggregator.get_stats()['coalesced'], 19)
+        self.assertEqual(self.aggregator.get_stats()['open_windows'], 0)
+        self.aggregator.stop()
+    
+    def test_state_is_bounded(self):
+        """Test that the least recently active key is evicted with its summary"""
+        self.aggregator.submit(_alert(service='slack.com'))
+        self.aggregator.submit(_alert(service='slack.com'))
+        self.aggregator.submit(_alert(service='github.com'))
+        self.aggregator.submit(_alert(service='zoom.us'))
+        
+        titles = [(a.details['saas_domain'], a.details.get('coalesced_count')) for a in self.emitted]
+        self.assertEqual(titles, [('slack.com', None), ('github.com', None), ('slack.com', 1), ('zoom.us', None)])
+        self.assertEqual(self.aggregator.get_stats()['evicted'], 1)
+        self.aggregator.stop()
+    
+    def test_extension_alerts_key_on_extension_id(self):
+        """Test that different extensions are not merged into one burst"""
+        for ext_id in ['abc', 'def', 'abc']:
+            self.aggregator.submit(_alert('Browser Extension Detected', source='browser', service=None,
+                                          extension_id=ext_id))
+        
+        self.assertEqual([a.details['extension_id'] for a in self.emitted], ['abc', 'def'])
+        self.assertEqual(self.aggregator.get_stats()['coalesced'], 1)
+        self.aggregator.stop()
+    
+    def test_token_bucket(self):
+        """Test burst capacity and refill"""
+        bucket = TokenBucket(rate=1.0, burst=2, clock=lambda: self.now[0])
+        self.assertTrue(bucket.consume())
+        self.assertTrue(bucket.consume())
+        self.assertFalse(bucket.consume())
+        self.now[0] += 1
+        self.assertTrue(bucket.consume())
+    
+    def test_alert_manager_rate_limits_sinks(self):
+        """Test that sinks over their rate are counted as suppressed"""
+        config = ConfigManager()
+        config.alert_config.enable_alert_coalescing = False
+        config.alert_config.sink_rate_limit_per_minute = 1
+        config.alert_config.sink_rate_burst = 2
+        config.alert_config.enable_alert_spill = False
+        alert_manager = AlertManager(config)
+        alert_manager.logger = Mock()
+        alert_manager._send_console_alert = Mock()
+        
+        for service in ['a.com', 'b.com', 'c.com', 'd.com', 'e.com']:
+            alert_manager.send_alert(_alert(service=service, severity='medium'))
+        alert_manager.flush_alerts()
+        
+        # The audit log is never rate limited
+        self.assertEqual(alert_manager.logger.warning.call_count, 5)
+        self.assertEqual(alert_manager._send_console_alert.call_count, 2)
+        self.assertEqual(alert_manager.get_suppression_stats()['rate_limited'], {'console': 3})
+    
+    def test_alert_manager_never_rate_limits_urgent_alerts(self):
+        """Test that alerts at the urgent severity bypass the rate limit"""
+        config = ConfigManager()
+        config.alert_config.enable_alert_coalescing = False
+        config.alert_config.sink_rate_limit_per_minute = 1
+        config.alert_config.sink_rate_burst = 1
+        config.alert_config.enable_alert_spill = False
+        config.alert_config.enable_email_alerts = True
+        alert_manager = AlertManager(config)
+        alert_manager.logger = Mock()
+        alert_manager._send_console_alert = Mock()
+        alert_manager._send_email_alert = Mock()
+        
+        for service in ['a.com', 'b.com', 'c.com']:
+            alert_manager.send_alert(_alert(service=service, severity='high'))
+        alert_manager.flush_alerts()
+        
+        self.assertEqual(alert_manager._send_console_alert.call_count, 3)
+        self.assertEqual(alert_manager._send_email_alert.call_count, 3)
+        self.assertEqual(alert_manager.get_suppression_stats()['rate_limited'], {'console': 0})
+
+class TestPriorityDispatcher(unittest.TestCase):
+    """Test severity-ordered alert dispatch"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.release = threading.Event()
+        self.dispatched = []
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.release.set()
+    
+    def _handler(self, alert):
+        self.release.wait(5)
+        self.dispatched.append(alert.title)
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_severity_then_age_order(self):
+        """Test that queued alerts are dispatched most severe first, oldest first within a severity"""
+        dispatcher = PriorityDispatcher(self._handler, workers=1)
+        self.addCleanup(dispatcher.stop, 1)
+        dispatcher.submit(_alert('busy', 'low'))
+        self.assertTrue(self._wait_for(lambda: dispatcher.get_stats()['in_flight'] == 1))
+        for title, severity in [('low 1', 'low'), ('medium', 'medium'), ('high', 'high'), ('low 2', 'low')]:
+            dispatcher.submit(_alert(title, severity))
+        self.assertEqual(dispatcher.get_stats()['queue_depth_by_severity'], {'low': 2, 'medium': 1, 'high': 1})
+        
+        self.release.set()
+        self.assertTrue(dispatcher.drain(5))
+        self.assertEqual(self.dispatched, ['busy', 'high', 'medium', 'low 1', 'low 2'])
+        
+        latency = dispatcher.get_stats()['latency_seconds']
+        self.assertEqual(set(latency), {'low', 'medium', 'high'})
+        self.assertLessEqual(latency['low']['p50'], latency['low']['max'])
+    
+    def test_low_severity_shed_under_overload(self):
+        """Test that a deep backlog sheds low alerts first and drops everything when full"""
+        dispatcher = PriorityDispatcher(self._handler, workers=1, maxsize=4, shed_depth=2)
+        self.addCleanup(dispatcher.stop, 1)
+        dispatcher.submit(_alert('busy', 'high'))
+        self.assertTrue(self._wait_for(lambda: dispatcher.get_stats()['in_flight'] == 1))
+        
+        accepted = [dispatcher.submit(_alert(str(i), severity))
+                    for i, severity in enumerate(['low', 'low', 'low', 'high', 'high', 'high'])]
+        
+        self.assertEqual(accepted, [True, True, False, True, True, False])
+        stats = dispatcher.get_stats()
+        self.assertEqual((stats['queue_depth'], stats['shed'], stats['dropped']), (4, 1, 1))
+    
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([], 0.9), 0.0)
+    
+    def test_urgent_alerts_skip_batching(self):
+        """Test that high-severity alerts are sent without waiting for a full batch"""
+        import socket
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(5)
+        self.addCleanup(receiver.close)
+        config = ConfigManager()
+        config.alert_config.syslog_host = '127.0.0.1'
+        config.alert_config.syslog_port = receiver.getsockname()[1]
+        sink = SyslogSink(config.alert_config, SinkOutbox(''), batch_size=100, batch_interval=3600)
+        self.addCleanup(sink.stop, 1)
+        
+        sink.submit(_alert('routine', 'low'))
+        time.sleep(0.1)
+        self.assertEqual(sink.get_status()['pending'], 1)
+        sink.submit(_alert('urgent', 'high'), urgent=True)
+        
+        self.assertIn(b'routine', receiver.recv(4096))
+        self.assertIn(b'urgent', receiver.recv(4096))
+
+class _WebhookStandInHandler(http.server.BaseHTTPRequestHandler):
+    """Accepts webhook posts over keep-alive connections"""
+    protocol_version = 'HTTP/1.1'
+    
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+    
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        self.server.requests.append((self.path, json.loads(body)))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+class _WebhookStandIn(http.server.ThreadingHTTPServer):
+    """Local HTTP server for webhook sink tests"""
+    daemon_threads = True
+    
+    def __init__(self):
+        self.requests = []
+        self.statuses = []
+        self.connections = 0
+        super().__init__(('127.0.0.1', 0), _WebhookStandInHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class _SyslogStandInHandler(socketserver.StreamRequestHandler):
+    """Reads octet-counted syslog frames"""
+    
+    def handle(self):
+        self.server.connections += 1
+        while True:
+            length = b''
+            while not length.endswith(b' '):
+                char = self.rfile.read(1)
+                if not char:
+                    return
+                length += char
+            self.server.messages.append(self.rfile.read(int(length)))
+
+class _SyslogStandIn(socketserver.ThreadingTCPServer):
+    """Local TCP syslog collector for syslog sink tests"""
+    daemon_threads = True
+    
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        super().__init__(('127.0.0.1', 0), _SyslogStandInHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class TestNetworkSinks(unittest.TestCase):
+    """Test batched webhook and syslog delivery"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.config = ConfigManager()
+        self.alert_config = self.config.alert_config
+        self.now = [1000.0]
+        self.sinks = []
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        for sink in self.sinks:
+            sink.stop(timeout=1)
+    
+    def _sink(self, sink_class, **kwargs):
+        sink = sink_class(self.alert_config, SinkOutbox(''), clock=lambda: self.now[0], **kwargs)
+        self.sinks.append(sink)
+        return sink
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_webhook_batches_over_one_connection(self):
+        """Test that gzipped JSON batches reuse a keep-alive connection"""
+        server = _WebhookStandIn()
+        self.addCleanup(server.stop)
+        self.alert_config.webhook_url = f"http://127.0.0.1:{server.server_address[1]}/ingest?token=x"
+        sink = self._sink(WebhookSink, batch_size=5)
+        
+        for i in range(15):
+            sink.submit(_alert(f"Alert {i}", 'high', description='Unapproved service'))
+        
+        self.assertTrue(self._wait_for(lambda: sink.get_status()['delivered'] == 15))
+        self.assertEqual(len(server.requests), 3)
+        self.assertEqual(server.connections, 1)
+        path, payload = server.requests[0]
+        self.assertEqual(path, '/ingest?token=x')
+        self.assertEqual([alert['title'] for alert in payload['alerts']], [f"Alert {i}" for i in range(5)])
+    
+    def test_webhook_retries_server_errors(self):
+        """Test that a failed post is retried after backoff in the Slack format"""
+        server = _WebhookStandIn()
+        self.addCleanup(server.stop)
+        server.statuses = [503]
+        self.alert_config.webhook_url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+        self.alert_config.webhook_format = 'slack'
+        sink = self._sink(WebhookSink, batch_size=1, backoff=5)
+        # Slack does not accept gzip bodies, so compression is skipped
+        payload = alert_payload(_alert("Alert 0", 'high', description='Unapproved service'))
+        self.assertNotIn('Content-Encoding', sink._encode([payload])[1])
+        
+        sink.submit(_alert("Alert 0", 'high', description='Unapproved service'))
+        self.assertTrue(self._wait_for(lambda: sink.get_status()['failures'] == 1))
+        self.now[0] += 60
+        self.assertTrue(self._wait_for(lambda: len(server.requests) == 2))
+        self.assertIn('[HIGH] Alert 0', server.requests[1][1]['text'])
+        self.assertTrue(self._wait_for(lambda: sink.get_status()['pending'] == 0))
+    
+    def test_webhook_rejects_bad_url(self):
+        """Test that unsupported webhook URLs are refused"""
+        self.alert_config.webhook_url = 'ftp://example.com/hook'
+        with self.assertRaises(ValueError):
+            WebhookSink(self.alert_config, SinkOutbox(''))
+    
+    def test_syslog_message_format(self):
+        """Test RFC 5424 rendering and structured data escaping"""
+        alert = alert_payload(_alert('Quote "x" 0', 'high', description='Unapproved service'))
+        alert['details']['saas_domain'] = 'a]b'
+        message = format_syslog(alert, facility=16, hostname='host1')
+        
+        header, msg = message.split(b'\xef\xbb\xbf')
+        self.assertTrue(header.startswith(b'<131>1 '))
+        self.assertIn(b' host1 shadowit-detector ', header)
+        self.assertIn(b'service="a\\]b"', header)
+        self.assertEqual(msg.decode(), 'Quote "x" 0: Unapproved service')
+    
+    def test_syslog_tcp_batches_frames(self):
+        """Test that TCP delivery frames a batch on one connection"""
+        server = _SyslogStandIn()
+        self.addCleanup(server.stop)
+        self.alert_config.syslog_host = '127.0.0.1'
+        self.alert_config.syslog_port = server.server_address[1]
+        self.alert_config.syslog_protocol = 'tcp'
+        sink = self._sink(SyslogSink, batch_size=4)
+        
+        for i in range(8):
+            sink.submit(_alert(f"Alert {i}", 'high', description='Unapproved service'))
+        
+        self.assertTrue(self._wait_for(lambda: len(server.messages) == 8))
+        self.assertEqual(server.connections, 1)
+        self.assertTrue(server.messages[7].endswith(b'Alert 7: Unapproved service'))
+    
+    def test_syslog_udp(self):
+        """Test that UDP delivery sends one datagram per alert"""
+        import socket
+        receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        receiver.bind(('127.0.0.1', 0))
+        receiver.settimeout(5)
+        self.addCleanup(receiver.close)
+        self.alert_config.syslog_host = '127.0.0.1'
+        self.alert_config.syslog_port = receiver.getsockname()[1]
+        sink = self._sink(SyslogSink, batch_size=2)
+        
+        sink.submit(_alert("Alert 0", 'high', description='Unapproved service'))
+        sink.submit(_alert("Alert 1", 'high', description='Unapproved service'))
+        
+        self.assertIn(b'Alert 0', receiver.recv(4096))
+        self.assertIn(b'Alert 1', receiver.recv(4096))
+    
+    def test_queue_is_bounded(self):
+        """Test that the oldest queued alerts are dropped beyond max_pending"""
+        self.alert_config.syslog_host = '127.0.0.1'
+        sink = self._sink(SyslogSink, batch_size=100, batch_interval=3600, max_pending=3)
+        
+        for i in range(5):
+            sink.submit(_alert(f"Alert {i}", 'high', description='Unapproved service'))
+        
+        status = sink.get_status()
+        self.assertEqual((status['pending'], status['dropped']), (3, 2))
+        titles = [payload['title'] for _, payload, _ in sink.outbox.due('syslog', self.now[0], 10)]
+        self.assertEqual(titles, ['Alert 2', 'Alert 3', 'Alert 4'])
+    
+    def test_alert_manager_routes_to_webhook(self):
+        """Test that AlertManager feeds enabled network sinks"""
+        server = _WebhookStandIn()
+        self.addCleanup(server.stop)
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(lambda: __import__('shutil').rmtree(temp_dir, ignore_errors=True))
+        self.config.scan_config.state_directory = temp_dir
+        self.alert_config.enable_console_alerts = False
+        self.alert_config.enable_alert_coalescing = False
+        self.alert_config.enable_webhook_alerts = True
+        self.alert_config.webhook_url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+        alert_manager = AlertManager(self.config)
+        
+        alert_manager.send_alert(_alert("Alert 0", 'high', description='Unapproved service'))
+        alert_manager.flush_alerts()
+        self.sinks.extend(alert_manager.sinks.values())
+        
+        self.assertEqual(len(server.requests), 1)
+        self.assertEqual(alert_manager.get_sink_status()['webhook']['delivered'], 1)
+    
+    def test_alert_manager_resumes_pending_sinks(self):
+        """Test that alerts left in the outbox by an earlier run are sent at startup"""
+        server = _WebhookStandIn()
+        self.addCleanup(server.stop)
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(lambda: __import__('shutil').rmtree(temp_dir, ignore_errors=True))
+        self.config.scan_config.state_directory = temp_dir
+        self.alert_config.enable_webhook_alerts = True
+        self.alert_config.webhook_url = f"http://127.0.0.1:{server.server_address[1]}/hook"
+        outbox = SinkOutbox(sink_outbox_path(self.config))
+        payload = alert_payload(_alert("Alert 0", 'high', description='Unapproved service'))
+        outbox.put('webhook', payload, time.time() - 60)
+        outbox.close()
+        
+        alert_manager = AlertManager(self.config)
+        self.sinks.extend(alert_manager.sinks.values())
+        
+        self.assertIn('webhook', alert_manager.sinks)
+        self.assertTrue(self._wait_for(lambda: len(server.requests) == 1))
+
+class TestConsoleView(unittest.TestCase):
+    """Test the bounded console summaries"""
+    
+    def test_scan_sections_are_top_n(self):
+        """Test that console sections keep the top N rows and count the rest"""
+        findings = {
+            'total_findings': 40, 'high_risk_count': 0, 'medium_risk_count': 40, 'low_risk_count': 0,
+            'network_findings': [{'saas_domain': f"s{i % 8}.com", 'pid': i} for i in range(30)] +
+                                [{'saas_domain': 'busy.com', 'pid': 1}] * 10,
+            'endpoint_findings': [],
+            'browser_findings': {'extensions': [{'name': 'quiet', 'risk_level': 'low'},
+                                                {'name': 'risky', 'risk_level': 'high'}]}
+        }
+        sections = scan_summary_sections(findings, top_n=3)
+        
+        self.assertEqual([heading for heading, *_ in sections],
+                         ['Summary', '🌐 Network Connections', '🌐 Browser Extensions'])
+        _, _, rows, hidden = sections[1]
+        self.assertEqual(rows[0], ['busy.com', '10', '1'])
+        self.assertEqual((len(rows), hidden), (3, 6))
+        self.assertEqual(sections[2][2][0][1], 'risky')
+        self.assertIn('... and 6 more', format_plain_sections(sections))
+    
+    def test_plain_view_is_throttled(self):
+        """Test that off a terminal the view writes one summary line per interval"""
+        import io
+        from rich.console import Console
+        stream = io.StringIO()
+        now = [0.0]
+        view = AlertLiveView(Console(file=io.StringIO()), top_n=2, plain_interval=10,
+                             stream=stream, clock=lambda: now[0])
+        
+        with view:
+            for i in range(500):
+                now[0] += 0.1
+                view.add(_alert(service='slack.com' if i % 3 else 'dropbox.com', severity='high' if i == 0 else 'low'))
+        
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertIn('alerts: 500 (high 1, medium 0, low 499); top: slack.com 333, dropbox.com 167', lines[-1])
+    
+    def test_live_render_and_alert_routing(self):
+        """Test that the live view renders its counters and takes over console alerts"""
+        import io
+        from rich.console import Console
+        view = AlertLiveView(Console(file=io.StringIO()), top_n=5)
+        config = ConfigManager()
+        config.alert_config.alert_dispatch_workers = 0
+        config.alert_config.enable_alert_coalescing = False
+        config.alert_config.enable_alert_spill = False
+        alert_manager = AlertManager(config)
+        alert_manager.console = Mock()
+        alert_manager.console_view = view
+        
+        alert_manager.send_alert(_alert(service='slack.com', severity='high'))
+        
+        alert_manager.console.print.assert_not_called()
+        self.assertEqual(view.total, 1)
+        output = io.StringIO()
+        Console(file=output, width=120).print(view.render())
+        self.assertIn('slack.com', output.getvalue())
+        self.assertIn('High: 1', output.getvalue())
+
+class TestHtmlReport(unittest.TestCase):
+    """Test the streaming HTML report"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.report_config.report_directory = self.temp_dir
+        self.config.report_config.html_page_rows = 1000
+        self.generator = ReportGenerator(self.config)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _findings(self, bookmarks):
+        return {
+            'total_findings': 1, 'high_risk_count': 1, 'medium_risk_count': 0, 'low_risk_count': 0,
+            'network_findings': [{'saas_domain': 'slack.com', 'risk_level': 'high', 'raddr': '1.2.3.4:443'}],
+            'endpoint_findings': [],
+            'browser_findings': {'bookmarks': [
+                {'browser': 'chrome', 'title': f"<script>alert({i})</script>", 'url': f"https://s{i % 3}.com/?a=1&b=2",
+                 'saas_domain': f"s{i % 3}.com"} for i in range(bookmarks)
+            ]}
+        }
+    
+    def test_cells_are_escaped(self):
+        """Test that finding values cannot inject markup"""
+        path = self.generator.generate_html_report(self._findings(2), 'report.html')
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        
+        self.assertNotIn('<script>', content)
+        self.assertIn('&lt;script&gt;alert(1)&lt;/script&gt;', content)
+        self.assertIn('https://s1.com/?a=1&amp;b=2', content)
+        self.assertIn('<span class="badge badge-high">HIGH</span>', content)
+        self.assertTrue(content.rstrip().endswith('</html>'))
+    
+    def test_long_tables_are_paginated(self):
+        """Test that long tables keep a bounded page inline and link the rest"""
+        path = self.generator.generate_html_report(self._findings(2500), 'report.html')
+        with open(path, encoding='utf-8') as f:
+            content = f.read()
+        
+        self.assertEqual(content.count('alert('), 1000)
+        self.assertIn('Showing 1000 of 2500 rows', content)
+        self.assertIn('Top 20 services', content)
+        self.assertIn('<tr><td>s0.com</td><td>834</td></tr>', content)
+        for number, rows in [(2, 1000), (3, 500)]:
+            page = os.path.join(self.temp_dir, f"report_bookmarks_{number}.html")
+            self.assertIn(f'href="{os.path.basename(page)}"', content)
+            with open(page, encoding='utf-8') as f:
+                page_content = f.read()
+            self.assertEqual(page_content.count('alert('), rows)
+            self.assertTrue(page_content.rstrip().endswith('</html>'))
+        with open(os.path.join(self.temp_dir, 'report_bookmarks_2.html'), encoding='utf-8') as f:
+            self.assertIn('href="report_bookmarks_3.html"', f.read())
+
+class TestExports(unittest.TestCase):
+    """Test the streaming NDJSON and CSV exports"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.report_config.report_directory = self.temp_dir
+        self.generator = ReportGenerator(self.config)
+        self.findings = {
+            'network_findings': [{'saas_domain': 'slack.com', 'risk_level': 'high', 'raddr': '1.2.3.4:443'}],
+            'endpoint_findings': [{'name': 'zoom', 'pid': 42, 'risk_level': 'medium', 'type': 'process'}],
+            'browser_findings': {
+                'extensions': [{'name': 'Grammarly', 'browser': 'chrome', 'saas_access': ['grammarly.com']}],
+                'bookmarks': [{'browser': 'firefox', 'url': 'https://notion.so/x', 'saas_domain': 'notion.so'}],
+                'history': [{'browser': 'chrome', 'url': 'https://trello.com/b', 'title': 'Board', 'visit_count': 3}]
+            },
+            'usage_trends': {'slack.com': {'visits': 10, 'active_seconds': 7200}}
+        }
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_ndjson_covers_every_finding_type(self):
+        """Test that each finding becomes one typed line"""
+        path = self.generator.generate_ndjson_report(self.findings, 'report.ndjson')
+        with open(path, encoding='utf-8') as f:
+            records = [json.loads(line) for line in f]
+        
+        self.assertEqual([r['type'] for r in records],
+                         ['network', 'endpoint', 'extension', 'bookmark', 'history', 'usage'])
+        self.assertEqual(records[0]['raddr'], '1.2.3.4:443')
+        self.assertEqual(records[1]['endpoint_type'], 'process')
+        self.assertEqual(records[-1]['saas_domain'], 'slack.com')
+    
+    def test_gzip_round_trip(self):
+        """Test that .gz exports are compressed on the fly"""
+        ndjson = self.generator.generate_ndjson_report(self.findings, 'report.ndjson.gz')
+        csv_path = self.generator.generate_csv_report(self.findings, 'report.csv', compression='gzip')
+        
+        with gzip.open(ndjson, 'rt', encoding='utf-8') as f:
+            self.assertEqual(len(f.readlines()), 6)
+        with gzip.open(csv_path, 'rt', encoding='utf-8') as f:
+            self.assertTrue(f.readline().startswith('Type,Service/Application'))
+    
+    def test_csv_includes_bookmarks_and_history(self):
+        """Test that the CSV report covers browser bookmarks and history"""
+        import csv
+        path = self.generator.generate_csv_report(self.findings, 'report.csv')
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        
+        types = [row[0] for row in rows[1:]]
+        self.assertEqual(types, ['Network Connection', 'Application', 'Browser Extension',
+                                 'Bookmark', 'History Entry', 'SaaS Usage'])
+        self.assertEqual(rows[5][1], 'Board')
+    
+    def test_zstd_requires_package(self):
+        """Test that zstd exports fail clearly without zstandard"""
+        from detector import exports
+        if exports.ZSTD_AVAILABLE:
+            self.skipTest("zstandard is installed")
+        with self.assertRaises(ValueError):
+            self.generator.generate_ndjson_report(self.findings, compression='zstd')
+
+class TestColumnarExport(unittest.TestCase):
+    """Test the Parquet/Arrow exports"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.report_config.report_directory = self.temp_dir
+        self.config.report_config.columnar_row_group_size = 2
+        self.generator = ReportGenerator(self.config)
+        self.findings = {
+            'network_findings': [{'saas_domain': 'slack.com', 'raddr': '1.2.3.4:443', 'pid': 7, 'extra': 'x'}],
+            'endpoint_findings': [{'name': 'zoom', 'pid': 8, 'saas_domain': 'zoom.us', 'type': 'process'}],
+            'browser_findings': {'bookmarks': [
+                {'browser': 'chrome', 'url': f"https://notion.so/{i}", 'saas_domain': 'notion.so', 'date_added': i}
+                for i in range(5)
+            ]}
+        }
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    @unittest.skipIf(COLUMNAR_AVAILABLE, "pyarrow is installed")
+    def test_requires_pyarrow(self):
+        """Test that columnar exports fail clearly without pyarrow"""
+        with self.assertRaises(ValueError):
+            self.generator.generate_columnar_report(self.findings, 'report.parquet')
+    
+    @unittest.skipUnless(COLUMNAR_AVAILABLE, "pyarrow not installed")
+    def test_parquet_tables_per_type(self):
+        """Test that each finding type gets a typed, row-group batched table"""
+        import pyarrow.parquet as pq
+        paths = self.generator.generate_columnar_report(self.findings, 'report.parquet', 'parquet')
+        
+        self.assertEqual(sorted(paths), ['bookmark', 'endpoint', 'network'])
+        bookmarks = pq.ParquetFile(paths['bookmark'])
+        self.assertEqual(bookmarks.metadata.num_rows, 5)
+        self.assertEqual(bookmarks.metadata.num_row_groups, 3)
+        table = bookmarks.read()
+        self.assertEqual(str(table.schema.field('saas_domain').type), 'dictionary<values=string, indices=int32, ordered=0>')
+        self.assertEqual(table.column('date_added').to_pylist(), list(range(5)))
+        network = pq.read_table(paths['network'])
+        self.assertNotIn('extra', network.column_names)
+        self.assertEqual(network.column('pid').to_pylist(), [7])
+        self.assertEqual(pq.read_table(paths['endpoint']).column('endpoint_type').to_pylist(), ['process'])
+    
+    @unittest.skipUnless(COLUMNAR_AVAILABLE, "pyarrow not installed")
+    def test_arrow_ipc(self):
+        """Test that Arrow IPC files round-trip when later batches add dictionary values"""
+        import pyarrow as pa
+        browsers = ['chrome', 'chrome', 'firefox', None, 'edge']
+        for bookmark, browser in zip(self.findings['browser_findings']['bookmarks'], browsers):
+            bookmark['browser'] = browser
+        paths = self.generator.generate_columnar_report(self.findings, 'report.arrow', 'arrow')
+        with pa.memory_map(paths['bookmark']) as source:
+            reader = pa.ipc.open_file(source)
+            self.assertEqual(reader.num_record_batches, 3)
+            table = reader.read_all()
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.column('browser').to_pylist(), browsers)
+
+class TestReportPool(unittest.TestCase):
+    """Test parallel report generation from a frozen snapshot"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.report_config.report_directory = self.temp_dir
+        self.findings = {
+            'total_findings': 1, 'high_risk_count': 1, 'medium_risk_count': 0, 'low_risk_count': 0,
+            'network_findings': [{'saas_domain': 'slack.com', 'risk_level': 'high', 'raddr': '1.2.3.4:443'}],
+            'endpoint_findings': [],
+            'browser_findings': {}
+        }
+        self.jobs = [ReportJob('html', 'r.html'), ReportJob('csv', 'r.csv.gz'),
+                     ReportJob('json', 'r.json'), ReportJob('ndjson', 'r.ndjson')]
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_workers_render_frozen_snapshot(self):
+        """Test that reports reflect the findings at submit time and the snapshot is removed"""
+        self.config.report_config.report_pool_min_findings = 0
+        pool = ReportPool(self.config, workers=2)
+        try:
+            future = pool.submit(self.findings, self.jobs + [ReportJob('csv', 'bad.csv', 'lz4')])
+            # The caller may move on and reuse its findings straight away
+            self.findings['network_findings'].clear()
+            results = future.result(timeout=60)
+        finally:
+            pool.shutdown()
+        
+        self.assertEqual([job.fmt for job, _ in results], ['html', 'csv', 'json', 'ndjson', 'csv'])
+        self.assertIsInstance(results[-1][1], ValueError)
+        with gzip.open(results[1][1], 'rt', encoding='utf-8') as f:
+            self.assertIn('slack.com', f.read())
+        with open(os.path.join(self.temp_dir, 'r.json'), encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)['findings']['network_findings']), 1)
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith('.snapshot')])
+    
+    def test_inline_when_no_workers(self):
+        """Test that workers=0 renders in the calling thread"""
+        results = ReportPool(self.config, workers=0).generate(self.findings, self.jobs)
+        for job, result in results:
+            self.assertTrue(os.path.exists(result), job)
+    
+    def test_inline_for_small_scans_and_single_reports(self):
+        """Test that no worker processes start when they would cost more than they save"""
+        pool = ReportPool(self.config, workers=2)
+        pool.generate(self.findings, self.jobs)
+        self.config.report_config.report_pool_min_findings = 0
+        pool.generate(self.findings, self.jobs[:1])
+        self.assertIsNone(pool._executor)
+    
+    def test_monitor_hands_off_reports(self):
+        """Test that the monitor's periodic report job renders its current findings"""
+        self.config.scan_config.enable_state_store = False
+        self.config.report_config.enable_csv_reports = False
+        self.assertNotIn('reports', RealTimeMonitor(self.config, Mock(), Mock(), Mock(), Mock())._create_scheduler()._jobs)
+        self.config.report_config.monitor_report_interval = 3600
+        monitor = RealTimeMonitor(self.config, Mock(), Mock(), Mock(), Mock())
+        monitor._process_network_findings(self.findings['network_findings'])
+        
+        with patch.object(monitor, 'submit_reports', wraps=monitor.submit_reports) as submit:
+            monitor._generate_reports()
+        
+        findings, jobs = submit.call_args[0]
+        self.assertEqual([job.fmt for job in jobs], ['html'])
+        self.assertEqual(findings['network_findings'], self.findings['network_findings'])
+        self.assertTrue([name for name in os.listdir(self.temp_dir) if name.startswith('monitor_report_')])
+        self.assertIn('reports', monitor._create_scheduler()._jobs)
+    
+    def test_snapshot_round_trip(self):
+        """Test that a snapshot loads back from its memory map"""
+        path = freeze_findings(self.findings, self.temp_dir)
+        self.assertEqual(load_snapshot(path), self.findings)
+
+class TestFindingDelta(unittest.TestCase):
+    """Test delta reports between scans"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.report_config.report_directory = self.temp_dir
+        self.generator = ReportGenerator(self.config)
+        self.previous = {
+            'network_findings': [{'saas_domain': 'slack.com', 'raddr': '1.2.3.4:443', 'pid': 1, 'risk_level': 'low'},
+                                 {'saas_domain': 'zoom.us', 'raddr': '5.6.7.8:443', 'pid': 2}],
+            'endpoint_findings': [],
+            'browser_findings': {
+                'extensions': [{'browser': 'chrome', 'id': 'abc', 'version': '1.0', 'risk_level': 'low'}],
+                'history': [{'browser': 'chrome', 'url': 'https://trello.com/b', 'title': 'Board'}]
+            }
+        }
+        self.current = {
+            # Same connection from a new pid, now high risk; zoom.us is gone, dropbox.com is new
+            'network_findings': [{'saas_domain': 'slack.com', 'raddr': '1.2.3.4:443', 'pid': 9, 'risk_level': 'high'},
+                                 {'saas_domain': 'dropbox.com', 'raddr': '9.9.9.9:443', 'pid': 3}],
+            'endpoint_findings': [],
+            'browser_findings': {
+                'extensions': [{'browser': 'chrome', 'id': 'abc', 'version': '1.0', 'risk_level': 'low'}],
+                'history': [{'browser': 'chrome', 'url': 'https://trello.com/b', 'title': 'Board'},
+                            {'browser': 'chrome', 'url': 'https://trello.com/b', 'title': 'Board'}]
+            }
+        }
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_diff_by_fingerprint(self):
+        """Test new, resolved, changed and unchanged findings"""
+        delta = diff_findings(iter_finding_records(self.current), iter_finding_records(self.previous))
+        
+        self.assertEqual(delta.counts(), {'new': 1, 'resolved': 1, 'changed': 1, 'unchanged': 2})
+        self.assertEqual(delta.new[0]['fingerprint'], 'network|dropbox.com|443')
+        self.assertEqual(delta.resolved[0]['saas_domain'], 'zoom.us')
+        self.assertEqual(delta.changed[0]['changes'], {'risk_level': ['low', 'high']})
+    
+    def test_endpoint_findings_keep_record_type(self):
+        """Test that an endpoint finding's own 'type' does not replace the record type"""
+        current = {'endpoint_findings': [{'name': 'Dropbox', 'saas_domain': 'dropbox.com', 'type': 'application'}]}
+        delta = diff_findings(iter_finding_records(current), [])
+        self.assertEqual(delta.counts()['new'], 1)
+        self.assertEqual((delta.new[0]['type'], delta.new[0]['endpoint_type']), ('endpoint', 'application'))
+    
+    def test_since_json_and_ndjson_reports(self):
+        """Test that previous JSON and compressed NDJSON reports load as baselines"""
+        for path in (self.generator.generate_json_report(self.previous, 'before.json'),
+                     self.generator.generate_ndjson_report(self.previous, 'before.ndjson.gz')):
+            self.assertEqual(delta_since(self.current, path).counts(),
+                             {'new': 1, 'resolved': 1, 'changed': 1, 'unchanged': 2}, path)
+        
+        delta = delta_since(self.current, os.path.join(self.temp_dir, 'before.json'))
+        report = self.generator.generate_delta_report(delta, 'before.json', 'delta.json')
+        with open(report, encoding='utf-8') as f:
+            data = json.load(f)
+        self.assertEqual(data['counts']['new'], 1)
+        self.assertEqual(data['metadata']['since'], 'before.json')
+    
+    def test_since_state_database(self):
+        """Test that a monitor state database diffs only the sources it tracks"""
+        db_path = os.path.join(self.temp_dir, 'monitor_state.db')
+        store = FindingStateStore(db_path)
+        store.record('network', ['network|slack.com|443', 'network|zoom.us|443'])
+        store.record('apps', ['apps|/usr/share/applications/x.desktop'])
+        store.close()
+        
+        delta = delta_since(self.current, db_path)
+        self.assertEqual(delta.counts(), {'new': 2, 'resolved': 1, 'changed': 0, 'unchanged': 1})
+        self.assertEqual({record['type'] for record in delta.new}, {'network', 'extension'})
+        self.assertEqual(delta.resolved[0]['fingerprint'], 'network|zoom.us|443')
+    
+    def test_agent_uploads_deltas(self):
+        """Test that the agent sends the full findings once, then only changes"""
+        from detector.agent_mode import AgentMode
+        agent = AgentMode(self.config, None, None)
+        with patch('detector.agent_mode.requests.post') as post:
+            post.return_value.status_code = 200
+            self.assertTrue(agent.send_findings_delta(self.previous))
+            self.assertTrue(agent.send_findings_delta(self.current))
+            self.assertTrue(agent.send_findings_delta(self.current))
+        
+        self.assertEqual(post.call_count, 2)
+        self.assertTrue(post.call_args_list[0][0][0].endswith('/api/agents/findings'))
+        self.assertTrue(post.call_args_list[1][0][0].endswith('/api/agents/findings/delta'))
+        self.assertEqual(post.call_args_list[1][1]['json']['delta']['counts']['new'], 1)
+    
+    def test_agent_reporting_uploads_monitor_findings(self):
+        """Test that each status report uploads the monitor's findings as a delta"""
+        from detector.agent_mode import AgentMode
+        monitor = Mock()
+        monitor.findings_snapshot.return_value = self.current
+        agent = AgentMode(self.config, None, monitor)
+        with patch('detector.agent_mode.requests.post') as post:
+            post.return_value.status_code = 200
+            agent._report_status()
+            agent._report_status()
+        
+        urls = [call[0][0] for call in post.call_args_list]
+        self.assertEqual(sum(url.endswith('/api/agents/findings') for url in urls), 1)
+        self.assertFalse(any(url.endswith('/api/agents/findings/delta') for url in urls))
+    
+    def test_monitor_findings_snapshot(self):
+        """Test that the monitor keeps the records of its last network scan"""
+        config = ConfigManager()
+        config.scan_config.enable_state_store = False
+        monitor = RealTimeMonitor(config, Mock(), Mock(), Mock(), Mock())
+        conn = {'laddr': '10.0.0.2:50000', 'raddr': '1.2.3.4:443', 'saas_domain': 'slack.com'}
+        monitor._process_network_findings([conn, {**conn, 'raddr': '1.2.3.5:443'}])
+        
+        snapshot = monitor.findings_snapshot()
+        self.assertEqual(snapshot['network_findings'], [conn])
+        self.assertEqual(snapshot['browser_findings'], {'extensions': []})
+
+class TestLogPipeline(unittest.TestCase):
+    """Test the queued JSON Lines logging pipeline"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.alert_config.log_directory = self.temp_dir
+        self.config.scan_config.state_directory = self.temp_dir
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutdown_logging()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _record(self, message):
+        import logging
+        return logging.LogRecord('shadowit_detector', logging.WARNING, __file__, 1, message, (), None)
+    
+    def test_setup_is_idempotent(self):
+        """Test that repeated AlertManagers share a single queue handler"""
+        import logging
+        AlertManager(self.config)
+        AlertManager(self.config)
+        handlers = [h for h in logging.getLogger('shadowit_detector').handlers
+                    if isinstance(h, DroppingQueueHandler)]
+        self.assertEqual(len(handlers), 1)
+    
+    def test_concurrent_setup_attaches_one_handler(self):
+        """Test that racing setup_logging calls never leave two queue handlers"""
+        import logging
+        import threading
+        threads = [threading.Thread(target=setup_logging, args=(self.config.alert_config,)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        handlers = [h for h in logging.getLogger('shadowit_detector').handlers
+                    if isinstance(h, DroppingQueueHandler)]
+        self.assertEqual(len(handlers), 1)
+    
+    def test_alerts_are_json_lines(self):
+        """Test that alert log lines carry the structured alert"""
+        config = self.config
+        config.alert_config.enable_alert_coalescing = False
+        config.alert_config.enable_console_alerts = False
+        alert_manager = AlertManager(config)
+        alert_manager.send_alert(alert_manager.create_alert('high', 'network', 'Slack', 'Desc',
+                                                            {'saas_domain': 'slack.com'}, 'network'))
+        alert_manager.flush_alerts()
+        shutdown_logging()
+        
+        with open(os.path.join(self.temp_dir, 'shadowit_alerts.jsonl')) as f:
+            entries = [json.loads(line) for line in f]
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['level'], 'WARNING')
+        self.assertEqual(entries[0]['alert']['details'], {'saas_domain': 'slack.com'})
+    
+    def test_size_rotation_compresses_segments(self):
+        """Test that size-based rotation gzips segments and keeps backup_count of them"""
+        import gzip
+        path = os.path.join(self.temp_dir, 'test.jsonl')
+        handler = CompressingRotatingFileHandler(path, max_bytes=300, interval=0, backup_count=2)
+        handler.setFormatter(JsonLinesFormatter())
+        for i in range(40):
+            handler.handle(self._record(f"message {i}"))
+        handler.close()
+        
+        segments = handler.rotated_segments()
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(all(segment.endswith('.gz') for segment in segments))
+        self.assertLessEqual(os.path.getsize(path), 300)
+        with gzip.open(segments[-1], 'rt') as f:
+            self.assertTrue(json.loads(f.readline())['message'].startswith('message'))
+    
+    def test_time_rotation(self):
+        """Test that a segment is rotated once its interval has passed"""
+        path = os.path.join(self.temp_dir, 'test.jsonl')
+        handler = CompressingRotatingFileHandler(path, max_bytes=0, interval=3600, compress=False)
+        handler.setFormatter(JsonLinesFormatter())
+        handler.handle(self._record('first'))
+        handler.rollover_at = time.time() - 1
+        handler.handle(self._record('second'))
+        handler.close()
+        
+        self.assertEqual(len(handler.rotated_segments()), 1)
+        with open(path) as f:
+            self.assertEqual(json.loads(f.read())['message'], 'second')
+
+class _SMTPStandInHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept messages"""
+    
+    def handle(self):
+        self.server.connections += 1
+        self.wfile.write(b'220 localhost ready\r\n')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command == 'DATA':
+                self.wfile.write(b'354 go ahead\r\n')
+                data = []
+                for data_line in iter(self.rfile.readline, b''):
+                    if data_line == b'.\r\n':
+                        break
+                    data.append(data_line)
+                self.server.messages.append(b''.join(data).decode())
+                self.wfile.write(b'250 queued\r\n')
+            elif command == 'QUIT':
+                self.wfile.write(b'221 bye\r\n')
+                return
+            else:
+                self.wfile.write(b'250 localhost\r\n')
+
+class _SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Local SMTP server for email sink tests"""
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self, port=0):
+        self.messages = []
+        self.connections = 0
+        super().__init__(('127.0.0.1', port), _SMTPStandInHandler)
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+    
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+class TestEmailSink(unittest.TestCase):
+    """Test batched background email delivery"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        alert_config = self.config.alert_config
+        alert_config.smtp_server = '127.0.0.1'
+        alert_config.smtp_use_starttls = False
+        alert_config.smtp_username = ''
+        alert_config.email_recipients = ['security@example.com']
+        self.now = [1000.0]
+        self.outbox_path = os.path.join(self.temp_dir, 'outbox.db')
+        self.sinks = []
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        for sink in self.sinks:
+            sink.stop(timeout=1)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _sink(self, **kwargs):
+        sink = EmailSink(self.config.alert_config, SinkOutbox(self.outbox_path), clock=lambda: self.now[0], **kwargs)
+        self.sinks.append(sink)
+        return sink
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_digests_share_one_connection(self):
+        """Test that alerts are batched into digests over a reused connection"""
+        server = _SMTPStandIn()
+        self.addCleanup(server.stop)
+        self.config.alert_config.smtp_port = server.server_address[1]
+        sink = self._sink(batch_size=3, batch_interval=60)
+        
+        for i in range(6):
+            sink.submit(_alert(f"Alert {i}", 'high'))
+        
+        self.assertTrue(self._wait_for(lambda: len(server.messages) == 2))
+        self.assertEqual(server.connections, 1)
+        self.assertIn('Alert 2', server.messages[0])
+        self.assertIn('3 alerts', server.messages[1])
+        self.assertEqual(sink.get_status()['pending'], 0)
+    
+    def test_failed_batches_survive_restart(self):
+        """Test that undelivered alerts are retried after backoff, even by a new sink"""
+        import socket
+        probe = socket.socket()
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+        probe.close()
+        self.config.alert_config.smtp_port = port
+        
+        sink = self._sink(batch_size=1, backoff=5)
+        sink.submit(_alert("Alert 0", 'high'))
+        self.assertTrue(self._wait_for(lambda: sink.get_status()['failures'] == 1))
+        sink.stop(timeout=1)
+        
+        server = _SMTPStandIn(port)
+        self.addCleanup(server.stop)
+        restarted = self._sink(batch_size=1, backoff=5)
+        restarted.start()
+        self.assertEqual(restarted.get_status()['pending'], 1)
+        time.sleep(0.1)
+        self.assertEqual(server.messages, [])
+        
+        self.now[0] += 60
+        self.assertTrue(self._wait_for(lambda: len(server.messages) == 1))
+        self.assertIn('Alert 0', server.messages[0])
+
+class TestExtensionPermissionAnalyzer(unittest.TestCase):
+    """Test extension host permission analysis"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.analyzer = ExtensionPermissionAnalyzer({
+            'dropbox.com': {'category': 'storage', 'risk_level': 'high', 'description': ''},
+            'slack.com': {'category': 'communication', 'risk_level': 'medium', 'description': ''},
+            'trello.com': {'category': 'project_management', 'risk_level': 'low', 'description': ''},
+            'teams.microsoft.com': {'category': 'communication', 'risk_level': 'medium', 'description': ''}
+        })
+    
+    def test_compile_permissions_buckets(self):
+        """Test that patterns are bucketed by match type"""
+        compiled = compile_permissions(['<all_urls>', '*://*.dropbox.com/*',
+                                        'https://app.slack.com/*', 'storage', '*://*.com/*'])
+        
+        self.assertEqual(compiled.broad, ['<all_urls>', '*://*.com/*'])
+        self.assertEqual(compiled.wildcard_hosts, ['dropbox.com'])
+        self.assertEqual(compiled.exact_hosts, ['app.slack.com'])
+        self.assertEqual(compiled.api_permissions, ['storage'])
+    
+    def test_all_urls_is_broad_and_high_risk(self):
+        """Test that <all_urls> is reported as broad host access"""
+        result = self.analyzer.analyze({'permissions': ['<all_urls>', 'tabs']})
+        
+        self.assertTrue(result['broad_host_access'])
+        self.assertEqual(result['risk_level'], 'high')
+        self.assertEqual(result['sensitive_permissions'], ['tabs'])
+    
+    def test_wildcard_and_exact_hosts_resolve_services(self):
+        """Test that host patterns resolve to catalog services"""
+        result = self.analyzer.analyze({
+            'host_permissions': ['*://*.dropbox.com/*', 'https://app.slack.com/*', '*://*.microsoft.com/*']
+        })
+        
+        self.assertEqual(result['saas_access'], ['dropbox.com', 'slack.com', 'teams.microsoft.com'])
+        self.assertFalse(result['broad_host_access'])
+        self.assertEqual(result['risk_level'], 'high')
+    
+    def test_theme_is_low_risk(self):
+        """Test that an extension without host access is low risk"""
+        result = self.analyzer.analyze({'permissions': ['storage'], 'host_permissions': []})
+        
+        self.assertEqual(result['saas_access'], [])
+        self.assertEqual(result['risk_level'], 'low')
+
+class TestFirefoxExtensionScan(unittest.TestCase):
+    """Test Firefox extensions.json and XPI manifest parsing"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.profile = os.path.join(self.temp_dir, 'abcd.default-release')
+        os.makedirs(os.path.join(self.profile, 'extensions'))
+        self.scanner = BrowserScanner({
+            'dropbox.com': {'category': 'storage', 'risk_level': 'high', 'description': ''}
+        })
+        
+        with open(os.path.join(self.profile, 'extensions.json'), 'w') as f:
+            json.dump({'addons': [
+                {
+                    'id': 'saver@example.com',
+                    'version': '2.1',
+                    'location': 'app-profile',
+                    'defaultLocale': {'name': 'Dropbox Saver', 'description': 'Save files'},
+                    'userPermissions': {'permissions': ['tabs'], 'origins': ['*://*.dropbox.com/*']}
+                },
+                {'id': 'builtin@mozilla.org', 'location': 'app-builtin'}
+            ]}, f)
+        
+        import zipfile
+        with zipfile.ZipFile(os.path.join(self.profile, 'extensions', 'reader@example.com.xpi'), 'w') as xpi:
+            xpi.writestr('manifest.json', json.dumps({
+                'name': '__MSG_extName__',
+                'version': '1.0',
+                'default_locale': 'en',
+                'permissions': ['<all_urls>'],
+                'browser_specific_settings': {'gecko': {'id': 'reader@example.com'}}
+            }))
+            xpi.writestr('_locales/en/messages.json', json.dumps({'extName': {'message': 'Reader'}}))
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_reads_extensions_json_and_xpi_manifests(self):
+        """Test that metadata comes from extensions.json and XPI manifests"""
+        extensions = self.scanner.permission_analyzer.annotate(
+            self.scanner._scan_firefox_extensions(self.temp_dir, 'firefox')
+        )
+        by_id = {ext['id']: ext for ext in extensions}
+        
+        self.assertEqual(set(by_id), {'saver@example.com', 'reader@example.com'})
+        self.assertEqual(by_id['saver@example.com']['name'], 'Dropbox Saver')
+        self.assertEqual(by_id['saver@example.com']['saas_access'], ['dropbox.com'])
+        self.assertEqual(by_id['reader@example.com']['name'], 'Reader')
+        self.assertTrue(by_id['reader@example.com']['broad_host_access'])
+    
+    def test_unpacked_extension_directories(self):
+        """Test that unpacked extension directories are still reported without extensions.json"""
+        os.remove(os.path.join(self.profile, 'extensions.json'))
+        unpacked = os.path.join(self.profile, 'extensions', 'notes@example.com')
+        os.makedirs(unpacked)
+        with open(os.path.join(unpacked, 'manifest.json'), 'w') as f:
+            json.dump({'name': 'Notes', 'version': '3.0', 'host_permissions': ['*://*.dropbox.com/*']}, f)
+        os.makedirs(os.path.join(self.profile, 'extensions', 'broken@example.com'))
+        
+        extensions = self.scanner.scan_firefox_profile_extensions(self.profile)
+        by_id = {ext['id']: ext for ext in extensions}
+        
+        self.assertEqual(set(by_id), {'reader@example.com', 'notes@example.com', 'broken@example.com'})
+        self.assertEqual(by_id['notes@example.com']['name'], 'Notes')
+        self.assertEqual(by_id['notes@example.com']['host_permissions'], ['*://*.dropbox.com/*'])
+        self.assertEqual(by_id['broken@example.com']['version'], 'Unknown')
+    
+    def test_xpi_manifest_cached_by_mtime(self):
+        """Test that unchanged XPIs are not reopened"""
+        self.scanner._scan_firefox_extensions(self.temp_dir, 'firefox')
+        
+        with patch('detector.browser_scanner.zipfile.ZipFile') as mock_zip:
+            extensions = self.scanner._scan_firefox_extensions(self.temp_dir, 'firefox')
+            mock_zip.assert_not_called()
+        
+        self.assertEqual(len(extensions), 2)
+
+class TestChromeBookmarkStreaming(unittest.TestCase):
+    """Test iterative Chrome bookmark parsing"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.bookmark_path = os.path.join(self.temp_dir, 'Bookmarks')
+        self.scanner = BrowserScanner({
+            'dropbox.com': {'category': 'storage', 'risk_level': 'high', 'description': ''},
+            'slack.com': {'category': 'communication', 'risk_level': 'medium', 'description': ''}
+        })
+        
+        with open(self.bookmark_path, 'w') as f:
+            json.dump({
+                'checksum': 'abc123',
+                'roots': {
+                    'bookmark_bar': {'type': 'folder', 'name': 'Bar', 'children': [
+                        {'type': 'url', 'name': 'Dropbox', 'url': 'https://www.dropbox.com/home', 'date_added': '1'},
+                        {'type': 'folder', 'name': 'Work', 'children': [
+                            {'type': 'url', 'name': 'Slack', 'url': 'https://app.slack.com/client', 'date_added': '2'}
+                        ]},
+                        {'type': 'url', 'name': 'News', 'url': 'https://news.example.org/', 'date_added': '3'}
+                    ]},
+                    'other': {'type': 'folder', 'name': 'Other', 'children': []}
+                },
+                'version': 1
+            }, f)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def test_iter_bookmarks_in_document_order(self):
+        """Test that the in-memory walker yields every URL in order"""
+        titles = [b['title'] for b in iter_chrome_bookmarks(self.bookmark_path, streaming=False)]
+        self.assertEqual(titles, ['Dropbox', 'Slack', 'News'])
+    
+    @unittest.skipUnless(IJSON_AVAILABLE, "ijson not installed")
+    def test_streaming_parser_matches_walker(self):
+        """Test that the incremental parser yields the same bookmarks"""
+        self.assertEqual(
+            list(iter_chrome_bookmarks(self.bookmark_path, streaming=True)),
+            list(iter_chrome_bookmarks(self.bookmark_path, streaming=False))
+        )
+    
+    def test_deep_folders_do_not_recurse(self):
+        """Test that very deep folder trees are walked without recursion"""
+        root = node = {'type': 'folder', 'children': []}
+        for _ in range(sys.getrecursionlimit() * 2):
+            child = {'type': 'folder', 'children': []}
+            node['children'].append(child)
+            node = child
+        node['children'].append({'type': 'url', 'name': 'Deep', 'url': 'https://dropbox.com/'})
+        
+        bookmarks = list(walk_bookmark_roots({'bookmark_bar': root}))
+        self.assertEqual([b['title'] for b in bookmarks], ['Deep'])
+    
+    def test_scan_matches_catalog_and_skips_unchanged_checksum(self):
+        """Test catalog matching and checksum-based skipping"""
+        bookmarks = self.scanner._scan_chrome_bookmarks(self.bookmark_path, 'chrome')
+        self.assertEqual([b['saas_domain'] for b in bookmarks], ['dropbox.com', 'slack.com'])
+        
+        with patch('detector.browser_scanner.iter_chrome_bookmarks') as mock_iter:
+            cached = self.scanner._scan_chrome_bookmarks(self.bookmark_path, 'chrome')
+            mock_iter.assert_not_called()
+        
+        self.assertEqual(cached, bookmarks)
+
+class TestBrowserUsageAnalytics(unittest.TestCase):
+    """Test browser usage rollups from visit tables"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        import sqlite3
+        self.temp_dir = tempfile.mkdtemp()
+        self.history_path = os.path.join(self.temp_dir, 'History')
+        self.day = 20000  # days since the Unix epoch
+        
+        conn = sqlite3.connect(self.history_path)
+        conn.executescript("""
+            CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT);
+            CREATE TABLE visits (id INTEGER PRIMARY KEY, url INTEGER, visit_time INTEGER, visit_duration INTEGER);
+        """)
+        conn.executemany("INSERT INTO urls VALUES (?, ?)", [
+            (1, 'https://app.slack.com/client'), (2, 'https://news.example.org/')
+        ])
+        conn.executemany("INSERT INTO visits (url, visit_time, visit_duration) VALUES (?, ?, ?)", [
+            (1, self._webkit_time(100), 120 * 1000000),
+            (1, self._webkit_time(200), 0),
+            (2, self._webkit_time(300), 60 * 1000000)
+        ])
+        conn.commit()
+        conn.close()
+        
+        self.browser_scanner = BrowserScanner({
+            'slack.com': {'category': 'communication', 'risk_level': 'medium', 'description': ''}
+        })
+        self.browser_scanner.browser_paths = {'chrome': {'history': self.history_path}}
+        self.store = UsageRollupStore(os.path.join(self.temp_dir, 'state', 'usage.db'))
+        self.scanner = BrowserUsageScanner(self.browser_scanner, self.store)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def _webkit_time(self, seconds_into_day):
+        return (self.day * 86400 + seconds_into_day) * 1000000 + WEBKIT_EPOCH_OFFSET_US
+    
+    def test_rollups_by_service_and_day(self):
+        """Test that visits are rolled up per service and day"""
+        self.assertEqual(self.scanner.scan(), 3)
+        
+        trends = self.store.trends(days=90, today=self.day)
+        self.assertEqual(list(trends), ['slack.com'])
+        self.assertEqual(trends['slack.com']['visits'], 2)
+        self.assertEqual(trends['slack.com']['active_seconds'], 150)
+        self.assertEqual(len(trends['slack.com']['daily']), 1)
+    
+    def test_incremental_scan_uses_watermark(self):
+        """Test that only visits after the watermark are rolled up"""
+        import sqlite3
+        self.scanner.scan()
+        
+        conn = sqlite3.connect(self.history_path)
+        conn.execute("INSERT INTO visits (url, visit_time, visit_duration) VALUES (1, ?, ?)",
+                     (self._webkit_time(86400 + 10), 10 * 1000000))
+        conn.commit()
+        conn.close()
+        
+        self.assertEqual(self.scanner.scan(), 1)
+        self.assertEqual(self.scanner.scan(), 0)
+        
+        trends = self.store.trends(days=90, today=self.day + 1)
+        self.assertEqual(trends['slack.com']['visits'], 3)
+        self.assertEqual([d['visits'] for d in trends['slack.com']['daily']], [2, 1])
+
+class TestFileWatcher(unittest.TestCase):
+    """Test debounced file watching"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.extensions_dir = os.path.join(self.temp_dir, 'Extensions')
+        os.makedirs(self.extensions_dir)
+        self.bookmarks = os.path.join(self.temp_dir, 'Bookmarks')
+        with open(self.bookmarks, 'w') as f:
+            f.write('{}')
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir)
+    
+    def _run_watcher(self, use_inotify):
+        import threading
+        import time
+        changes = []
+        fired = threading.Event()
+        
+        def on_change(key):
+            changes.append(key)
+            fired.set()
+        
+        watcher = FileWatcher(on_change, debounce=0.2, poll_interval=0.1, use_inotify=use_inotify)
+        watcher.watch(self.extensions_dir, ('extensions', 'chrome'))
+        watcher.watch(self.bookmarks, ('bookmarks', 'chrome'))
+        watcher.start()
+        try:
+            time.sleep(0.2)
+            # A burst of changes to one target is reported once
+            for i in range(5):
+                os.makedirs(os.path.join(self.extensions_dir, f'ext{i}'))
+            self.assertTrue(fired.wait(5))
+            time.sleep(0.5)
+        finally:
+            watcher.stop()
+        return changes
+    
+    def test_polling_backend_debounces(self):
+        """Test that the polling backend reports a burst once per target"""
+        self.assertEqual(self._run_watcher(use_inotify=False), [('extensions', 'chrome')])
+    
+    @unittest.skipUnless(INOTIFY_AVAILABLE, "inotify not available")
+    def test_inotify_backend_debounces(self):
+        """Test that the inotify backend reports a burst once per target"""
+        self.assertEqual(self._run_watcher(use_inotify=True), [('extensions', 'chrome')])
+    
+    def test_targeted_extension_rescan(self):
+        """Test that a change rescans only the affected browser"""
+        browser_scanner = Mock()
+        browser_scanner.scan_browser_extensions.return_value = [
+            {'browser': 'chrome', 'id': 'abc', 'name': 'New Extension', 'risk_level': 'high'}
+        ]
+        alert_manager = Mock()
+        config = ConfigManager()
+        config.scan_config.state_directory = self.temp_dir
+        monitor = RealTimeMonitor(config, alert_manager, Mock(), Mock(), browser_scanner)
+        monitor.is_running = True
+        
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        
+        browser_scanner.scan_browser_extensions.assert_called_with(['chrome'])
+        self.assertEqual(alert_manager.send_alert.call_count, 1)
+        self.assertIn('browser|chrome|abc', monitor.previous_findings['browser'])
+        monitor.state_store.close()
+    
+    def test_bookmark_alerts_off_by_default(self):
+        """Test that browser scans only alert on bookmarks when enabled"""
+        browser_scanner = Mock()
+        browser_scanner.scan_browser_extensions.return_value = []
+        config = ConfigManager()
+        config.scan_config.state_directory = self.temp_dir
+        monitor = RealTimeMonitor(config, Mock(), Mock(), Mock(), browser_scanner)
+        monitor.is_running = True
+        
+        monitor._browser_scan()
+        browser_scanner.scan_browser_bookmarks.assert_not_called()
+        
+        config.scan_config.enable_bookmark_alerts = True
+        monitor._browser_scan()
+        browser_scanner.scan_browser_bookmarks.assert_called_once()
+        monitor.state_store.close()
+
+class TestScanScheduler(unittest.TestCase):
+    """Test the deadline-heap scan scheduler"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        import threading
+        self.scheduler = ScanScheduler()
+        self.release = threading.Event()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.release.set()
+        self.scheduler.stop()
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        import time
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_slow_job_does_not_delay_other_jobs(self):
+        """Test that each job runs on its own worker"""
+        fast_runs = []
+        self.scheduler.add_job('slow', lambda: self.release.wait(5), interval=0.05)
+        self.scheduler.add_job('fast', lambda: fast_runs.append(1), interval=0.02)
+        self.scheduler.start()
+        
+        self.assertTrue(self._wait_for(lambda: len(fast_runs) >= 5))
+        status = self.scheduler.get_status()
+        self.assertTrue(status['slow']['running'])
+        self.assertEqual(status['slow']['runs'], 0)
+    
+    def test_skip_policy_drops_overlapping_runs(self):
+        """Test that overlapping runs are skipped"""
+        self.scheduler.add_job('slow', lambda: self.release.wait(5), interval=0.02, overlap='skip')
+        self.scheduler.start()
+        
+        self.assertTrue(self._wait_for(lambda: self.scheduler.get_status()['slow']['skipped'] >= 3))
+        self.release.set()
+        self.assertTrue(self._wait_for(lambda: self.scheduler.get_status()['slow']['runs'] >= 1))
+    
+    def test_coalesce_policy_runs_once_more(self):
+        """Test that overlapping runs collapse into a single follow-up run"""
+        import threading
+        started = threading.Event()
+        runs = []
+        
+        def job():
+            runs.append(1)
+            started.set()
+            self.release.wait(5)
+        
+        self.scheduler.add_job('slow', job, interval=0.02, overlap='coalesce')
+        self.scheduler.start()
+        self.assertTrue(started.wait(5))
+        self.assertTrue(self._wait_for(lambda: self.scheduler.get_status()['slow']['coalesced'] >= 2))
+        
+        self.scheduler.stop()
+        self.release.set()
+        # The pending run is dropped once the scheduler is stopped
+        self.assertTrue(self._wait_for(lambda: not self.scheduler.get_status()['slow']['running']))
+        self.assertEqual(len(runs), 1)
+    
+    def test_invalid_overlap_policy(self):
+        """Test that unknown overlap policies are rejected"""
+        with self.assertRaises(ValueError):
+            self.scheduler.add_job('bad', lambda: None, interval=1, overlap='queue')
+
+class TestAdaptiveInterval(unittest.TestCase):
+    """Test change- and load-driven scan intervals"""
+    
+    def test_interval_follows_change_rate(self):
+        """Test that intervals shrink on change, grow when idle and stay in bounds"""
+        adaptive = AdaptiveInterval(100, min_interval=40, max_interval=200)
+        self.assertEqual(adaptive.update(3), 50)
+        self.assertEqual(adaptive.update(1), 40)
+        self.assertEqual(adaptive.update(0), 60)
+        self.assertEqual(adaptive.update(None), 60)
+        for _ in range(10):
+            adaptive.update(0)
+        self.assertEqual(adaptive.interval, 200)
+    
+    def test_load_backoff(self):
+        """Test that a busy host stretches the wait without losing the learned interval"""
+        busy = [True]
+        adaptive = AdaptiveInterval(100, min_interval=10, max_interval=300, load_probe=lambda: busy[0])
+        self.assertEqual(adaptive.update(1), 100)
+        self.assertTrue(adaptive.get_status()['load_backoff'])
+        self.assertEqual(adaptive.interval, 50)
+        busy[0] = False
+        self.assertEqual(adaptive.update(None), 50)
+    
+    def test_scheduler_applies_policy(self):
+        """Test that the scheduler uses the interval returned by a job's policy"""
+        scheduler = ScanScheduler()
+        scheduler.add_job('scan', lambda: 0, interval=60, interval_policy=lambda result: 120)
+        scheduler.start()
+        try:
+            deadline = time.monotonic() + 5
+            while scheduler.get_status()['scan']['runs'] < 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.05)
+            status = scheduler.get_status()['scan']
+        finally:
+            scheduler.stop()
+        self.assertEqual(status['interval'], 120)
+        self.assertGreater(status['next_run_in'], 100)
+    
+    def test_monitor_status_reports_intervals(self):
+        """Test that new findings shorten the monitor's interval and show up in its status"""
+        config = ConfigManager()
+        config.scan_config.enable_state_store = False
+        config.scan_config.adaptive_intervals = True
+        config.scan_config.adaptive_min_interval = 60
+        config.scan_config.browser_scan_interval = 1000
+        monitor = RealTimeMonitor(config, Mock(), Mock(), Mock(), Mock())
+        policy = monitor._interval_policy('browser', config.scan_config.browser_scan_interval)
+        monitor.adaptive_intervals['browser'].load_probe = lambda: False
+        
+        monitor._is_new_finding('browser', 'browser|chrome|abc')
+        self.assertEqual(policy(None), 500)
+        self.assertEqual(policy(None), 750)
+        self.assertEqual(monitor.get_monitoring_status()['scan_intervals']['browser'], 750)
+        self.assertEqual(monitor.get_monitoring_status()['scan_intervals']['network'],
+                         config.scan_config.network_scan_interval)
+
+class TestScanDeadlines(unittest.TestCase):
+    """Test scan deadlines, cancellation and the hung-scan watchdog"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        import threading
+        self.scheduler = ScanScheduler()
+        self.release = threading.Event()
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.release.set()
+        self.scheduler.stop()
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_overdue_scan_cancels_cooperatively(self):
+        """Test that a scan checking its deadline stops and is counted as a timeout"""
+        def slow_scan():
+            while True:
+                check_deadline()
+                time.sleep(0.01)
+        
+        self.scheduler.add_job('slow', slow_scan, interval=60, timeout=0.1)
+        self.scheduler.start()
+        
+        self.assertTrue(self._wait_for(lambda: self.scheduler.get_status()['slow']['runs'] == 1))
+        status = self.scheduler.get_status()['slow']
+        self.assertEqual(status['timeouts'], 1)
+        self.assertEqual(status['restarts'], 0)
+        self.assertFalse(status['running'])
+    
+    def test_wedged_scan_gets_new_worker(self):
+        """Test that a scan ignoring cancellation is abandoned and the job keeps running"""
+        calls = []
+        
+        def wedged_scan():
+            calls.append(1)
+            if len(calls) == 1:
+                self.release.wait(10)
+        
+        self.scheduler.add_job('wedged', wedged_scan, interval=0.3, timeout=0.05)
+        self.scheduler.start()
+        
+        self.assertTrue(self._wait_for(lambda: self.scheduler.get_status()['wedged']['runs'] >= 1))
+        status = self.scheduler.get_status()['wedged']
+        self.assertEqual(status['restarts'], 1)
+        self.assertGreaterEqual(status['timeouts'], 1)
+        self.assertGreaterEqual(len(calls), 2)
+    
+    def test_runtime_times_out_blocking_scan(self):
+        """Test that the asyncio runtime abandons an overdue blocking call"""
+        runtime = AsyncRuntime(max_concurrency=2)
+        runtime.add_periodic('slow', lambda: self.release.wait(10), interval=60, timeout=0.05)
+        runtime.start()
+        try:
+            self.assertTrue(self._wait_for(lambda: runtime.get_status()['tasks']['slow']['timeouts'] == 1))
+            self.assertEqual(runtime.get_status()['executor_restarts'], 1)
+        finally:
+            self.release.set()
+            runtime.stop()
+    
+    def test_hung_network_scan_does_not_stop_monitoring(self):
+        """Test that a hung network scanner times out while other scans keep running"""
+        config = ConfigManager()
+        config.scan_config.enable_state_store = False
+        config.scan_config.scan_jitter_seconds = 0
+        config.scan_config.network_scan_timeout = 0.05
+        config.scan_config.endpoint_scan_interval = 0.05
+        network_scanner = Mock()
+        network_scanner.get_active_connections.side_effect = lambda: self.release.wait(10) and []
+        endpoint_scanner = Mock()
+        endpoint_scanner.get_running_processes.return_value = []
+        monitor = RealTimeMonitor(config, Mock(), network_scanner, endpoint_scanner, Mock())
+        
+        with patch.object(RealTimeMonitor, '_browser_scan'):
+            monitor.start_monitoring()
+            try:
+                self.assertTrue(self._wait_for(
+                    lambda: monitor.get_monitoring_status()['scheduler']['network']['restarts'] >= 1))
+                self.assertTrue(self._wait_for(
+                    lambda: monitor.get_monitoring_status()['scheduler']['endpoint']['runs'] >= 3))
+            finally:
+                self.release.set()
+                monitor.stop_monitoring()
+    
+    def test_cancelled_scan_does_not_commit_findings(self):
+        """Test that an abandoned scan finishing late leaves the current findings alone"""
+        config = ConfigManager()
+        config.scan_config.enable_state_store = False
+        monitor = RealTimeMonitor(config, Mock(), Mock(), Mock(), Mock())
+        monitor.alert_manager.send_alert = Mock()
+        conn = {'saas_domain': 'dropbox.com', 'remote_ip': '1.2.3.4', 'remote_port': 443}
+        
+        deadline = Deadline(timeout=60)
+        deadline.cancel()
+        with deadline_scope(deadline):
+            monitor._process_network_findings([conn])
+        
+        self.assertEqual(monitor.previous_findings['network'], set())
+        self.assertEqual(monitor.current_findings['network'], [])
+        
+        with deadline_scope(Deadline(timeout=60)):
+            monitor._process_network_findings([conn])
+        self.assertEqual(monitor.current_findings['network'], [conn])
+
+class TestIncidentCorrelator(unittest.TestCase):
+    """Test cross-source incident correlation"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.now = [0.0]
+        self.correlator = IncidentCorrelator(ttl=60, max_incidents=10, clock=lambda: self.now[0])
+    
+    def test_sources_merge_and_escalate(self):
+        """Test that agreeing sources share one incident with a raised severity"""
+        self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='network'))
+        self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='network'))
+        self.assertEqual(self.correlator.query()[0].severity, 'low')
+        
+        self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='endpoint'))
+        self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='browser'))
+        
+        incidents = self.correlator.query()
+        self.assertEqual(len(incidents), 1)
+        incident = incidents[0].to_dict()
+        self.assertEqual(incident['sources'], ['browser', 'endpoint', 'network'])
+        self.assertEqual(incident['severity'], 'high')
+        self.assertEqual(incident['alert_count'], 4)
+        self.assertEqual(len(incident['evidence']), 4)
+    
+    def test_keys_and_extensions(self):
+        """Test that hosts stay separate and extensions join each service they reach"""
+        self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='network', host='laptop-1'))
+        self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='network', host='laptop-2'))
+        self.correlator.add_alert(_alert(severity='low', source='browser', service=None,
+                                         saas_access=['dropbox.com', 'slack.com']))
+        
+        self.assertEqual(len(self.correlator), 4)
+        self.assertEqual([i.service for i in self.correlator.query(service='slack.com')], ['slack.com'])
+        self.assertEqual(len(self.correlator.query(host='laptop-1')), 1)
+        self.assertEqual(self.correlator.query(min_severity='medium'), [])
+    
+    def test_ttl_and_bound(self):
+        """Test that quiet incidents expire and the index stays bounded"""
+        self.correlator.max_incidents = 3
+        first = self.correlator.add_alert(_alert(severity='low', service='dropbox.com', source='network'))[0]
+        self.now[0] = 30
+        self.correlator.add_alert(_alert(severity='low', source='endpoint', service='slack.com'))
+        self.now[0] = 70
+        self.assertIsNone(self.correlator.get(first.id))
+        self.assertEqual(len(self.correlator), 1)
+        
+        for service in ('a.com', 'b.com', 'c.com'):
+            self.correlator.add_alert(_alert(severity='low', source='network', service=service))
+        status = self.correlator.get_status()
+        self.assertEqual((status['open'], status['expired'], status['evicted']), (3, 1, 1))
+    
+    def test_monitor_correlates_alerts(self):
+        """Test that the monitor feeds alerts from the bus into incidents"""
+        config = ConfigManager()
+        config.scan_config.enable_state_store = False
+        monitor = RealTimeMonitor(config, Mock(), Mock(), Mock(), Mock())
+        
+        monitor._send_alert(_alert(severity='low', service='dropbox.com', source='network'))
+        monitor._send_alert(_alert(severity='low', service='dropbox.com', source='endpoint'))
+        
+        self.assertEqual(monitor.get_monitoring_status()['incidents']['open'], 1)
+        self.assertEqual(monitor.incidents.query()[0].severity, 'medium')
+
+class TestEventBus(unittest.TestCase):
+    """Test event fan-out to bounded subscriber queues"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        import threading
+        self.release = threading.Event()
+        self.bus = None
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.release.set()
+        if self.bus:
+            self.bus.stop()
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_slow_subscriber_does_not_stall_publisher(self):
+        """Test that a stuck subscriber only drops its own oldest events"""
+        received = []
+        self.bus = EventBus(maxsize=2, policy='drop_oldest')
+        self.bus.subscribe('slow', lambda event: self.release.wait(10))
+        self.bus.subscribe('fast', received.append, maxsize=100)
+        self.bus.start()
+        
+        started = time.monotonic()
+        for i in range(10):
+            self.bus.publish(AlertEvent(i))
+        self.assertLess(time.monotonic() - started, 1.0)
+        
+        self.assertTrue(self._wait_for(lambda: len(received) == 10))
+        status = self.bus.get_status()
+        self.assertGreaterEqual(status['slow']['dropped'], 7)
+        self.assertEqual(status['fast']['dropped'], 0)
+    
+    def test_drop_newest_keeps_queued_events(self):
+        """Test that drop_newest discards incoming events when the queue is full"""
+        received = []
+        
+        def handler(event):
+            self.release.wait(10)
+            received.append(event.alert)
+        
+        self.bus = EventBus(maxsize=2, policy='drop_newest')
+        self.bus.subscribe('sink', handler)
+        self.bus.start()
+        self.bus.publish(AlertEvent(0))
+        self.assertTrue(self._wait_for(lambda: self.bus.get_status()['sink']['queue_depth'] == 0))
+        for i in range(1, 5):
+            self.bus.publish(AlertEvent(i))
+        self.release.set()
+        
+        self.assertTrue(self._wait_for(lambda: len(received) == 3))
+        self.assertEqual(received, [0, 1, 2])
+        self.assertEqual(self.bus.get_status()['sink']['dropped'], 2)
+    
+    def test_block_policy_applies_bounded_backpressure(self):
+        """Test that a blocking subscriber delays the publisher at most block_timeout"""
+        self.bus = EventBus(maxsize=1, policy='block', block_timeout=0.1)
+        self.bus.subscribe('sink', lambda event: self.release.wait(10))
+        self.bus.start()
+        self.bus.publish(AlertEvent(0))
+        self.assertTrue(self._wait_for(lambda: self.bus.get_status()['sink']['queue_depth'] == 0))
+        self.assertEqual(self.bus.publish(AlertEvent(1)), 1)
+        
+        started = time.monotonic()
+        self.assertEqual(self.bus.publish(AlertEvent(2)), 0)
+        self.assertGreaterEqual(time.monotonic() - started, 0.1)
+        self.assertEqual(self.bus.get_status()['sink']['dropped'], 1)
+    
+    def test_monitor_callbacks_receive_findings(self):
+        """Test that add_callback subscribes to new findings only"""
+        config = ConfigManager()
+        config.scan_config.enable_state_store = False
+        browser_scanner = Mock()
+        browser_scanner.scan_browser_extensions.return_value = [
+            {'browser': 'chrome', 'id': 'abc', 'name': 'New Extension', 'risk_level': 'high'}
+        ]
+        alert_manager = Mock()
+        monitor = RealTimeMonitor(config, alert_manager, Mock(), Mock(), browser_scanner)
+        events = []
+        monitor.add_callback(events.append)
+        monitor.is_running = True
+        
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        
+        self.assertEqual(len(events), 1)
+        self.assertIsInstance(events[0], FindingEvent)
+        self.assertEqual(events[0].fingerprint, 'browser|chrome|abc')
+        self.assertEqual(alert_manager.send_alert.call_count, 1)
+
+class TestAsyncRuntime(unittest.TestCase):
+    """Test the asyncio monitoring runtime"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        self.runtime = AsyncRuntime(max_concurrency=2)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        self.runtime.stop()
+    
+    def _wait_for(self, predicate, timeout=5.0):
+        import time
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def test_periodic_blocking_and_consumer_tasks(self):
+        """Test that blocking jobs run in the executor and queues are consumed"""
+        import threading
+        runs = []
+        received = []
+        self.runtime.add_periodic('scan', lambda: runs.append(threading.current_thread().name), interval=0.02)
+        self.runtime.add_consumer('alerts', received.append)
+        self.runtime.start()
+        
+        self.assertTrue(self.runtime.post('alerts', 'alert-1'))
+        self.assertTrue(self._wait_for(lambda: len(runs) >= 3 and received == ['alert-1']))
+        self.assertTrue(all(name.startswith('runtime') for name in runs))
+        self.assertEqual(self.runtime.get_status()['tasks']['alerts']['runs'], 1)
+    
+    def test_stop_cancels_running_coroutines(self):
+        """Test structured cancellation on shutdown"""
+        import asyncio
+        import threading
+        entered = threading.Event()
+        cancelled = threading.Event()
+        
+        async def long_job():
+            entered.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        self.runtime.add_periodic('long', long_job, interval=60)
+        self.runtime.start()
+        self.assertTrue(entered.wait(5))
+        
+        self.runtime.stop()
+        self.assertTrue(cancelled.is_set())
+        self.assertFalse(self.runtime.is_running)
+    
+    def test_monitor_network_scan_on_runtime(self):
+        """Test the monitor's asyncio network scan and off-loop alert dispatch"""
+        config = ConfigManager()
+        config.scan_config.monitor_runtime = 'asyncio'
+        config.scan_config.scan_jitter_seconds = 0
+        config.scan_config.enable_state_store = False
+        network_scanner = Mock()
+        network_scanner.get_active_connections.return_value = [
+            {'laddr': '10.0.0.2:50000', 'raddr': '1.2.3.4:443', 'pid': 10}
+        ]
+        alert_manager = Mock()
+        monitor = RealTimeMonitor(config, alert_manager, network_scanner, Mock(), Mock())
+        
+        with patch('detector.network_scanner.socket.getfqdn', return_value='edge.slack.com'), \
+             patch.object(RealTimeMonitor, '_endpoint_scan'), patch.object(RealTimeMonitor, '_browser_scan'):
+            monitor.start_monitoring()
+            try:
+                self.assertTrue(self._wait_for(lambda: alert_manager.send_alert.called))
+            finally:
+                monitor.stop_monitoring()
+        
+        self.assertIn('network|slack.com|443', monitor.previous_findings['network'])
+
+class TestFindingStateStore(unittest.TestCase):
+    """Test the durable monitor state store"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, 'monitor_state.db')
+    
+    def tearDown(self):
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_fingerprint_ignores_pid_and_local_port(self):
+        """Test that fingerprints survive restarts and reconnects"""
+        first = finding_fingerprint('network', {'saas_domain': 'slack.com', 'raddr': '1.2.3.4:443',
+                                                'laddr': '10.0.0.2:50000', 'pid': 10})
+        second = finding_fingerprint('network', {'saas_domain': 'slack.com', 'raddr': '1.2.3.4:443',
+                                                 'laddr': '10.0.0.2:50001', 'pid': 11})
+        self.assertEqual(first, second)
+        self.assertEqual(first, finding_fingerprint('network', {'saas_domain': 'slack.com', 'raddr': '5.6.7.8:443',
+                                                                'fqdn': 'edge-5-6-7-8.slack.com'}))
+        self.assertEqual(
+            finding_fingerprint('endpoint', {'pid': 1, 'name': 'Slack', 'exe': '/usr/bin/slack'}),
+            finding_fingerprint('endpoint', {'pid': 2, 'name': 'slack', 'exe': '/usr/bin/slack'}))
+        with self.assertRaises(ValueError):
+            finding_fingerprint('unknown', {})
+    
+    def test_seen_counts_persist(self):
+        """Test first_seen, last_seen and seen_count across store instances"""
+        store = FindingStateStore(self.db_path)
+        store.record('browser', ['browser|chrome|abc'], now=100.0)
+        store.record('browser', ['browser|chrome|abc'], now=200.0)
+        store.close()
+        
+        store = FindingStateStore(self.db_path)
+        self.assertEqual(len(store), 1)
+        self.assertEqual(store.get('browser|chrome|abc'),
+                         {'source': 'browser', 'first_seen': 100.0, 'last_seen': 200.0, 'seen_count': 2})
+        self.assertEqual(store.fingerprints('network'), set())
+        store.close()
+    
+    def test_prune_forgets_stale_findings(self):
+        """Test that findings not seen within the retention window are dropped"""
+        store = FindingStateStore(self.db_path)
+        store.record('network', ['network|slack.com|443'], now=100.0)
+        store.record('network', ['network|zoom.us|443'], now=5000.0)
+        self.assertEqual(store.prune(1000, now=5500.0), 1)
+        self.assertFalse(store.is_known('network|slack.com|443'))
+        store.close()
+        
+        store = FindingStateStore(self.db_path)
+        self.assertEqual(store.fingerprints(), {'network|zoom.us|443'})
+        store.close()
+    
+    def test_restart_does_not_realert(self):
+        """Test that a restarted monitor stays silent for findings it already saw"""
+        config = ConfigManager()
+        config.scan_config.state_directory = self.temp_dir
+        browser_scanner = Mock()
+        browser_scanner.scan_browser_extensions.return_value = [
+            {'browser': 'chrome', 'id': 'abc', 'name': 'Known Extension', 'risk_level': 'high'}
+        ]
+        
+        alert_manager = Mock()
+        monitor = RealTimeMonitor(config, alert_manager, Mock(), Mock(), browser_scanner)
+        monitor.is_running = True
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        self.assertEqual(alert_manager.send_alert.call_count, 1)
+        monitor.stop_monitoring()
+        monitor.state_store.close()
+        
+        alert_manager = Mock()
+        monitor = RealTimeMonitor(config, alert_manager, Mock(), Mock(), browser_scanner)
+        monitor.is_running = True
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        self.assertEqual(alert_manager.send_alert.call_count, 0)
+        self.assertIn('browser|chrome|abc', monitor.previous_findings['browser'])
+        monitor.state_store.close()
+    
+    def test_finding_gone_for_a_while_alerts_again(self):
+        """Test that only findings from the last scan before a restart are seeded"""
+        config = ConfigManager()
+        config.scan_config.state_directory = self.temp_dir
+        store = FindingStateStore(state_db_path(config))
+        store.record('browser', ['browser|chrome|old'], now=time.time() - 3 * config.scan_config.browser_scan_interval)
+        store.record('browser', ['browser|chrome|recent'], now=time.time() - 60)
+        store.close()
+        
+        browser_scanner = Mock()
+        browser_scanner.scan_browser_extensions.return_value = [
+            {'browser': 'chrome', 'id': 'old', 'name': 'Returning Extension', 'risk_level': 'high'},
+            {'browser': 'chrome', 'id': 'recent', 'name': 'Known Extension', 'risk_level': 'high'}
+        ]
+        alert_manager = Mock()
+        monitor = RealTimeMonitor(config, alert_manager, Mock(), Mock(), browser_scanner)
+        self.assertEqual(monitor.previous_findings['browser'], {'browser|chrome|recent'})
+        
+        monitor.is_running = True
+        monitor._on_fs_change(('extensions', 'chrome', None))
+        self.assertEqual(alert_manager.send_alert.call_count, 1)
+        monitor.state_store.close()
+
+class _FakeArgs(dict):
+    """Query string arguments with Flask's get(name, default, type)"""
+    
+    def get(self, name, default=None, type=None):
+        if name not in self:
+            return default
+        return type(self[name]) if type else self[name]
+
+class TestWebDashboard(unittest.TestCase):
+    """Test dashboard API routes without a Flask install"""
+    
+    def setUp(self):
+        """Set up test fixtures"""
+        import importlib
+        self.temp_dir = tempfile.mkdtemp()
+        self.config = ConfigManager()
+        self.config.report_config.report_directory = self.temp_dir
+        self.config.scan_config.state_directory = self.temp_dir
+        self.routes = {}
+        
+        flask = MagicMock()
+        flask.Flask.return_value.route = lambda rule, **kwargs: lambda func: self.routes.setdefault(rule, func)
+        flask.jsonify = lambda data: data
+        flask.request.args = _FakeArgs()
+        self.request = flask.request
+        with patch.dict(sys.modules, {'flask': flask}):
+            sys.modules.pop('detector.web_dashboard', None)
+            self.module = importlib.import_module('detector.web_dashboard')
+        self.addCleanup(sys.modules.pop, 'detector.web_dashboard', None)
+    
+    def tearDown(self):
+        """Clean up test fixtures"""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_delta_uses_monitor_findings(self):
+        """Test that /api/delta diffs the monitor's current findings"""
+        previous = {'network_findings': [{'saas_domain': 'slack.com', 'raddr': '1.2.3.4:443'}]}
+        ReportGenerator(self.config).generate_json_report(previous, 'before.json')
+        monitor = Mock(spec=['findings_snapshot'])
+        monitor.findings_snapshot.return_value = {
+            'network_findings': [{'saas_domain': 'slack.com', 'raddr': '5.6.7.8:443'},
+                                 {'saas_domain': 'zoom.us', 'raddr': '9.9.9.9:443'}]
+        }
+        self.module.WebDashboard(self.config, None, monitor)
+        self.request.args = _FakeArgs(since='before.json')
+        
+        result = self.routes['/api/delta']()
+        self.assertEqual(result['counts'], {'new': 1, 'resolved': 0, 'changed': 0, 'unchanged': 1})
+    
+    def test_delta_without_current_scan(self):
+        """Test that /api/delta refuses to diff when there is no current scan"""
+        ReportGenerator(self.config).generate_json_report({'network_findings': []}, 'before.json')
+        self.module.WebDashboard(self.config, None, None)
+        self.request.args = _FakeArgs(since='before.json')
+        
+        self.assertEqual(self.routes['/api/delta']()[1], 409)
+        self.request.args = _FakeArgs(since='missing.json')
+        self.assertEqual(self.routes['/api/delta']()[1], 404)
+    
+    def test_alerts_rejects_bad_timestamps(self):
+        """Test that a malformed since/until is a client error, not a 500"""
+        alert_manager = Mock()
+        alert_manager.get_alerts.return_value = {'alerts': []}
+        self.module.WebDashboard(self.config, alert_manager, None)
+        
+        self.request.args = _FakeArgs(since='yesterday')
+        self.assertEqual(self.routes['/api/alerts']()[1], 400)
+        self.request.args = _FakeArgs(until='2024-01-01T00:00:00')
+        self.assertEqual(self.routes['/api/alerts'](), {'alerts': []})
+        alert_manager.get_alerts.assert_called_once()
+
 def run_tests():
     """Run all tests"""
     # Create test suite
@@ -309,7 +2574,32 @@ def run_tests():
         TestEndpointScanner,
         TestConfigManager,
         TestAlertManager,
-        TestBrowserScanner
+        TestBrowserScanner,
+        TestAlertStore,
+        TestAlertAggregator,
+        TestPriorityDispatcher,
+        TestNetworkSinks,
+        TestConsoleView,
+        TestHtmlReport,
+        TestExports,
+        TestColumnarExport,
+        TestReportPool,
+        TestFindingDelta,
+        TestLogPipeline,
+        TestEmailSink,
+        TestExtensionPermissionAnalyzer,
+        TestFirefoxExtensionScan,
+        TestChromeBookmarkStreaming,
+        TestBrowserUsageAnalytics,
+        TestFileWatcher,
+        TestScanScheduler,
+        TestAdaptiveInterval,
+        TestScanDeadlines,
+        TestIncidentCorrelator,
+        TestEventBus,
+        TestAsyncRuntime,
+        TestFindingStateStore,
+        TestWebDashboard
     ]
     
     for test_class in test_classes: